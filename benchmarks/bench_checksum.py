@@ -0,0 +1,84 @@
+"""Compare whole-file and streaming SHA-256 checksums.
+
+Each implementation runs in its own subprocess so the reported peak RSS
+(ru_maxrss) belongs to that implementation alone.
+
+    python benchmarks/bench_checksum.py --size-mb 2048
+"""
+import argparse
+import base64
+import hashlib
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+
+def whole_file(file_path):
+    with open(file_path, "rb") as f:
+        file_data = f.read()
+    return base64.b64encode(hashlib.sha256(file_data).digest()).decode("utf-8")
+
+
+def streaming(file_path):
+    from willisapi_client.services.metadata.utils import sha256_base64
+
+    return sha256_base64(file_path)
+
+
+IMPLEMENTATIONS = {"whole_file": whole_file, "streaming": streaming}
+
+
+def run_one(name, file_path):
+    # Import the package up front so its import cost and baseline RSS are
+    # shared by both implementations rather than charged to one of them.
+    import willisapi_client.services.metadata.utils  # noqa: F401
+
+    start = time.perf_counter()
+    checksum = IMPLEMENTATIONS[name](file_path)
+    elapsed = time.perf_counter() - start
+    peak_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if sys.platform == "darwin":
+        peak_kb //= 1024
+    print(json.dumps({"checksum": checksum, "seconds": elapsed, "peak_kb": peak_kb}))
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--size-mb", type=int, default=512)
+    parser.add_argument("--child", nargs=2, metavar=("IMPL", "PATH"))
+    args = parser.parse_args()
+
+    if args.child:
+        run_one(*args.child)
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        file_path = os.path.join(tmp, "recording.bin")
+        with open(file_path, "wb") as f:
+            block = os.urandom(1024 * 1024)
+            for _ in range(args.size_mb):
+                f.write(block)
+
+        checksums = set()
+        print(f"{'impl':<12}{'MB/s':>10}{'peak RSS MB':>14}")
+        for name in IMPLEMENTATIONS:
+            out = subprocess.run(
+                [sys.executable, __file__, "--child", name, file_path],
+                check=True,
+                capture_output=True,
+                text=True,
+            )
+            stats = json.loads(out.stdout)
+            checksums.add(stats["checksum"])
+            rate = args.size_mb / stats["seconds"]
+            print(f"{name:<12}{rate:>10.1f}{stats['peak_kb'] / 1024:>14.1f}")
+
+        assert len(checksums) == 1, "implementations disagree"
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""Compare inline hashing with ChecksumPrefetcher ahead of simulated uploads.
+
+Each "upload" hashes its file and then waits ``--latency`` seconds, standing
+in for the POST and PUT. Inline, hashing and waiting alternate; with the
+prefetcher, upcoming files are hashed while earlier uploads wait.
+
+    python benchmarks/bench_checksum_prefetch.py --files 64 --size-mb 16
+"""
+import argparse
+import os
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from willisapi_client.services.metadata.prefetch import ChecksumPrefetcher
+from willisapi_client.services.metadata.utils import sha256_base64
+
+
+def run(paths, workers, latency, checksum):
+    def upload(path):
+        digest = checksum(path)
+        time.sleep(latency)
+        return digest
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(upload, paths))
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--files", type=int, default=32)
+    parser.add_argument("--size-mb", type=int, default=16)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--latency", type=float, default=0.2)
+    parser.add_argument("--lookahead", type=int, default=16)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = []
+        block = os.urandom(1024 * 1024)
+        for i in range(args.files):
+            path = os.path.join(tmp, f"rec_{i}.wav")
+            with open(path, "wb") as f:
+                for _ in range(args.size_mb):
+                    f.write(block)
+            paths.append(path)
+
+        start = time.perf_counter()
+        inline = run(paths, args.workers, args.latency, sha256_base64)
+        inline_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        prefetcher = ChecksumPrefetcher(sha256_base64, lookahead=args.lookahead)
+        prefetcher.start(paths)
+        prefetched = run(paths, args.workers, args.latency, prefetcher.checksum)
+        prefetch_seconds = time.perf_counter() - start
+        stats = prefetcher.stats()
+        prefetcher.close()
+
+    assert inline == prefetched, "results differ"
+    print(f"files={args.files} size={args.size_mb}MB workers={args.workers}")
+    print(f"inline hashing:     {inline_seconds:8.2f}s")
+    print(
+        f"ChecksumPrefetcher: {prefetch_seconds:8.2f}s "
+        f"(mean ready {stats['mean_ready']:.1f}/{stats['lookahead']})"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""Peak memory of load_and_validate() + create_final_csv(), whole-file vs chunked.
+
+Each mode runs in a fresh subprocess so its peak RSS is measured on its own.
+
+    python benchmarks/bench_chunked_ingest.py --recordings 200000 --chunksize 100000
+"""
+import argparse
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from bench_transform import write_manifest  # noqa: E402
+
+
+def peak_rss_mb():
+    # ru_maxrss survives exec, so it would include the parent's peak from
+    # generating the manifest; VmHWM belongs to this process alone.
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def run_once(csv_path, chunksize):
+    from willisapi_client.services.metadata.utils import MetadataValidation
+
+    start = time.perf_counter()
+    validator = MetadataValidation(csv_path, chunksize=chunksize)
+    assert validator.load_and_validate(), validator.errors
+    validator.create_final_csv()
+    seconds = time.perf_counter() - start
+    peak_mb = peak_rss_mb()
+    print(f"{seconds:.2f} {peak_mb:.0f} {validator.transformed_df.shape[0]}")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--recordings", type=int, default=100000)
+    parser.add_argument("--chunksize", type=int, default=100000)
+    parser.add_argument("--run", nargs=2, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.run:
+        csv_path, chunksize = args.run
+        run_once(csv_path, int(chunksize) or None)
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        csv_path = os.path.join(tmp, "metadata.csv")
+        n_rows = write_manifest(csv_path, args.recordings)
+        size_mb = os.path.getsize(csv_path) / 1024 / 1024
+        print(f"rows={n_rows} csv={size_mb:.0f} MB")
+        for label, chunksize in (("whole file", 0), ("chunked", args.chunksize)):
+            out = subprocess.run(
+                [sys.executable, __file__, "--run", csv_path, str(chunksize)],
+                check=True,
+                capture_output=True,
+                text=True,
+            ).stdout.split()
+            seconds, peak_mb, recordings = out
+            print(
+                f"{label:10s}: {float(seconds):7.2f}s  peak RSS {peak_mb:>6s} MB  "
+                f"recordings={recordings}"
+            )
+
+
+if __name__ == "__main__":
+    main()
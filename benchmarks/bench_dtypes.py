@@ -0,0 +1,87 @@
+"""Memory held by a loaded manifest: all-object columns vs the dtype schema.
+
+Reports DataFrame.memory_usage(deep=True) after load_and_validate() for a
+data-upload manifest (one row per COA item) and a processed-upload manifest
+(one row per recording), next to the same CSV loaded the old way, with
+read_csv() followed by replace({np.nan: None}).
+
+    python benchmarks/bench_dtypes.py --recordings 100000
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from bench_transform import write_manifest  # noqa: E402
+
+from willisapi_client.services.metadata.utils import (  # noqa: E402
+    MetadataValidation,
+    ProcessedMetadataValidation,
+)
+
+
+def write_processed_manifest(path, n_recordings, recordings_per_visit=2):
+    recording = pd.Series(np.arange(n_recordings))
+    visit = recording // recordings_per_visit
+    df = pd.DataFrame(
+        {
+            "study_id": "study",
+            "site_id": "site_" + (visit % 50).astype(str),
+            "pt_id": "pt_" + (visit // 3).astype(str),
+            "visit_id": "visit_" + (visit % 3).astype(str),
+            "visit_order": visit % 3 + 1,
+            "coa_id": "MADRS",
+            "timestamp": "2024-01-01T10:00:00",
+            "recording_order": recording % recordings_per_visit + 1,
+            "workflow": "workflow",
+            "recording": "s3://bucket/dir/rec_" + recording.astype(str) + ".wav",
+            "rater_id": "rater_" + (visit % 20).astype(str),
+            "language": "en-US",
+            "site_country": "US",
+        }
+    )
+    for i in range(1, 11):
+        scores = np.random.randint(0, 6, n_recordings).astype(float)
+        scores[np.random.random(n_recordings) < 0.05] = np.nan
+        df[f"item_score_{i:02d}"] = scores
+    df.to_csv(path, index=False)
+
+
+def report(label, validator_cls, csv_path):
+    legacy = pd.read_csv(csv_path).replace({np.nan: None})
+    legacy_mb = legacy.memory_usage(deep=True).sum() / 1024 / 1024
+    del legacy
+
+    validator = validator_cls(csv_path)
+    start = time.perf_counter()
+    assert validator.load_and_validate(), validator.errors
+    seconds = time.perf_counter() - start
+    typed_mb = validator.df.memory_usage(deep=True).sum() / 1024 / 1024
+    print(
+        f"{label:10s} rows={validator.df.shape[0]:>9d}  object columns {legacy_mb:8.1f} MB"
+        f"  typed {typed_mb:8.1f} MB  ({legacy_mb / typed_mb:.1f}x, load {seconds:.2f}s)"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--recordings", type=int, default=100000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        data_csv = os.path.join(tmp, "metadata.csv")
+        write_manifest(data_csv, args.recordings)
+        report("data", MetadataValidation, data_csv)
+
+        processed_csv = os.path.join(tmp, "processed.csv")
+        write_processed_manifest(processed_csv, args.recordings)
+        report("processed", ProcessedMetadataValidation, processed_csv)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""Compare per-row os.walk lookups with a FilenameIndex built once.
+
+Builds a synthetic output tree shaped like processed-data output
+(<container>/<version>/<recording>_<suffix>), then answers one lookup per
+row both ways. The per-row walk is timed on a sample of rows and
+extrapolated, since running it for every row is exactly the problem.
+
+    python benchmarks/bench_file_index.py --files 500000 --rows 20000
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+
+from willisapi_client.services.metadata.utils import (
+    FilenameIndex,
+    find_files_with_pattern,
+)
+
+
+def build_tree(root, n_files, files_per_dir=500):
+    names = []
+    for i in range(n_files):
+        directory = os.path.join(
+            root, f"container_{i // (files_per_dir * 10)}", f"v{i // files_per_dir}"
+        )
+        if i % files_per_dir == 0:
+            os.makedirs(directory, exist_ok=True)
+        recording = f"rec_{i // 5:07d}"
+        name = f"{recording}_{i % 5}.json"
+        with open(os.path.join(directory, name), "w"):
+            pass
+        names.append(recording)
+    return names
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--files", type=int, default=100000)
+    parser.add_argument("--rows", type=int, default=20000)
+    parser.add_argument("--walk-sample", type=int, default=20)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as root:
+        recordings = build_tree(root, args.files)
+        patterns = [random.choice(recordings) for _ in range(args.rows)]
+
+        start = time.perf_counter()
+        index = FilenameIndex(root)
+        build_seconds = time.perf_counter() - start
+        start = time.perf_counter()
+        indexed = [index.find(p) for p in patterns]
+        query_seconds = time.perf_counter() - start
+
+        sample = patterns[: args.walk_sample]
+        start = time.perf_counter()
+        walked = [find_files_with_pattern(root, p) for p in sample]
+        walk_seconds = (time.perf_counter() - start) / len(sample) * len(patterns)
+
+        assert walked == indexed[: len(sample)], "results differ"
+        print(f"files={args.files} rows={args.rows}")
+        print(f"os.walk per row (extrapolated): {walk_seconds:10.2f}s")
+        print(
+            f"FilenameIndex build + queries:  {build_seconds + query_seconds:10.2f}s "
+            f"(build {build_seconds:.2f}s, queries {query_seconds:.2f}s)"
+        )
+
+
+if __name__ == "__main__":
+    main()
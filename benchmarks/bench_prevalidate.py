@@ -0,0 +1,61 @@
+"""Compare per-row UploadUtils.validate_row with validate_upload_rows.
+
+Creates one small file per recording (a share of them missing) and a few
+rows with unsupported languages, then validates every row both ways.
+
+    python benchmarks/bench_prevalidate.py --rows 100000
+"""
+import argparse
+import os
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+from willisapi_client.services.metadata.utils import (
+    UploadUtils,
+    validate_upload_rows,
+)
+
+
+def make_frame(root, n_rows, missing=0.05, bad_language=0.01):
+    rng = np.random.default_rng(0)
+    paths = [os.path.join(root, f"rec_{i}.wav") for i in range(n_rows)]
+    for path, skip in zip(paths, rng.random(n_rows) < missing):
+        if not skip:
+            with open(path, "wb"):
+                pass
+    language = np.where(rng.random(n_rows) < bad_language, "xx-XX", "en-US")
+    return pd.DataFrame(
+        {
+            "file_path": pd.Categorical(paths),
+            "language": pd.Categorical(language),
+        }
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=50000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as root:
+        df = make_frame(root, args.rows)
+
+        start = time.perf_counter()
+        per_row = [UploadUtils(row).validate_row()[1] for _, row in df.iterrows()]
+        per_row_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        bulk = validate_upload_rows(df)["error"].tolist()
+        bulk_seconds = time.perf_counter() - start
+
+        assert per_row == bulk, "results differ"
+        print(f"rows={args.rows} invalid={sum(e is not None for e in bulk)}")
+        print(f"validate_row per row: {per_row_seconds:8.2f}s")
+        print(f"validate_upload_rows: {bulk_seconds:8.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+"""Compare per-row and columnar score building for processed uploads.
+
+    python benchmarks/bench_processed_scores.py --rows 200000
+"""
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from willisapi_client.services.metadata.utils import (
+    COA_ITEM_COUNTS,
+    ProcessedMetadataValidation,
+)
+
+
+def make_frame(n_rows):
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame({"coa_id": rng.choice(list(COA_ITEM_COUNTS), n_rows)})
+    for i in range(1, max(COA_ITEM_COUNTS.values()) + 1):
+        scores = rng.integers(0, 6, n_rows).astype(float)
+        scores[rng.random(n_rows) < 0.1] = np.nan
+        df[f"item_score_{i:02d}"] = scores
+    return df.replace({np.nan: None})
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=100000)
+    args = parser.parse_args()
+
+    df = make_frame(args.rows)
+    validator = ProcessedMetadataValidation("unused.csv")
+
+    start = time.perf_counter()
+    per_row = list(
+        df.apply(lambda row: validator.create_scores(row, row["coa_id"]), axis=1)
+    )
+    per_row_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    bulk = validator.create_scores_bulk(df)
+    bulk_seconds = time.perf_counter() - start
+
+    assert per_row == bulk, "results differ"
+    print(f"rows={args.rows}")
+    print(f"apply(create_scores, axis=1): {per_row_seconds:8.2f}s")
+    print(f"create_scores_bulk:           {bulk_seconds:8.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""Compare pd.Series rows from iterrows() with DataRow records.
+
+Times building each data-upload row, its payload and its result dict both
+ways, on the transformed output of a synthetic manifest. Checksums are
+stubbed out, since only the per-row overhead is of interest here.
+
+    python benchmarks/bench_row_records.py --recordings 100000
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from bench_transform import write_manifest  # noqa: E402
+
+from willisapi_client.services.metadata.records import DataRow  # noqa: E402
+from willisapi_client.services.metadata.utils import (  # noqa: E402
+    MetadataValidation,
+    UploadUtils,
+)
+
+
+def payloads(rows):
+    results = []
+    for row in rows:
+        u = UploadUtils(row)
+        u.calculate_file_checksum = lambda path: ""
+        results.append(u.generate_payload())
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--recordings", type=int, default=50000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        csv_path = os.path.join(tmp, "metadata.csv")
+        write_manifest(csv_path, args.recordings)
+        validator = MetadataValidation(csv_path)
+        assert validator.load_and_validate(), validator.errors
+        df = validator.create_final_csv()
+
+    start = time.perf_counter()
+    series_rows = [row for _, row in df.iterrows()]
+    series_payloads = payloads(series_rows)
+    series_results = [row.to_dict() for row in series_rows]
+    series_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    records = DataRow.from_frame(df)
+    record_payloads = payloads(records)
+    record_results = df.assign(upload_status="Success", error=None)
+    record_seconds = time.perf_counter() - start
+
+    assert series_payloads == record_payloads, "payloads differ"
+    assert len(series_results) == len(record_results)
+    print(f"recordings={df.shape[0]}")
+    print(f"iterrows + Series payloads: {series_seconds:8.2f}s")
+    print(f"DataRow records + payloads: {record_seconds:8.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,42 @@
+"""Compare per-row dateutil parsing with TimestampParser.
+
+    python benchmarks/bench_timestamps.py --rows 200000 --distinct 20000
+"""
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+from dateutil import parser
+
+from willisapi_client.services.metadata.timestamps import TimestampParser
+
+
+def main():
+    arg_parser = argparse.ArgumentParser()
+    arg_parser.add_argument("--rows", type=int, default=100000)
+    arg_parser.add_argument("--distinct", type=int, default=10000)
+    args = arg_parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    start_time = pd.Timestamp("2024-01-01")
+    offsets = pd.to_timedelta(rng.integers(0, 10**8, args.distinct), unit="s")
+    distinct = (start_time + offsets).strftime("%Y-%m-%dT%H:%M:%S")
+    values = pd.Series(rng.choice(np.asarray(distinct), args.rows))
+
+    start = time.perf_counter()
+    per_row = [parser.parse(value).isoformat() for value in values]
+    per_row_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    bulk, failed = TimestampParser().parse(values)
+    bulk_seconds = time.perf_counter() - start
+
+    assert not failed and per_row == bulk.tolist(), "results differ"
+    print(f"rows={args.rows} distinct={args.distinct}")
+    print(f"dateutil per row: {per_row_seconds:8.2f}s")
+    print(f"TimestampParser:  {bulk_seconds:8.2f}s")
+
+
+if __name__ == "__main__":
+    main()
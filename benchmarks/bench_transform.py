@@ -0,0 +1,73 @@
+"""Time MetadataValidation on a large synthetic data-upload CSV.
+
+Generates a manifest with one row per COA item, then times
+load_and_validate() and create_final_csv(). To compare two versions of
+the client, run the script with PYTHONPATH pointing at each checkout.
+
+    python benchmarks/bench_transform.py --recordings 100000
+"""
+import argparse
+import os
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+from willisapi_client.services.metadata.utils import MetadataValidation
+
+
+def write_manifest(path, n_recordings, items_per_recording=10, recordings_per_visit=4):
+    recording = pd.Series(np.repeat(np.arange(n_recordings), items_per_recording))
+    visit = recording // recordings_per_visit
+    df = pd.DataFrame(
+        {
+            "study_id": "study",
+            "site_id": "site_" + (visit % 50).astype(str),
+            "participant_id": "pt_" + (visit // 3).astype(str),
+            "visit_name": "visit_" + (visit % 3).astype(str),
+            "visit_order": visit % 3 + 1,
+            "coa_name": "MADRS",
+            "coa_item_number": np.tile(
+                np.arange(1, items_per_recording + 1), n_recordings
+            ),
+            "coa_item_value": np.random.randint(0, 6, len(recording)),
+            "file_path": "/data/rec_" + recording.astype(str) + ".wav",
+            "time_collected": "2024-01-01",
+            "recording_order": recording % recordings_per_visit + 1,
+            "rater_id": "rater",
+            "age": 40,
+            "sex": "F",
+            "race": "race",
+            "language": "en-US",
+        }
+    )
+    df.to_csv(path, index=False)
+    return len(df)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--recordings", type=int, default=50000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        csv_path = os.path.join(tmp, "metadata.csv")
+        n_rows = write_manifest(csv_path, args.recordings)
+
+        validator = MetadataValidation(csv_path)
+        start = time.perf_counter()
+        assert validator.load_and_validate(), validator.errors
+        validate_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        validator.create_final_csv()
+        transform_seconds = time.perf_counter() - start
+
+        print(f"rows={n_rows} recordings={validator.transformed_df.shape[0]}")
+        print(f"load_and_validate: {validate_seconds:8.2f}s")
+        print(f"create_final_csv:  {transform_seconds:8.2f}s")
+
+
+if __name__ == "__main__":
+    main()
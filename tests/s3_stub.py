@@ -0,0 +1,140 @@
+"""A minimal in-process S3 stand-in for upload tests.
+
+Implements just enough of the S3 REST API to exercise the client: single
+PUTs, multipart part PUTs (with SHA-256 checksum verification), completion
+and abort. Presigned URLs are plain ``http://127.0.0.1:<port>/bucket/key``
+URLs with the usual query parameters.
+"""
+import base64
+import hashlib
+import re
+import threading
+import uuid
+from collections import defaultdict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+
+class _Handler(BaseHTTPRequestHandler):
+    def log_message(self, *args):
+        pass
+
+    def _reply(self, status, body=b"", headers=None):
+        self.send_response(status)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _target(self):
+        url = urlsplit(self.path)
+        query = {k: v[0] for k, v in parse_qs(url.query).items()}
+        return url.path, query
+
+    def _body(self):
+        return self.rfile.read(int(self.headers.get("Content-Length", 0)))
+
+    def do_PUT(self):
+        s3 = self.server.s3
+        path, query = self._target()
+        body = self._body()
+        s3.requests.append(("PUT", path, dict(query)))
+        checksum = self.headers.get("x-amz-checksum-sha256")
+        actual = base64.b64encode(hashlib.sha256(body).digest()).decode("utf-8")
+        if checksum is not None and checksum != actual:
+            return self._reply(400, b"<Error><Code>BadDigest</Code></Error>")
+
+        with s3.lock:
+            throttled = s3.throttle > 0
+            s3.throttle -= throttled
+        if throttled:
+            return self._reply(503, b"<Error><Code>SlowDown</Code></Error>")
+
+        if "uploadId" in query:
+            number = int(query["partNumber"])
+            with s3.lock:
+                if s3.fail_parts[number] > 0:
+                    s3.fail_parts[number] -= 1
+                    return self._reply(500, b"<Error><Code>InternalError</Code></Error>")
+                s3.uploads[query["uploadId"]][number] = body
+            etag = '"%s"' % hashlib.md5(body).hexdigest()
+            return self._reply(200, headers={"ETag": etag})
+
+        s3.objects[path] = body
+        return self._reply(200)
+
+    def do_POST(self):
+        s3 = self.server.s3
+        path, query = self._target()
+        body = self._body().decode("utf-8")
+        s3.requests.append(("POST", path, dict(query)))
+        parts = s3.uploads.pop(query.get("uploadId"), None)
+        if parts is None:
+            return self._reply(404, b"<Error><Code>NoSuchUpload</Code></Error>")
+        listed = re.findall(
+            r"<PartNumber>(\d+)</PartNumber><ETag>(.*?)</ETag>", body.replace("&quot;", '"')
+        )
+        data = b""
+        for number, etag in listed:
+            part = parts[int(number)]
+            if etag != '"%s"' % hashlib.md5(part).hexdigest():
+                return self._reply(200, b"<Error><Code>InvalidPart</Code></Error>")
+            data += part
+        s3.objects[path] = data
+        return self._reply(200, b"<CompleteMultipartUploadResult/>")
+
+    def do_DELETE(self):
+        s3 = self.server.s3
+        path, query = self._target()
+        s3.requests.append(("DELETE", path, dict(query)))
+        s3.uploads.pop(query.get("uploadId"), None)
+        return self._reply(204)
+
+
+class LocalS3Server:
+    def __init__(self):
+        self.objects = {}
+        self.uploads = defaultdict(dict)
+        self.fail_parts = defaultdict(int)
+        # The next ``throttle`` PUTs are answered with 503 SlowDown.
+        self.throttle = 0
+        self.requests = []
+        self.lock = threading.Lock()
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+        self._server.s3 = self
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def endpoint(self):
+        host, port = self._server.server_address
+        return f"http://{host}:{port}"
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def presigned_put(self, key):
+        return f"{self.endpoint}/bucket/{key}?X-Amz-Signature=test"
+
+    def presigned_multipart(self, key, part_count, part_size):
+        """Return the multipart section the metadata endpoint would send."""
+        upload_id = uuid.uuid4().hex
+        self.uploads[upload_id] = {}
+        base = f"{self.endpoint}/bucket/{key}"
+        return {
+            "part_size": part_size,
+            "parts": [
+                {
+                    "part_number": number,
+                    "url": f"{base}?partNumber={number}&uploadId={upload_id}",
+                }
+                for number in range(1, part_count + 1)
+            ],
+            "complete_url": f"{base}?uploadId={upload_id}",
+            "abort_url": f"{base}?uploadId={upload_id}",
+        }
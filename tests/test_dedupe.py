@@ -0,0 +1,63 @@
+import os
+
+from willisapi_client.services.metadata.dedupe import (
+    FileDeduplicator,
+    PutLedger,
+    duplicate_positions,
+)
+
+
+class TestFileDeduplicator:
+    def setup(self):
+        self.hashed = []
+
+    def _compute(self, path):
+        self.hashed.append(path)
+        with open(path, "rb") as f:
+            return f.read().decode()
+
+    def test_each_inode_is_hashed_once(self, tmp_path):
+        original = tmp_path / "a.wav"
+        original.write_bytes(b"audio")
+        link = tmp_path / "b.wav"
+        os.link(original, link)
+        copy = tmp_path / "c.wav"
+        copy.write_bytes(b"audio")
+
+        deduplicator = FileDeduplicator(self._compute)
+        for path in (original, link, original, copy):
+            assert deduplicator.checksum(str(path)) == "audio"
+
+        assert self.hashed == [str(original), str(copy)]
+        assert deduplicator.known(str(link)) == "audio"
+        assert deduplicator.known(str(tmp_path / "missing.wav")) is None
+
+    def test_duplicate_positions(self):
+        positions = duplicate_positions(["x", "y", None, "x", None, "y", "x"])
+        assert positions.fillna(-1).tolist() == [-1, -1, -1, 0, -1, 1, 0]
+
+
+class TestPutLedger:
+    def test_same_object_and_bytes_are_put_once(self):
+        ledger = PutLedger()
+        calls = []
+
+        def put():
+            calls.append(1)
+            return None
+
+        assert ledger.put_once("https://s3/key?sig=1", "sum", put) is None
+        assert ledger.put_once("https://s3/key?sig=2", "sum", put) is None
+        assert ledger.put_once("https://s3/other?sig=1", "sum", put) is None
+        assert ledger.put_once("https://s3/key?sig=3", "changed", put) is None
+
+        assert len(calls) == 3
+        assert ledger.skipped == 1
+
+    def test_failed_put_is_retried_by_the_next_row(self):
+        ledger = PutLedger()
+        outcomes = iter(["S3 upload failed", None])
+
+        assert ledger.put_once("https://s3/key", "sum", lambda: next(outcomes))
+        assert ledger.put_once("https://s3/key", "sum", lambda: next(outcomes)) is None
+        assert ledger.skipped == 0
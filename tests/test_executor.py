@@ -0,0 +1,32 @@
+import threading
+
+from willisapi_client.services.metadata.executor import BoundedExecutor
+
+
+class TestBoundedExecutor:
+    def test_submit_blocks_while_pool_is_full(self):
+        release = threading.Event()
+        submitted = []
+
+        with BoundedExecutor(max_workers=1, max_pending=2) as executor:
+            executor.submit(release.wait)
+            executor.submit(lambda: None)
+
+            def submit_third():
+                executor.submit(lambda: None)
+                submitted.append(True)
+
+            waiter = threading.Thread(target=submit_third)
+            waiter.start()
+            waiter.join(timeout=0.2)
+            assert not submitted
+
+            release.set()
+            waiter.join(timeout=5)
+            assert submitted
+
+    def test_run_batch_keeps_order(self):
+        with BoundedExecutor(max_workers=4, max_pending=3) as executor:
+            assert executor.run_batch(lambda x: x * x, range(10)) == [
+                x * x for x in range(10)
+            ]
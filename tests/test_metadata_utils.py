@@ -0,0 +1,664 @@
+import base64
+import gc
+import hashlib
+import json
+from unittest.mock import MagicMock, patch
+
+import pandas as pd
+import pytest
+from dateutil import parser
+
+from willisapi_client.services.metadata.archive import archive_metadata_csv
+from willisapi_client.services.metadata.checksum_cache import ChecksumCache
+from willisapi_client.services.metadata.records import DataRow
+from willisapi_client.services.metadata.timestamps import TimestampParser
+from willisapi_client.services.metadata.utils import (
+    FilenameIndex,
+    MetadataValidation,
+    ProcessedMetadataValidation,
+    UploadUtils,
+    _gc_paused,
+    find_files_with_pattern,
+    sha256_base64,
+)
+
+
+class TestChecksum:
+    def test_streaming_checksum_matches_whole_file_digest(self, tmp_path):
+        file_path = tmp_path / "recording.wav"
+        data = bytes(range(256)) * 5000
+        file_path.write_bytes(data)
+        expected = base64.b64encode(hashlib.sha256(data).digest()).decode("utf-8")
+
+        assert sha256_base64(str(file_path), chunk_size=4096) == expected
+        assert UploadUtils(None).calculate_file_checksum(str(file_path)) == expected
+
+    def test_empty_file_checksum(self, tmp_path):
+        file_path = tmp_path / "empty.wav"
+        file_path.write_bytes(b"")
+        expected = base64.b64encode(hashlib.sha256(b"").digest()).decode("utf-8")
+
+        assert sha256_base64(str(file_path)) == expected
+
+
+class TestChecksumCache:
+    def setup(self):
+        self.calls = []
+
+    def _compute(self, file_path):
+        self.calls.append(file_path)
+        return sha256_base64(file_path)
+
+    def test_cache_hit_skips_hashing(self, tmp_path):
+        file_path = tmp_path / "recording.wav"
+        file_path.write_bytes(b"audio")
+        cache = ChecksumCache(str(tmp_path / "cache"))
+
+        first = cache.checksum(str(file_path), self._compute)
+        second = cache.checksum(str(file_path), self._compute)
+
+        assert first == second == sha256_base64(str(file_path))
+        assert len(self.calls) == 1
+
+    def test_modified_file_is_rehashed(self, tmp_path):
+        file_path = tmp_path / "recording.wav"
+        file_path.write_bytes(b"audio")
+        cache = ChecksumCache(str(tmp_path / "cache"))
+        cache.checksum(str(file_path), self._compute)
+
+        file_path.write_bytes(b"different audio")
+        checksum = cache.checksum(str(file_path), self._compute)
+
+        assert checksum == sha256_base64(str(file_path))
+        assert len(self.calls) == 2
+
+    def test_cache_persists_and_evicts(self, tmp_path):
+        paths = []
+        for i in range(3):
+            path = tmp_path / f"rec_{i}.wav"
+            path.write_bytes(b"audio-%d" % i)
+            paths.append(str(path))
+        cache = ChecksumCache(str(tmp_path / "cache"), max_entries=2)
+        for path in paths:
+            cache.checksum(path, self._compute)
+        cache.close()
+
+        reopened = ChecksumCache(str(tmp_path / "cache"), max_entries=2)
+        assert reopened.get(paths[0]) is None
+        assert reopened.get(paths[2]) == sha256_base64(paths[2])
+
+
+class TestFilenameIndex:
+    def _make_tree(self, root):
+        for rel in [
+            "a/rec_1_audio.json",
+            "a/rec_1_rec_1.json",
+            "a/b/rec_10.csv",
+            "a/b/other.csv",
+            "c/rec_2.parquet",
+            "top_rec_1.txt",
+        ]:
+            path = root / rel
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text("x")
+        (root / "link").symlink_to(root / "a", target_is_directory=True)
+
+    def test_matches_find_files_with_pattern(self, tmp_path):
+        self._make_tree(tmp_path)
+        index = FilenameIndex(str(tmp_path))
+
+        for pattern in ["rec_1", "rec_2", "rec", "csv", "missing", "", "b"]:
+            expected = find_files_with_pattern(str(tmp_path), pattern)
+            assert index.find(pattern) == expected
+
+    def test_missing_directory(self, tmp_path):
+        index = FilenameIndex(str(tmp_path / "missing"))
+        assert index.find("rec") == []
+
+
+class TestRecordingConsistency:
+    def test_reports_inconsistent_columns_per_recording(self):
+        validator = MetadataValidation("unused.csv")
+        validator.df = pd.DataFrame(
+            {
+                "study_id": ["s1", "s1", "s1", "s1"],
+                "file_path": ["b.wav", "b.wav", "a.wav", "a.wav"],
+                "age": [30, 31, 30, None],
+                "language": ["en-US", "fr", "en-US", "en-US"],
+                "coa_item_number": [1, 2, 1, 2],
+                "coa_item_value": [1, 2, 3, 4],
+                "recording_order": [1, 1, 2, 2],
+            }
+        )
+
+        assert validator.validate_recording_consistency() is False
+        assert validator.errors == [
+            "Inconsistent values in column 'age' for recording: b.wav. "
+            "Found values: [30.0, 31.0]. All metadata columns must be "
+            "identical within a single recording.",
+            "Inconsistent values in column 'language' for recording: b.wav. "
+            "Found values: ['en-US', 'fr']. All metadata columns must be "
+            "identical within a single recording.",
+        ]
+
+    def test_consistent_recordings_pass(self):
+        validator = MetadataValidation("unused.csv")
+        validator.df = pd.DataFrame(
+            {
+                "file_path": ["a.wav", "a.wav", "b.wav"],
+                "age": [30, None, 40],
+                "coa_item_number": [1, 2, 1],
+                "coa_item_value": [1, 2, 3],
+                "recording_order": [1, 1, 2],
+            }
+        )
+
+        assert validator.validate_recording_consistency() is True
+        assert validator.errors == []
+
+
+class TestTransformToSerializerFormat:
+    def _validator(self, rows):
+        validator = MetadataValidation("unused.csv")
+        base = {
+            "study_id": "s1",
+            "site_id": "site",
+            "participant_id": "pt",
+            "visit_name": "baseline",
+            "visit_order": 1,
+            "time_collected": "2024-01-01",
+            "rater_id": "rater",
+            "language": "en-US",
+        }
+        validator.df = pd.DataFrame([{**base, **row} for row in rows])
+        return validator
+
+    def test_records_scores_and_last_recording(self):
+        validator = self._validator(
+            [
+                {"coa_name": "GAD-7", "file_path": "a.wav", "recording_order": 1,
+                 "coa_item_number": 1, "coa_item_value": 2},
+                {"coa_name": "GAD-7", "file_path": "a.wav", "recording_order": 1,
+                 "coa_item_number": 3, "coa_item_value": None},
+                {"coa_name": "GAD-7", "file_path": "b.wav", "recording_order": 2,
+                 "coa_item_number": 2, "coa_item_value": 3},
+                {"coa_name": "PHQ-9", "file_path": "c.wav", "recording_order": 3,
+                 "coa_item_number": 9, "coa_item_value": 1},
+            ]
+        )
+
+        records = validator.transform_to_serializer_format()
+
+        assert [r["file_path"] for r in records] == ["a.wav", "b.wav", "c.wav"]
+        assert [r["is_last_recording"] for r in records] == [False, False, True]
+        gad7 = records[0]["actual_scores"]
+        assert len(gad7["sections"]) == 7
+        assert [s["items"][0]["item_score"] for s in gad7["sections"]] == [
+            2, None, None, None, None, None, None
+        ]
+        assert gad7["total_score"] == 2
+        # Later recordings of an assessment reuse the first recording's scores.
+        assert records[1]["actual_scores"] == gad7
+        phq9 = records[2]["actual_scores"]
+        assert phq9["sections"][8] == {
+            "section_id": "s09",
+            "section_notes": None,
+            "items": [{"item_id": "i09", "item_score": 1}],
+        }
+        assert phq9["total_score"] == 1
+        assert records[2]["rater_id"] == "rater"
+
+
+class TestStructuredScores:
+    def _processed_csv(self, tmp_path):
+        csv_path = tmp_path / "processed.csv"
+        pd.DataFrame(
+            [
+                {
+                    "study_id": "s1",
+                    "site_id": "site",
+                    "pt_id": "pt",
+                    "visit_id": "v1",
+                    "visit_order": 1,
+                    "coa_id": "GAD-7",
+                    "timestamp": "2024-01-01T10:00:00",
+                    "recording_order": 1,
+                    "workflow": "wf",
+                    "recording": "s3://bucket/dir/rec_1.wav",
+                    "rater_id": "rater",
+                    "language": "en-US",
+                    "item_score_01": 2,
+                    "item_score_02": 3,
+                }
+            ]
+        ).to_csv(csv_path, index=False)
+        return str(csv_path)
+
+    def test_scores_flow_into_payload_without_json(self, tmp_path):
+        validator = ProcessedMetadataValidation(self._processed_csv(tmp_path))
+        assert validator.load_and_validate()
+        df = validator.create_final_csv()
+
+        scores = df.iloc[0]["scores_actual"]
+        assert isinstance(scores, dict)
+        assert scores["total_score"] == 5
+
+        payload = UploadUtils(df.iloc[0]).generate_processed_payload([])
+        assert payload["actual_scores"] is scores
+
+    def test_export_transformed_csv(self, tmp_path):
+        validator = ProcessedMetadataValidation(self._processed_csv(tmp_path))
+        validator.load_and_validate()
+        df = validator.create_final_csv()
+        out = tmp_path / "export.csv"
+
+        exported = validator.export_transformed_csv(str(out))
+
+        assert json.loads(exported.iloc[0]["scores_actual"]) == df.iloc[0]["scores_actual"]
+        assert isinstance(df.iloc[0]["scores_actual"], dict)
+        assert out.exists()
+
+
+class TestGcPaused:
+    def test_overlapping_pauses_restore_the_collector_once(self):
+        assert gc.isenabled()
+        first, second = _gc_paused(), _gc_paused()
+        first.__enter__()
+        second.__enter__()
+        first.__exit__(None, None, None)
+        assert not gc.isenabled()
+        second.__exit__(None, None, None)
+        assert gc.isenabled()
+
+    def test_a_disabled_collector_stays_disabled(self):
+        gc.disable()
+        try:
+            with _gc_paused():
+                pass
+            assert not gc.isenabled()
+        finally:
+            gc.enable()
+
+
+class TestTimestamps:
+    def _frame(self, timestamps):
+        return pd.DataFrame(
+            [
+                {
+                    "study_id": "s1",
+                    "site_id": "site",
+                    "pt_id": f"pt_{i}",
+                    "visit_id": "v1",
+                    "visit_order": 1,
+                    "coa_id": "GAD-7",
+                    "timestamp": timestamp,
+                    "recording_order": 1,
+                    "workflow": "wf",
+                    "recording": f"s3://bucket/dir/rec_{i}.wav",
+                    "rater_id": "rater",
+                    "language": "en-US",
+                }
+                for i, timestamp in enumerate(timestamps)
+            ]
+        )
+
+    def _csv(self, tmp_path, timestamps):
+        csv_path = tmp_path / "processed.csv"
+        self._frame(timestamps).to_csv(csv_path, index=False)
+        return str(csv_path)
+
+    def test_parser_matches_dateutil(self):
+        values = pd.Series(
+            [
+                "2024-01-01T10:00:00",
+                "2024-01-02T10:00:00",
+                "2024-01-01T10:00:00.250+05:30",
+                "Jan 3 2024 5pm",
+                "not a date",
+                None,
+                "2024-01-01T10:00:00",
+            ]
+        )
+        iso, failed = TimestampParser().parse(values)
+
+        for value, parsed in zip(values, iso):
+            if value in failed or value is None:
+                assert pd.isna(parsed)
+            else:
+                assert parsed == parser.parse(value).isoformat()
+        assert failed[0] == "not a date"
+        assert len(failed) == 2 and pd.isna(failed[1])
+
+    def test_invalid_timestamps_fail_validation(self, tmp_path):
+        validator = ProcessedMetadataValidation(
+            self._csv(tmp_path, ["2024-01-01T10:00:00", "31/31/2024"])
+        )
+
+        assert not validator.load_and_validate()
+        assert "Invalid timestamp values found: ['31/31/2024']" in validator.errors
+
+    def test_payload_uses_precomputed_iso(self, tmp_path):
+        validator = ProcessedMetadataValidation(
+            self._csv(tmp_path, ["2024-01-01 10:00", "2024-01-01 10:00"]),
+            chunksize=1,
+        )
+        assert validator.load_and_validate()
+        df = validator.create_final_csv()
+
+        payload = UploadUtils(df.iloc[0]).generate_processed_payload([])
+        assert payload["timestamp"] == "2024-01-01T10:00:00"
+        assert validator._timestamps.format == "%Y-%m-%d %H:%M"
+
+    def test_parquet_timestamp_column(self, tmp_path):
+        parquet_path = tmp_path / "processed.parquet"
+        timestamps = [pd.Timestamp("2024-01-01 10:00"), pd.Timestamp("2024-01-02")]
+        self._frame(timestamps).to_parquet(parquet_path, index=False)
+        validator = ProcessedMetadataValidation(str(parquet_path))
+
+        assert validator.load_and_validate(), validator.errors
+        df = validator.create_final_csv()
+
+        payload = UploadUtils(df.iloc[1]).generate_processed_payload([])
+        assert payload["timestamp"] == "2024-01-02T00:00:00"
+
+
+class TestCsvEngine:
+    def test_pyarrow_engine_reads_missing_text_as_c_engine_does(self, tmp_path):
+        pytest.importorskip("pyarrow")
+        df = TestTimestamps()._frame(["2024-01-01T10:00:00"] * 3)
+        df["language"] = ["en-US", None, "NA"]
+        csv_path = tmp_path / "processed.csv"
+        df.to_csv(csv_path, index=False)
+
+        frames = []
+        for engine in (None, "pyarrow"):
+            validator = ProcessedMetadataValidation(str(csv_path), csv_engine=engine)
+            assert validator.load_and_validate(), validator.errors
+            frames.append(validator.create_final_csv())
+
+        c_engine, pyarrow_engine = (
+            [UploadUtils(row).generate_processed_payload([]) for _, row in f.iterrows()]
+            for f in frames
+        )
+        assert pyarrow_engine == c_engine
+        assert [p["language"] for p in pyarrow_engine] == ["en-US", None, None]
+
+
+class TestMergeMultipartRecordings:
+    def test_recordings_of_one_visit_are_merged_in_order(self):
+        key = {"pt_id": "pt", "visit_id": "v1", "visit_order": 1, "coa_id": "GAD-7"}
+        validator = ProcessedMetadataValidation("unused.csv")
+        validator.df = pd.DataFrame(
+            [
+                {**key, "recording_order": 2, "recording": "s3://bucket/dir/b.wav"},
+                {
+                    **key,
+                    "pt_id": "other",
+                    "recording_order": 1,
+                    "recording": "s3://bucket/dir/c.wav",
+                },
+                {**key, "recording_order": 1, "recording": "s3://bucket/dir/a.wav"},
+            ]
+        )
+
+        df = validator.create_final_csv().set_index("pt_id")
+
+        assert df.loc["pt", "recording"] == "s3://bucket/dir/a_b.wav"
+        assert df.loc["pt", "recording_count"] == 2
+        assert (
+            df.loc["pt", "original_recordings"]
+            == "s3://bucket/dir/a.wav, s3://bucket/dir/b.wav"
+        )
+        assert df.loc["other", "recording"] == "s3://bucket/dir/c.wav"
+        assert df.loc["other", "recording_count"] == 1
+
+
+class TestChunkedLoad:
+    def _data_csv(self, tmp_path, rows):
+        base = {
+            "study_id": "s1",
+            "site_id": "site",
+            "visit_name": "baseline",
+            "visit_order": 1,
+            "time_collected": "2024-01-01",
+            "rater_id": "rater",
+        }
+        csv_path = tmp_path / "metadata.csv"
+        pd.DataFrame([{**base, **row} for row in rows]).to_csv(csv_path, index=False)
+        return str(csv_path)
+
+    def test_chunked_load_matches_whole_file(self, tmp_path):
+        rows = [
+            {
+                "participant_id": f"pt{i % 5 % 3}",
+                "coa_name": "GAD-7",
+                "file_path": f"rec_{i % 5}.wav",
+                "recording_order": i % 5 // 3 + 1,
+                "coa_item_number": i % 7 + 1,
+                "coa_item_value": i % 4,
+            }
+            for i in range(40)
+        ]
+        csv_path = self._data_csv(tmp_path, rows)
+        spill_dir = tmp_path / "spill"
+        spill_dir.mkdir()
+
+        whole = MetadataValidation(csv_path)
+        chunked = MetadataValidation(csv_path, chunksize=3, spill_dir=str(spill_dir))
+
+        assert whole.load_and_validate()
+        assert chunked.load_and_validate()
+        assert chunked.df is None
+        assert (
+            chunked.create_final_csv().to_dict("records")
+            == whole.create_final_csv().to_dict("records")
+        )
+        assert list(spill_dir.iterdir()) == []
+
+    def test_chunked_load_reports_errors_once(self, tmp_path):
+        rows = [
+            {
+                "participant_id": "pt",
+                "coa_name": coa_name,
+                "file_path": file_path,
+                "recording_order": 1,
+                "coa_item_number": 1,
+                "coa_item_value": 1,
+            }
+            for coa_name, file_path in [
+                ("BAD", "a.wav"),
+                ("GAD-7", "b.wav"),
+                ("BAD", "c.wav"),
+                ("WORSE", "b.wav"),
+            ]
+        ]
+        csv_path = self._data_csv(tmp_path, rows)
+
+        whole = MetadataValidation(csv_path)
+        chunked = MetadataValidation(csv_path, chunksize=1)
+
+        assert not whole.load_and_validate()
+        assert not chunked.load_and_validate()
+        assert chunked.errors == whole.errors
+
+    def test_chunked_processed_load_matches_whole_file(self, tmp_path):
+        csv_path = tmp_path / "processed.csv"
+        pd.DataFrame(
+            [
+                {
+                    "study_id": "s1",
+                    "site_id": "site",
+                    "pt_id": f"pt{i % 4}",
+                    "visit_id": "v1",
+                    "visit_order": 1,
+                    "coa_id": "MADRS",
+                    "timestamp": "2024-01-01T10:00:00",
+                    "recording_order": 10 - i,
+                    "workflow": "wf",
+                    "recording": f"s3://bucket/dir/rec_{i}.wav",
+                    "item_score_01": i,
+                }
+                for i in range(10)
+            ]
+        ).to_csv(csv_path, index=False)
+
+        whole = ProcessedMetadataValidation(str(csv_path))
+        chunked = ProcessedMetadataValidation(str(csv_path), chunksize=2)
+
+        assert whole.load_and_validate()
+        assert chunked.load_and_validate()
+        pd.testing.assert_frame_equal(
+            chunked.create_final_csv(), whole.create_final_csv()
+        )
+
+
+class TestDtypeSchema:
+    def _csv(self, tmp_path):
+        csv_path = tmp_path / "metadata.csv"
+        pd.DataFrame(
+            [
+                {
+                    "study_id": "s1",
+                    "site_id": "site",
+                    "participant_id": "pt",
+                    "visit_name": "baseline",
+                    "visit_order": 1,
+                    "coa_name": "GAD-7",
+                    "coa_item_number": item,
+                    "coa_item_value": value,
+                    "file_path": str(tmp_path / "a.wav"),
+                    "time_collected": "2024-01-01",
+                    "recording_order": 1,
+                    "rater_id": None,
+                    "age": None,
+                    "sex": "F",
+                    "race": "race",
+                    "language": None,
+                }
+                for item, value in [(1, 2), (2, None)]
+            ]
+        ).to_csv(csv_path, index=False)
+        (tmp_path / "a.wav").write_bytes(b"audio")
+        return str(csv_path)
+
+    def test_columns_are_typed(self, tmp_path):
+        validator = MetadataValidation(self._csv(tmp_path))
+        assert validator.load_and_validate()
+
+        dtypes = validator.df.dtypes
+        assert isinstance(dtypes["coa_name"], pd.CategoricalDtype)
+        assert isinstance(dtypes["participant_id"], pd.CategoricalDtype)
+        assert dtypes["visit_order"] == "Int64"
+        assert dtypes["coa_item_value"] == "Float64"
+        assert dtypes["age"] == "Float64"
+
+        df = validator.create_final_csv()
+        assert isinstance(df.dtypes["study_id"], pd.CategoricalDtype)
+        assert df.dtypes["recording_order"] == "Int64"
+
+    def test_payload_has_native_values(self, tmp_path):
+        validator = MetadataValidation(self._csv(tmp_path))
+        validator.load_and_validate()
+        row = next(validator.create_final_csv().iterrows())[1]
+
+        utils = UploadUtils(row)
+        assert utils.validate_row() == (True, None)
+        payload = utils.generate_payload()
+
+        json.dumps(payload, allow_nan=False)
+        assert payload["rater_id"] is None
+        assert payload["age"] is None
+        assert payload["language"] is None
+        assert payload["study_id"] == "s1"
+        assert payload["is_last_recording"] is True
+
+    def test_row_records_match_series_rows(self, tmp_path):
+        validator = MetadataValidation(self._csv(tmp_path))
+        validator.load_and_validate()
+        df = validator.create_final_csv()
+
+        (index, series), record = next(df.iterrows()), DataRow.from_frame(df)[0]
+        assert record.index == index
+        assert record.to_dict().keys() == series.to_dict().keys()
+        assert "time_collected" not in record
+        assert getattr(record, "time_collected", None) is None
+        assert UploadUtils(record).generate_payload() == (
+            UploadUtils(series).generate_payload()
+        )
+
+
+class TestArrowManifest:
+    def _frame(self):
+        return pd.DataFrame(
+            {
+                "study_id": "s1",
+                "site_id": "site",
+                "participant_id": ["pt1"] * 3 + ["pt2"] * 2,
+                "visit_name": "baseline",
+                "visit_order": 1,
+                "coa_name": "GAD-7",
+                "coa_item_number": [1, 2, 3, 1, 2],
+                "coa_item_value": [2, None, 1, 3, 0],
+                "file_path": ["a.wav"] * 3 + ["b.wav"] * 2,
+                "time_collected": "2024-01-01",
+                "recording_order": 1,
+                "notes": "not needed",
+            }
+        )
+
+    @pytest.mark.parametrize("extension", [".parquet", ".arrow"])
+    @pytest.mark.parametrize("chunksize", [None, 2])
+    def test_matches_csv_manifest(self, tmp_path, extension, chunksize):
+        pytest.importorskip("pyarrow")
+        df = self._frame()
+        csv_path = tmp_path / "metadata.csv"
+        df.to_csv(csv_path, index=False)
+        manifest_path = tmp_path / f"metadata{extension}"
+        if extension == ".parquet":
+            df.to_parquet(manifest_path)
+        else:
+            df.to_feather(manifest_path)
+
+        from_csv = MetadataValidation(str(csv_path))
+        from_arrow = MetadataValidation(str(manifest_path), chunksize=chunksize)
+
+        assert from_csv.load_and_validate()
+        assert from_arrow.load_and_validate()
+        if chunksize is None:
+            assert "notes" not in from_arrow.df.columns
+            assert isinstance(from_arrow.df.dtypes["file_path"], pd.CategoricalDtype)
+        pd.testing.assert_frame_equal(
+            from_arrow.create_final_csv(), from_csv.create_final_csv()
+        )
+
+    @pytest.mark.parametrize(
+        "name, content_type",
+        [
+            ("metadata.parquet", "application/vnd.apache.parquet"),
+            # Types the server's mimetypes table lacks are signed as octet-stream.
+            ("metadata.pq", "application/octet-stream"),
+            ("metadata.arrow", "application/octet-stream"),
+        ],
+    )
+    @patch("willisapi_client.services.metadata.archive.session")
+    def test_non_csv_manifests_are_archived_as_they_are(
+        self, mock_session, name, content_type, tmp_path
+    ):
+        manifest_path = tmp_path / name
+        if name.endswith(".arrow"):
+            self._frame().to_feather(manifest_path)
+        else:
+            self._frame().to_parquet(manifest_path)
+        sent = []
+        session = mock_session.return_value
+        session.post.return_value = MagicMock(
+            status_code=201,
+            json=lambda: {"record_id": "r1", "presigned_url": "https://s3/archive"},
+        )
+        session.put.side_effect = lambda url, data, headers: (
+            sent.append((data.read(), headers)) or MagicMock(status_code=200)
+        )
+
+        assert archive_metadata_csv("key", str(manifest_path), 5, "data") == "r1"
+        assert session.post.call_args[1]["json"]["filename"] == name
+        assert sent == [(manifest_path.read_bytes(), {"Content-Type": content_type})]
@@ -0,0 +1,132 @@
+from unittest.mock import patch
+
+import threading
+
+from willisapi_client.services.metadata.multipart import (
+    _FilePart,
+    multipart_request,
+    plan_parts,
+    upload_multipart,
+)
+from willisapi_client.services.metadata.upload import upload
+from willisapi_client.services.transport import S3, transport
+from tests.s3_stub import LocalS3Server
+from tests.test_upload import _write_metadata_csv
+
+
+class TestMultipartUpload:
+    def setup(self):
+        self.key = "dummy"
+        self.part_size = 1024
+        self.data = bytes(range(256)) * 18  # 4608 bytes -> 5 parts
+
+    def _recording(self, tmp_path):
+        path = tmp_path / "large.wav"
+        path.write_bytes(self.data)
+        return str(path)
+
+    def test_plan_parts_covers_file(self):
+        parts = plan_parts(len(self.data), self.part_size)
+        assert [p[0] for p in parts] == [1, 2, 3, 4, 5]
+        assert sum(p[2] for p in parts) == len(self.data)
+        assert parts[-1] == (5, 4096, 512)
+
+    def test_multipart_request_threshold(self, tmp_path):
+        recording = self._recording(tmp_path)
+        assert multipart_request(recording, threshold=len(self.data) + 1) is None
+        assert multipart_request(recording, threshold=1, part_size=self.part_size) == {
+            "file_size": len(self.data),
+            "part_size": self.part_size,
+            "part_count": 5,
+        }
+
+    def test_file_part_reads_only_its_slice(self, tmp_path):
+        recording = self._recording(tmp_path)
+        with _FilePart(recording, 1024, 1024) as part:
+            assert len(part) == 1024
+            assert part.read(1000) == self.data[1024:2024]
+            assert part.read() == self.data[2024:2048]
+            assert part.read(10) == b""
+            part.seek(0)
+            assert part.tell() == 0
+            assert part.read() == self.data[1024:2048]
+
+    def test_upload_multipart_retries_failed_part(self, tmp_path):
+        recording = self._recording(tmp_path)
+        with LocalS3Server() as s3:
+            s3.fail_parts[2] = 2
+            multipart = s3.presigned_multipart("large.wav", 5, self.part_size)
+            error = upload_multipart(recording, multipart)
+
+            assert error is None
+            assert s3.objects["/bucket/large.wav"] == self.data
+            part_2_puts = [
+                r for r in s3.requests if r[0] == "PUT" and r[2].get("partNumber") == "2"
+            ]
+            assert len(part_2_puts) == 3
+
+    def test_each_part_thread_uses_its_own_session(self, tmp_path):
+        recording = self._recording(tmp_path)
+        used = {}
+
+        def sessions():
+            session = transport.session(S3)
+            used.setdefault(threading.get_ident(), set()).add(id(session))
+            return session
+
+        with LocalS3Server() as s3:
+            multipart = s3.presigned_multipart("large.wav", 5, self.part_size)
+            assert upload_multipart(recording, multipart, sessions=sessions) is None
+
+        part_threads = set(used) - {threading.get_ident()}
+        assert part_threads
+        assert all(len(ids) == 1 for ids in used.values())
+        assert len({id_ for ids in used.values() for id_ in ids}) == len(used)
+
+    def test_upload_multipart_aborts_after_exhausting_retries(self, tmp_path):
+        recording = self._recording(tmp_path)
+        with LocalS3Server() as s3:
+            s3.fail_parts[3] = 10
+            multipart = s3.presigned_multipart("large.wav", 5, self.part_size)
+            error = upload_multipart(recording, multipart)
+
+            assert "part 3" in error
+            assert "/bucket/large.wav" not in s3.objects
+            assert s3.requests[-1][0] == "DELETE"
+
+    @patch("willisapi_client.services.metadata.upload.finalize_metadata_csv")
+    @patch("willisapi_client.services.metadata.upload.archive_metadata_csv")
+    @patch("willisapi_client.services.metadata.utils.UploadUtils.post")
+    def test_upload_uses_multipart_above_threshold(
+        self, mock_post, mock_archive, mock_finalize, tmp_path
+    ):
+        csv_path = _write_metadata_csv(tmp_path, n_recordings=2)
+        (tmp_path / "rec_1.wav").write_bytes(self.data)
+        mock_archive.return_value = None
+
+        with LocalS3Server() as s3:
+
+            def post(api_key, url, headers, payload):
+                if "multipart" in payload:
+                    response = {
+                        "multipart": s3.presigned_multipart(
+                            payload["filename"],
+                            payload["multipart"]["part_count"],
+                            payload["multipart"]["part_size"],
+                        )
+                    }
+                else:
+                    response = {"presigned": s3.presigned_put(payload["filename"])}
+                return {"upload_status": "Success", "response": response, "error": None}
+
+            mock_post.side_effect = post
+            results = upload(
+                self.key,
+                csv_path,
+                multipart_threshold=len(self.data),
+                multipart_part_size=self.part_size,
+            )
+
+            assert (results["upload_status"] == "Success").all()
+            assert s3.objects["/bucket/rec_1.wav"] == self.data
+            assert s3.objects["/bucket/rec_0.wav"] == b"audio-0"
@@ -0,0 +1,74 @@
+import threading
+
+from willisapi_client.services.metadata.prefetch import ChecksumPrefetcher
+
+
+class TestChecksumPrefetcher:
+    def setup(self):
+        self.hashed = []
+        self.lock = threading.Lock()
+
+    def _compute(self, path):
+        with self.lock:
+            self.hashed.append(path)
+        return f"sum-{path}"
+
+    def test_files_are_hashed_ahead_within_the_window(self):
+        prefetcher = ChecksumPrefetcher(self._compute, workers=4, lookahead=2)
+        prefetcher.start(["a", "b", "c", "d"])
+        stats = prefetcher.stats()
+        assert stats["queued"] + stats["hashing"] + stats["ready"] == 2
+
+        assert prefetcher.checksum("a") == "sum-a"
+        assert prefetcher.checksum("b") == "sum-b"
+        assert prefetcher.checksum("c") == "sum-c"
+        assert prefetcher.checksum("d") == "sum-d"
+        prefetcher.close()
+
+        assert sorted(self.hashed) == ["a", "b", "c", "d"]
+        stats = prefetcher.stats()
+        assert stats["hits"] == 4 and stats["misses"] == 0
+        assert stats["queued"] + stats["hashing"] + stats["ready"] == 0
+
+    def test_unplanned_files_are_hashed_inline(self):
+        prefetcher = ChecksumPrefetcher(self._compute, lookahead=2)
+        prefetcher.start(["a", "a"])
+
+        assert prefetcher.checksum("a") == "sum-a"
+        assert prefetcher.checksum("a") == "sum-a"
+        assert prefetcher.checksum("z") == "sum-z"
+        prefetcher.close()
+
+        assert prefetcher.stats()["misses"] == 1
+        assert self.hashed.count("a") == 1
+
+    def test_files_hashed_inline_are_struck_from_the_plan(self):
+        prefetcher = ChecksumPrefetcher(self._compute, workers=1, lookahead=2)
+        prefetcher.start(["a", "b", "c", "d"])
+
+        # Asked for out of order: "c" and "d" are not in the window yet.
+        for path in ["c", "d", "a", "b"]:
+            assert prefetcher.checksum(path) == f"sum-{path}"
+        prefetcher.close()
+
+        stats = prefetcher.stats()
+        assert stats["hits"] == 2 and stats["misses"] == 2
+        assert stats["queued"] + stats["hashing"] + stats["ready"] == 0
+        assert sorted(self.hashed) == ["a", "b", "c", "d"]
+
+    def test_discarded_files_leave_the_window(self):
+        prefetcher = ChecksumPrefetcher(self._compute, workers=1, lookahead=2)
+        prefetcher.start(["a", "b", "c", "d"])
+
+        prefetcher.discard(["a", "d"])
+        assert prefetcher.checksum("b") == "sum-b"
+        assert prefetcher.checksum("c") == "sum-c"
+        prefetcher.close()
+
+        stats = prefetcher.stats()
+        assert stats["hits"] == 2 and stats["misses"] == 0
+        assert stats["queued"] + stats["hashing"] + stats["ready"] == 0
+        assert "d" not in self.hashed
+
+    def test_disabled_by_zero_lookahead(self):
+        assert ChecksumPrefetcher.from_kwargs({"checksum_lookahead": 0}, str) is None
@@ -0,0 +1,72 @@
+from unittest.mock import MagicMock
+
+import pytest
+import requests
+
+from willisapi_client.services.metadata.rate_control import AdaptiveRateController
+from willisapi_client.services.retry import RetryPolicy
+from willisapi_client.services.transport import S3, Transport
+from tests.s3_stub import LocalS3Server
+
+
+class TestAdaptiveRateController:
+    def setup(self):
+        self.controller = AdaptiveRateController(
+            initial_rate=10.0,
+            min_rate=1.0,
+            max_rate=12.0,
+            cooldown=60.0,
+            policy=RetryPolicy(attempts=1),
+        )
+
+    def _session(self, status_code, text=""):
+        session = MagicMock()
+        session.put.return_value = MagicMock(status_code=status_code, text=text)
+        return session
+
+    def test_healthy_responses_ramp_up_to_max(self):
+        self.controller.increase_interval = 0.0
+        for _ in range(5):
+            self.controller.put(self._session(200), "https://s3/presigned")
+        assert self.controller.rate == 12.0
+        assert self.controller.stats()["successes"] == 5
+
+    def test_burst_of_successes_increases_once_per_interval(self):
+        self.controller.max_rate = 100.0
+        for _ in range(50):
+            self.controller.on_success()
+        assert self.controller.rate == 11.0
+        assert self.controller.stats()["successes"] == 50
+
+    def test_slow_down_backs_off_once_per_cooldown(self):
+        self.controller.put(self._session(503, "<Code>SlowDown</Code>"), "https://s3")
+        self.controller.put(self._session(503, "<Code>SlowDown</Code>"), "https://s3")
+        assert self.controller.rate == 5.0
+        assert self.controller.stats()["throttles"] == 2
+
+    def test_connection_reset_backs_off(self):
+        session = MagicMock()
+        session.put.side_effect = requests.exceptions.ConnectionError("reset")
+        with pytest.raises(requests.exceptions.ConnectionError):
+            self.controller.put(session, "https://s3/presigned")
+        assert self.controller.rate == 5.0
+
+    def test_client_errors_leave_rate_unchanged(self):
+        self.controller.put(self._session(403, "AccessDenied"), "https://s3")
+        assert self.controller.rate == 10.0
+
+    def test_each_retried_attempt_is_rate_limited(self):
+        policy = RetryPolicy(attempts=4, sleep=lambda _: None)
+        controller = AdaptiveRateController(
+            initial_rate=10.0, min_rate=1.0, cooldown=0.0, policy=policy
+        )
+        session = Transport(policy=policy).session(S3)
+        with LocalS3Server() as s3:
+            s3.throttle = 2
+            response = controller.put(session, s3.presigned_put("a.wav"), data=b"a")
+
+            assert response.status_code == 200
+            assert [r[0] for r in s3.requests] == ["PUT"] * 3
+            assert s3.objects["/bucket/a.wav"] == b"a"
+        assert controller.stats()["throttles"] == 2
+        assert controller.rate == 10.0 * 0.5 * 0.5 + 1.0
@@ -0,0 +1,154 @@
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import Mock
+
+import pytest
+import requests
+
+from willisapi_client.services.exceptions import CircuitOpenError
+from willisapi_client.services.retry import (
+    CLOSED,
+    HALF_OPEN,
+    OPEN,
+    RetryBudget,
+    RetryPolicy,
+    retry_after,
+    retryable_for,
+)
+from willisapi_client.services.transport import S3, Transport
+
+
+def _response(status, headers=None):
+    return Mock(status_code=status, headers=headers or {})
+
+
+class _FlakyHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_PUT(self):
+        body = self.rfile.read(int(self.headers["Content-Length"]))
+        self.server.bodies.append(body)
+        status = 503 if len(self.server.bodies) == 1 else 200
+        self.send_response(status)
+        self.send_header("Retry-After", "0")
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def log_message(self, *args):
+        pass
+
+
+class TestRetryPolicy:
+    def setup(self):
+        self.clock = [0.0]
+        self.sleeps = []
+        self.policy = RetryPolicy(
+            attempts=4,
+            base=1.0,
+            failure_threshold=3,
+            reset_timeout=10.0,
+            sleep=self.sleeps.append,
+            clock=lambda: self.clock[0],
+            rng=lambda: 0.5,
+        )
+
+    def test_full_jitter_backoff_then_success(self):
+        send = Mock(side_effect=[_response(503), _response(502), _response(200)])
+        assert self.policy.call("api", send).status_code == 200
+        assert self.sleeps == [0.5, 1.0]
+        assert self.policy.stats()["retries"] == 2
+
+    def test_retry_after_is_followed(self):
+        send = Mock(
+            side_effect=[_response(429, {"Retry-After": "7"}), _response(200)]
+        )
+        self.policy.call("api", send)
+        assert self.sleeps == [7.0]
+        assert retry_after(_response(503, {"Retry-After": "soon"})) is None
+        date = retry_after(
+            _response(503, {"Retry-After": "Wed, 21 Oct 2015 07:28:00 GMT"})
+        )
+        assert date == 0.0
+
+    def test_gives_up_after_attempts_and_raises_last_error(self):
+        send = Mock(side_effect=requests.exceptions.ConnectionError("reset"))
+        with pytest.raises(requests.exceptions.ConnectionError):
+            self.policy.call("api", send, attempts=2)
+        assert send.call_count == 2
+        assert self.policy.stats()["gave_up"] == 1
+
+    def test_client_errors_are_not_retried(self):
+        send = Mock(return_value=_response(400))
+        assert self.policy.call("api", send).status_code == 400
+        assert send.call_count == 1
+
+    def test_budget_limits_retries_per_run(self):
+        self.policy.budget = RetryBudget(ratio=0.0, minimum=1)
+        send = Mock(return_value=_response(503))
+        self.policy.call("a", send)
+        assert send.call_count == 2
+        self.policy.call("b", send)
+        assert send.call_count == 3
+        self.policy.start_run()
+        self.policy.call("c", send)
+        assert send.call_count == 5
+
+    def test_circuit_opens_fails_fast_and_recovers(self):
+        send = Mock(return_value=_response(502))
+        self.policy.call("s3", send, attempts=3)
+        assert self.policy.stats()["circuits"]["s3"]["state"] == OPEN
+        with pytest.raises(CircuitOpenError):
+            self.policy.call("s3", send)
+        assert send.call_count == 3
+
+        self.clock[0] = 10.0
+        breaker = self.policy.breaker("s3")
+        assert breaker.allow()
+        assert breaker.state == HALF_OPEN
+        assert not breaker.allow()
+        breaker.record_success()
+        assert breaker.state == CLOSED
+
+    def test_throttling_does_not_open_the_circuit(self):
+        send = Mock(return_value=_response(503))
+        self.policy.call("s3", send, attempts=4)
+        assert send.call_count == 4
+        assert self.policy.stats()["circuits"]["s3"]["state"] == CLOSED
+
+    def test_post_is_only_resent_when_it_cannot_have_taken_effect(self):
+        post = retryable_for("POST")
+        assert post(_response(503), None)[0]
+        assert post(_response(429), None)[0]
+        assert not post(_response(500), None)[0]
+        assert not post(None, requests.exceptions.ReadTimeout())[0]
+        assert retryable_for("PUT")(_response(500), None)[0]
+
+        policy = RetryPolicy(attempts=2, sleep=self.sleeps.append)
+        session = Transport(policy=policy).session(S3)
+        # Nothing listens on port 9: the connection is refused.
+        with pytest.raises(requests.exceptions.ConnectionError):
+            session.post("http://127.0.0.1:9/records", timeout=1)
+        assert policy.stats()["retries"] == 1
+
+    def test_nested_calls_send_once(self):
+        inner = Mock(return_value=_response(503))
+        outer = Mock(side_effect=lambda: self.policy.call("api", inner))
+        self.policy.call("api", outer, attempts=2)
+        assert inner.call_count == 2
+
+    def test_transport_rewinds_file_bodies(self, tmp_path):
+        server = ThreadingHTTPServer(("127.0.0.1", 0), _FlakyHandler)
+        server.bodies = []
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        path = tmp_path / "recording.wav"
+        path.write_bytes(b"audio bytes")
+        try:
+            session = Transport(policy=self.policy).session(S3)
+            with open(path, "rb") as f:
+                url = f"http://127.0.0.1:{server.server_address[1]}/key"
+                assert session.put(url, data=f).status_code == 200
+        finally:
+            server.shutdown()
+            server.server_close()
+        assert server.bodies == [b"audio bytes", b"audio bytes"]
+        assert self.sleeps == [0.0]
@@ -0,0 +1,84 @@
+import threading
+
+from willisapi_client.services.metadata.scheduler import (
+    BLOCKED_ERROR,
+    UploadTask,
+    VisitScheduler,
+)
+
+SUCCESS = {"upload_status": "Success", "error": None}
+
+
+class TestVisitScheduler:
+    def test_largest_files_run_first(self):
+        tasks = [
+            UploadTask(0, size=10),
+            UploadTask(1, size=300),
+            UploadTask(2, size=20),
+        ]
+        order = []
+
+        def execute(task):
+            order.append(task.position)
+            return SUCCESS
+
+        list(VisitScheduler(workers=1).run(tasks, execute))
+        assert order == [1, 2, 0]
+
+    def test_last_recording_runs_after_its_siblings(self):
+        # The last recording is the largest, so only the barrier holds it back.
+        tasks = [
+            UploadTask(0, visit="a", size=1),
+            UploadTask(1, visit="a", size=1),
+            UploadTask(2, visit="a", is_last=True, size=1000),
+            UploadTask(3, visit="b", is_last=True, size=5),
+        ]
+        finished = []
+        lock = threading.Lock()
+
+        def execute(task):
+            with lock:
+                if task.position == 2:
+                    assert {0, 1} <= set(finished)
+                finished.append(task.position)
+            return SUCCESS
+
+        results = dict(VisitScheduler(workers=4).run(tasks, execute))
+        assert sorted(results) == [0, 1, 2, 3]
+        assert finished.index(2) > max(finished.index(0), finished.index(1))
+
+    def test_failed_sibling_holds_back_last_recording(self):
+        tasks = [
+            UploadTask(0, visit="a"),
+            UploadTask(1, visit="a", is_last=True),
+            UploadTask(2, visit="b", is_last=True),
+        ]
+
+        def execute(task):
+            assert task.position != 1
+            if task.position == 0:
+                return {"upload_status": "Failed", "error": "rejected"}
+            return SUCCESS
+
+        results = dict(VisitScheduler(workers=2).run(tasks, execute, {"b"}))
+        assert results[0]["error"] == "rejected"
+        assert results[1]["error"] == BLOCKED_ERROR
+        assert results[2]["error"] == BLOCKED_ERROR
+
+    def test_order_matches_dispatch_and_leaves_out_blocked_visits(self):
+        tasks = [
+            UploadTask(0, visit="v1", is_last=True, size=500),
+            UploadTask(1, visit="v1", size=10),
+            UploadTask(2, visit="v2", is_last=True, size=400),
+            UploadTask(3, size=20),
+        ]
+        dispatched = []
+
+        def execute(task):
+            dispatched.append(task.position)
+            return SUCCESS
+
+        scheduler = VisitScheduler(workers=1)
+        order = scheduler.order(tasks, failed_visits=["v2"])
+        list(scheduler.run(tasks, execute, failed_visits=["v2"]))
+        assert [task.position for task in order] == dispatched == [3, 1, 0]
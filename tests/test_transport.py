@@ -0,0 +1,56 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from willisapi_client.services.transport import API, S3, Transport
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header("Content-Length", "2")
+        self.end_headers()
+        self.wfile.write(b"{}")
+
+    def log_message(self, *args):
+        pass
+
+
+class TestTransport:
+    def setup(self):
+        self.transport = Transport()
+
+    def test_sessions_are_per_thread_and_per_pool(self):
+        api = self.transport.session(API)
+        assert self.transport.session(API) is api
+        assert self.transport.session(S3) is not api
+        with ThreadPoolExecutor(max_workers=1) as pool:
+            other = pool.submit(self.transport.session, API).result()
+        assert other is not api
+
+    def test_configure_resizes_pools(self):
+        old = self.transport.session(S3)
+        self.transport.configure(S3, 3)
+        new = self.transport.session(S3)
+        assert new is not old
+        assert new.get_adapter("https://bucket.s3.amazonaws.com")._pool_maxsize == 3
+
+    def test_stats_count_reused_connections(self):
+        server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        url = f"http://127.0.0.1:{server.server_address[1]}/"
+        try:
+            for _ in range(5):
+                assert self.transport.session(API).get(url).status_code == 200
+            with ThreadPoolExecutor(max_workers=1) as pool:
+                pool.submit(lambda: self.transport.session(API).get(url)).result()
+        finally:
+            server.shutdown()
+            server.server_close()
+
+        stats = self.transport.stats()[API]
+        assert stats["requests"] == 6
+        assert stats["connections"] == 2
+        assert stats["reused"] == 4
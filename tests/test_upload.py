@@ -0,0 +1,404 @@
+from unittest.mock import patch, MagicMock
+
+import pandas as pd
+import pytest
+
+from willisapi_client.services.metadata.journal import UploadJournal
+from willisapi_client.services.metadata.scheduler import BLOCKED_ERROR
+from willisapi_client.services.metadata.upload import (
+    _results_frame,
+    processed_upload,
+    upload,
+)
+
+
+def _write_metadata_csv(tmp_path, n_recordings=6):
+    rows = []
+    for i in range(n_recordings):
+        recording = tmp_path / f"rec_{i}.wav"
+        recording.write_bytes(b"audio-%d" % i)
+        for item in (1, 2):
+            rows.append(
+                {
+                    "study_id": "study",
+                    "site_id": "site",
+                    "participant_id": f"pt_{i % 2}",
+                    "visit_name": "baseline",
+                    "visit_order": 1,
+                    "coa_name": "MADRS",
+                    "coa_item_number": item,
+                    "coa_item_value": i + item,
+                    "file_path": str(recording),
+                    "time_collected": "2024-01-01",
+                    "recording_order": i,
+                    "rater_id": "rater",
+                    "age": 30,
+                    "sex": "F",
+                    "race": "race",
+                    "language": "en-US",
+                }
+            )
+    csv_path = tmp_path / "metadata.csv"
+    pd.DataFrame(rows).to_csv(csv_path, index=False)
+    return str(csv_path)
+
+
+def _write_processed_csv(tmp_path, n_recordings=6):
+    output_dir = tmp_path / "output" / "container" / "v1"
+    output_dir.mkdir(parents=True)
+    rows = []
+    for i in range(n_recordings):
+        (output_dir / f"rec_{i}_features.json").write_bytes(b"features-%d" % i)
+        rows.append(
+            {
+                "study_id": "study",
+                "site_id": "site",
+                "pt_id": f"pt_{i}",
+                "visit_id": "baseline",
+                "visit_order": 1,
+                "coa_id": "GAD-7",
+                "timestamp": "2024-01-01T10:00:00",
+                "recording_order": i,
+                "workflow": "wf",
+                "recording": f"s3://bucket/dir/rec_{i}.wav",
+                "rater_id": "rater",
+                "language": "en-US",
+                "item_score_01": i % 4,
+                "item_score_02": 1,
+            }
+        )
+    csv_path = tmp_path / "processed.csv"
+    pd.DataFrame(rows).to_csv(csv_path, index=False)
+    return str(csv_path), str(tmp_path / "output")
+
+
+def _presign_processed(payload, presigned="https://s3/presigned"):
+    """A processed-upload response with one presigned PUT per output file."""
+    return {
+        "upload_status": "Success",
+        "response": [
+            {
+                "presigned": presigned,
+                "recording": file["recording"],
+                "checksum": file["checksum"],
+            }
+            for file in payload["files"]
+        ],
+        "error": None,
+    }
+
+
+def _fake_put_session():
+    session = MagicMock()
+    session.put.return_value = MagicMock(status_code=200, text="")
+    return session
+
+
+class TestUploadFunction:
+    def setup(self):
+        self.key = "dummy"
+
+    @patch("willisapi_client.services.metadata.upload.finalize_metadata_csv")
+    @patch("willisapi_client.services.metadata.upload.archive_metadata_csv")
+    @patch("willisapi_client.services.metadata.upload.build_retry_session")
+    @patch("willisapi_client.services.metadata.utils.UploadUtils.post")
+    def test_upload_workers_preserve_row_order(
+        self, mock_post, mock_session, mock_archive, mock_finalize, tmp_path
+    ):
+        csv_path = _write_metadata_csv(tmp_path)
+        mock_archive.return_value = None
+        mock_session.return_value = _fake_put_session()
+
+        def post(api_key, url, headers, payload):
+            if payload["filename"] == "rec_5.wav":
+                return {"upload_status": "Failed", "error": "rejected"}
+            return {
+                "upload_status": "Success",
+                "response": {"presigned": "https://s3/presigned"},
+                "error": None,
+            }
+
+        mock_post.side_effect = post
+
+        sequential = upload(self.key, csv_path)
+        concurrent = upload(self.key, csv_path, workers=4)
+
+        pd.testing.assert_frame_equal(sequential, concurrent)
+        failed = concurrent[concurrent["upload_status"] == "Failed"]
+        assert list(failed["error"]) == ["rejected"]
+
+    @patch("willisapi_client.services.metadata.upload.finalize_metadata_csv")
+    @patch("willisapi_client.services.metadata.upload.archive_metadata_csv")
+    @patch("willisapi_client.services.metadata.upload.build_retry_session")
+    @patch("willisapi_client.services.metadata.utils.UploadUtils.post")
+    def test_upload_resume_skips_successful_rows(
+        self, mock_post, mock_session, mock_archive, mock_finalize, tmp_path
+    ):
+        csv_path = _write_metadata_csv(tmp_path)
+        mock_archive.return_value = None
+        mock_session.return_value = _fake_put_session()
+        success = {
+            "upload_status": "Success",
+            "response": {"presigned": "https://s3/presigned"},
+            "error": None,
+        }
+
+        def flaky_post(api_key, url, headers, payload):
+            if payload["filename"] == "rec_5.wav":
+                return {"upload_status": "Failed", "error": "rejected"}
+            return success
+
+        mock_post.side_effect = flaky_post
+        # Runs journal by default, so the first run needs no resume flag.
+        first = upload(self.key, csv_path)
+        assert (first["upload_status"] == "Failed").sum() == 1
+
+        mock_post.reset_mock()
+        mock_post.side_effect = None
+        mock_post.return_value = success
+        resumed = upload(self.key, csv_path, resume=True)
+
+        assert mock_post.call_count == 1
+        assert mock_post.call_args[0][3]["filename"] == "rec_5.wav"
+        assert list(resumed["file_path"]) == list(first["file_path"])
+        assert (resumed["upload_status"] == "Success").all()
+
+    @patch("willisapi_client.services.metadata.upload.finalize_metadata_csv")
+    @patch("willisapi_client.services.metadata.upload.archive_metadata_csv")
+    @patch("willisapi_client.services.metadata.upload.build_retry_session")
+    @patch("willisapi_client.services.metadata.utils.UploadUtils.post")
+    def test_invalid_rows_never_reach_the_network(
+        self, mock_post, mock_session, mock_archive, mock_finalize, tmp_path
+    ):
+        csv_path = _write_metadata_csv(tmp_path)
+        (tmp_path / "rec_2.wav").unlink()
+        df = pd.read_csv(csv_path)
+        df.loc[df["file_path"].str.endswith("rec_4.wav"), "language"] = "xx-XX"
+        df.to_csv(csv_path, index=False)
+        mock_archive.return_value = None
+        mock_session.return_value = _fake_put_session()
+        mock_post.return_value = {
+            "upload_status": "Success",
+            "response": {"presigned": "https://s3/presigned"},
+            "error": None,
+        }
+
+        results = upload(self.key, csv_path, workers=2)
+
+        posted = sorted(call[0][3]["filename"] for call in mock_post.call_args_list)
+        assert posted == ["rec_0.wav", "rec_1.wav", "rec_3.wav", "rec_5.wav"]
+        errors = dict(zip(results["file_path"].str[-9:], results["error"]))
+        assert errors["rec_2.wav"] == "File path does not exist"
+        assert errors["rec_4.wav"] == "Invalid language: xx-XX"
+        assert list(results["upload_status"]).count("Failed") == 2
+
+    @patch("willisapi_client.services.metadata.upload.finalize_metadata_csv")
+    @patch("willisapi_client.services.metadata.upload.archive_metadata_csv")
+    @patch("willisapi_client.services.metadata.upload.build_retry_session")
+    @patch("willisapi_client.services.metadata.utils.UploadUtils.post")
+    def test_last_recording_waits_for_its_visit(
+        self, mock_post, mock_session, mock_archive, mock_finalize, tmp_path
+    ):
+        # pt_0 has rec_0, rec_2, rec_4 and pt_1 has rec_1, rec_3, rec_5; the
+        # highest recording_order of each visit is its last recording.
+        csv_path = _write_metadata_csv(tmp_path)
+        mock_archive.return_value = None
+        mock_session.return_value = _fake_put_session()
+
+        def post(api_key, url, headers, payload):
+            if payload["filename"] == "rec_3.wav":
+                return {"upload_status": "Failed", "error": "rejected"}
+            return {
+                "upload_status": "Success",
+                "response": {"presigned": "https://s3/presigned"},
+                "error": None,
+            }
+
+        mock_post.side_effect = post
+
+        results = upload(self.key, csv_path, workers=4)
+
+        posted = [call[0][3]["filename"] for call in mock_post.call_args_list]
+        assert "rec_5.wav" not in posted
+        assert posted.index("rec_4.wav") > max(
+            posted.index("rec_0.wav"), posted.index("rec_2.wav")
+        )
+        errors = dict(zip(results["file_path"].str[-9:], results["error"]))
+        assert errors["rec_3.wav"] == "rejected"
+        assert errors["rec_5.wav"] == BLOCKED_ERROR
+        assert errors["rec_4.wav"] is None
+
+    @patch("willisapi_client.services.metadata.upload.finalize_metadata_csv")
+    @patch("willisapi_client.services.metadata.upload.archive_metadata_csv")
+    @patch("willisapi_client.services.metadata.upload.build_retry_session")
+    @patch("willisapi_client.services.metadata.utils.UploadUtils.post")
+    def test_duplicate_files_are_reported_and_put_once(
+        self, mock_post, mock_session, mock_archive, mock_finalize, tmp_path
+    ):
+        csv_path = _write_metadata_csv(tmp_path)
+        (tmp_path / "rec_3.wav").write_bytes((tmp_path / "rec_1.wav").read_bytes())
+        mock_archive.return_value = None
+        session = _fake_put_session()
+        mock_session.return_value = session
+        # Every row is told to write the same object, so only the copy's
+        # PUT repeats bytes that object already received.
+        mock_post.return_value = {
+            "upload_status": "Success",
+            "response": {"presigned": "https://s3/presigned"},
+            "error": None,
+        }
+
+        results = upload(self.key, csv_path)
+
+        names = list(results["file_path"].str[-9:])
+        duplicate_of = results["duplicate_of"]
+        assert duplicate_of.iloc[names.index("rec_3.wav")] == names.index("rec_1.wav")
+        assert duplicate_of.isna().sum() == len(names) - 1
+        assert (results["upload_status"] == "Success").all()
+        assert mock_post.call_count == 6
+        assert session.put.call_count == 5
+
+    def test_journal_is_on_by_default(self, tmp_path, monkeypatch):
+        monkeypatch.setenv("WILLISAPI_JOURNAL_DIR", str(tmp_path / "journals"))
+        csv_path = str(tmp_path / "data.csv")
+        journal = UploadJournal.from_kwargs(csv_path, {})
+        journal.record("key", {"upload_status": "Success"})
+        journal.close()
+
+        resumed = UploadJournal.from_kwargs(csv_path, {"resume": True})
+        assert resumed.path.startswith(str(tmp_path / "journals"))
+        assert resumed.successful_keys() == {"key"}
+        resumed.close()
+        assert not (tmp_path / "data.csv.journal.jsonl").exists()
+        assert UploadJournal.from_kwargs(csv_path, {"journal": False}) is None
+
+    def test_plain_rerun_keeps_the_earlier_journal(self, tmp_path, monkeypatch):
+        monkeypatch.setenv("WILLISAPI_JOURNAL_DIR", str(tmp_path / "journals"))
+        csv_path = str(tmp_path / "data.csv")
+        first = UploadJournal.from_kwargs(csv_path, {})
+        first.record("done", {"upload_status": "Success"})
+        first.record("failed", {"upload_status": "Failed"})
+        first.close()
+
+        # Re-run without resume=True, e.g. after a crash.
+        rerun = UploadJournal.from_kwargs(csv_path, {})
+        rerun.record("failed", {"upload_status": "Success"})
+        rerun.close()
+
+        resumed = UploadJournal.from_kwargs(csv_path, {"resume": True})
+        assert resumed.successful_keys() == {"done", "failed"}
+        resumed.close()
+
+        fresh = UploadJournal.from_kwargs(csv_path, {"fresh": True})
+        fresh.close()
+        resumed = UploadJournal.from_kwargs(csv_path, {"resume": True})
+        assert resumed.successful_keys() == set()
+        resumed.close()
+
+    @patch("willisapi_client.services.metadata.upload.ChecksumPrefetcher.close")
+    @patch("willisapi_client.services.metadata.upload.UploadJournal.close")
+    @patch("willisapi_client.services.metadata.upload.archive_metadata_csv")
+    @patch("willisapi_client.services.metadata.upload._drive_rows")
+    def test_run_resources_are_closed_when_upload_raises(
+        self, mock_drive, mock_archive, mock_journal_close, mock_prefetch_close, tmp_path
+    ):
+        csv_path = _write_metadata_csv(tmp_path)
+        mock_archive.return_value = None
+        mock_drive.side_effect = KeyboardInterrupt
+
+        with pytest.raises(KeyboardInterrupt):
+            upload(self.key, csv_path)
+
+        mock_journal_close.assert_called_once()
+        mock_prefetch_close.assert_called_once()
+
+    def test_results_leave_out_internal_columns(self):
+        df = pd.DataFrame(
+            {"timestamp": ["2024-01-01 10:00"], "timestamp_iso": ["2024-01-01T10:00:00"]}
+        )
+        frame = _results_frame(df, [{"upload_status": "Success", "error": None}])
+        assert list(frame.columns) == ["timestamp", "upload_status", "error"]
+
+    def test_results_keep_the_original_index(self):
+        df = pd.DataFrame({"file_path": ["a.wav", "b.wav"]}, index=[7, 3])
+        results = [{"upload_status": "Success", "error": None}] * 2
+        frame = _results_frame(df, results, pd.array([pd.NA, 0], dtype="Int64"))
+        assert list(frame.index) == [7, 3]
+        assert frame["duplicate_of"].iloc[1] == 0
+        assert frame["duplicate_of"].isna().iloc[0]
+
+    @patch("willisapi_client.services.metadata.upload.finalize_metadata_csv")
+    @patch("willisapi_client.services.metadata.upload.archive_metadata_csv")
+    @patch("willisapi_client.services.metadata.upload.build_retry_session")
+    @patch("willisapi_client.services.metadata.utils.UploadUtils.post")
+    def test_processed_workers_preserve_row_order(
+        self, mock_post, mock_session, mock_archive, mock_finalize, tmp_path, monkeypatch
+    ):
+        monkeypatch.setenv("WILLISAPI_JOURNAL_DIR", str(tmp_path / "journals"))
+        csv_path, output_path = _write_processed_csv(tmp_path)
+        mock_archive.return_value = None
+        session = _fake_put_session()
+        mock_session.return_value = session
+
+        def post(api_key, url, headers, payload):
+            if payload["filename"] == "rec_4.wav":
+                return {"upload_status": "Failed", "error": "rejected"}
+            return _presign_processed(payload, f"https://s3/{payload['filename']}")
+
+        mock_post.side_effect = post
+
+        sequential = processed_upload(self.key, csv_path, output_path)
+        concurrent = processed_upload(
+            self.key, csv_path, output_path, workers=4, fresh=True
+        )
+
+        pd.testing.assert_frame_equal(sequential, concurrent)
+        assert list(concurrent["recording"].str[-9:]) == [
+            f"rec_{i}.wav" for i in range(6)
+        ]
+        assert list(concurrent["upload_status"]) == ["Success"] * 4 + [
+            "Failed",
+            "Success",
+        ]
+        assert concurrent["error"].iloc[4] == "rejected"
+        assert session.put.call_count == 10
+
+        # The journal of the concurrent run holds every successful row, so
+        # resuming only sends the rejected one again.
+        mock_post.reset_mock()
+        processed_upload(self.key, csv_path, output_path, resume=True)
+        assert mock_post.call_count == 1
+        assert mock_post.call_args[0][3]["filename"] == "rec_4.wav"
+
+    @patch("willisapi_client.services.metadata.upload.finalize_metadata_csv")
+    @patch("willisapi_client.services.metadata.upload.archive_metadata_csv")
+    @patch("willisapi_client.services.metadata.upload.build_retry_session")
+    @patch("willisapi_client.services.metadata.utils.UploadUtils.post")
+    def test_processed_duplicate_files_are_reported_and_put_once(
+        self, mock_post, mock_session, mock_archive, mock_finalize, tmp_path
+    ):
+        csv_path, output_path = _write_processed_csv(tmp_path)
+        output_dir = tmp_path / "output" / "container" / "v1"
+        (output_dir / "rec_3_features.json").write_bytes(
+            (output_dir / "rec_1_features.json").read_bytes()
+        )
+        mock_archive.return_value = None
+        session = _fake_put_session()
+        mock_session.return_value = session
+        # Every row is told to write the same object, so only the copy's
+        # PUT repeats bytes that object already received.
+        mock_post.side_effect = lambda api_key, url, headers, payload: (
+            _presign_processed(payload)
+        )
+
+        results = processed_upload(
+            self.key, csv_path, output_path, workers=4, journal=False
+        )
+
+        duplicate_of = results["duplicate_of"]
+        assert duplicate_of.iloc[3] == 1
+        assert duplicate_of.isna().sum() == 5
+        assert (results["upload_status"] == "Success").all()
+        assert "timestamp_iso" not in results.columns
+        assert mock_post.call_count == 6
+        assert session.put.call_count == 5
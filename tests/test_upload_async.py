@@ -0,0 +1,126 @@
+import asyncio
+from unittest.mock import AsyncMock, patch
+
+import pandas as pd
+
+from willisapi_client.services.async_transport import AsyncClient
+from willisapi_client.services.diarize.willisdiarize_async import willis_diarize_async
+from willisapi_client.services.metadata.multipart import upload_multipart_async
+from willisapi_client.services.metadata.rate_control import AdaptiveRateController
+from willisapi_client.services.metadata.upload import upload
+from willisapi_client.services.metadata.upload_async import upload_async
+from willisapi_client.services.retry import RetryPolicy
+from tests.s3_stub import LocalS3Server
+from tests.test_upload import _write_metadata_csv
+
+
+def _presigning_post(s3):
+    def post(payload):
+        if payload["filename"] == "rec_5.wav":
+            return {"upload_status": "Failed", "error": "rejected"}
+        return {
+            "upload_status": "Success",
+            "response": {"presigned": s3.presigned_put(payload["filename"])},
+            "error": None,
+        }
+
+    return post
+
+
+class TestUploadAsync:
+    def setup(self):
+        self.key = "dummy"
+
+    @patch("willisapi_client.services.metadata.upload_async.finalize_metadata_csv")
+    @patch("willisapi_client.services.metadata.upload_async.archive_metadata_csv")
+    @patch("willisapi_client.services.metadata.upload.finalize_metadata_csv")
+    @patch("willisapi_client.services.metadata.upload.archive_metadata_csv")
+    @patch("willisapi_client.services.metadata.utils.UploadUtils.post")
+    @patch("willisapi_client.services.metadata.upload_async._post")
+    def test_upload_async_matches_upload(
+        self,
+        mock_post_async,
+        mock_post,
+        mock_archive,
+        mock_finalize,
+        mock_archive_async,
+        mock_finalize_async,
+        tmp_path,
+    ):
+        csv_path = _write_metadata_csv(tmp_path)
+        mock_archive.return_value = mock_archive_async.return_value = None
+        with LocalS3Server() as s3:
+            post = _presigning_post(s3)
+            mock_post.side_effect = lambda api_key, url, headers, payload: post(payload)
+            mock_post_async.side_effect = lambda client, url, headers, payload: post(
+                payload
+            )
+
+            expected = upload(self.key, csv_path, workers=4)
+            s3.objects.clear()
+            result = asyncio.run(upload_async(self.key, csv_path, concurrency=4))
+
+            pd.testing.assert_frame_equal(result, expected)
+            assert s3.objects["/bucket/rec_0.wav"] == b"audio-0"
+            assert "/bucket/rec_5.wav" not in s3.objects
+
+    def test_multipart_async_streams_parts_and_retries(self, tmp_path):
+        data = bytes(range(256)) * 18
+        recording = tmp_path / "large.wav"
+        recording.write_bytes(data)
+
+        async def run(multipart):
+            async with AsyncClient(concurrency=2) as client:
+                return await upload_multipart_async(client, str(recording), multipart)
+
+        with LocalS3Server() as s3:
+            s3.fail_parts[2] = 1
+            multipart = s3.presigned_multipart("large.wav", 5, 1024)
+            assert asyncio.run(run(multipart)) is None
+            assert s3.objects["/bucket/large.wav"] == data
+
+    def test_put_file_rate_limits_every_attempt(self, tmp_path):
+        recording = tmp_path / "a.wav"
+        recording.write_bytes(b"audio")
+        controller = AdaptiveRateController(initial_rate=10.0, cooldown=0.0)
+
+        async def run(url):
+            policy = RetryPolicy(base=0.01)
+            async with AsyncClient(policy=policy) as client:
+                return await client.put_file(
+                    url, str(recording), rate_controller=controller
+                )
+
+        with LocalS3Server() as s3:
+            s3.throttle = 2
+            response = asyncio.run(run(s3.presigned_put("a.wav")))
+
+            assert response.status_code == 200
+            assert s3.objects["/bucket/a.wav"] == b"audio"
+        assert controller.stats()["throttles"] == 2
+        assert controller.stats()["successes"] == 1
+
+    @patch(
+        "willisapi_client.services.diarize.diarize_utils.DiarizeUtils.decode_response"
+    )
+    @patch(
+        "willisapi_client.services.diarize.willisdiarize_async.request_diarize_async",
+        new_callable=AsyncMock,
+    )
+    @patch(
+        "willisapi_client.services.diarize.diarize_utils.DiarizeUtils.read_json_file"
+    )
+    @patch(
+        "willisapi_client.services.diarize.diarize_utils.DiarizeUtils.is_valid_file_path"
+    )
+    def test_willis_diarize_async(
+        self, mock_file_path, mock_json, mock_api_res, mock_decoded_res
+    ):
+        mock_file_path.return_value = True
+        mock_json.return_value = {"json_data": {}}
+        mock_api_res.return_value = {"status_code": 200, "data": "Encoded Response"}
+        mock_decoded_res.return_value = {"Correct Transcription"}
+
+        res = asyncio.run(willis_diarize_async(self.key, "file.json"))
+
+        assert res == {"Correct Transcription"}
@@ -4,13 +4,19 @@
 from willisapi_client.services.api import (
     willis_diarize_call_remaining,
     willis_diarize,
+    willis_diarize_async,
     upload,
-    processed_upload
+    processed_upload,
+    upload_async,
+    processed_upload_async,
 )
 
 __all__ = [
     "willis_diarize_call_remaining",
     "willis_diarize",
+    "willis_diarize_async",
     "upload",
-    "processed_upload"
+    "processed_upload",
+    "upload_async",
+    "processed_upload_async",
 ]
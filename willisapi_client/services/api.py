@@ -4,5 +4,11 @@
 from willisapi_client.services.diarize import (
     willis_diarize_call_remaining,
     willis_diarize,
+    willis_diarize_async,
+)
+from willisapi_client.services.metadata import (
+    upload,
+    processed_upload,
+    upload_async,
+    processed_upload_async,
 )
-from willisapi_client.services.metadata import upload, processed_upload
@@ -0,0 +1,209 @@
+import asyncio
+import json
+import os
+from typing import Any, AsyncIterator, Dict, Optional
+
+import aiohttp
+
+from willisapi_client.services.retry import (
+    IDEMPOTENT_METHODS,
+    THROTTLE_STATUS_CODES,
+    RetryPolicy,
+    endpoint_of,
+    retry_after,
+    retry_policy,
+    retryable_response,
+)
+from willisapi_client.services.transport import API, S3
+
+# Requests one AsyncClient keeps in flight at once, across all hosts.
+DEFAULT_CONCURRENCY = 16
+# Bytes read from disk at a time while streaming a file body.
+CHUNK_SIZE = 1024 * 1024
+
+
+class AsyncResponse:
+    """A finished response, read in full so its connection is released.
+
+    Has the status_code / headers / text / json() of a requests.Response,
+    so retry classifiers and result handling work on either.
+    """
+
+    __slots__ = ("status_code", "headers", "content")
+
+    def __init__(self, status_code: int, headers, content: bytes):
+        self.status_code = status_code
+        self.headers = headers
+        self.content = content
+
+    @property
+    def text(self) -> str:
+        return self.content.decode("utf-8", errors="replace")
+
+    def json(self) -> Any:
+        return json.loads(self.content)
+
+
+def retryable_async(response, error):
+    """retryable_response for aiohttp: its connection errors and timeouts retry."""
+    if error is not None:
+        transient = (aiohttp.ClientConnectionError, asyncio.TimeoutError)
+        return isinstance(error, transient), None
+    return retryable_response(response, None)
+
+
+def retryable_unsent_async(response, error):
+    """retryable_unsent for aiohttp: only failures to connect and throttling."""
+    if error is not None:
+        return isinstance(error, aiohttp.ClientConnectorError), None
+    if response.status_code in THROTTLE_STATUS_CODES:
+        return True, retry_after(response)
+    return False, None
+
+
+async def file_chunks(path: str, offset: int, length: int) -> AsyncIterator[bytes]:
+    """Stream ``length`` bytes of path from ``offset`` without blocking the loop."""
+    with open(path, "rb") as f:
+        f.seek(offset)
+        remaining = length
+        while remaining > 0:
+            chunk = await asyncio.to_thread(f.read, min(CHUNK_SIZE, remaining))
+            if not chunk:
+                break
+            remaining -= len(chunk)
+            yield chunk
+
+
+def _retryable_for(method: str):
+    if method.upper() in IDEMPOTENT_METHODS:
+        return retryable_async
+    return retryable_unsent_async
+
+
+class _Unlimited:
+    """An async context manager that never waits, for pools without a limit."""
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+
+_UNLIMITED = _Unlimited()
+
+
+class AsyncClient:
+    """An aiohttp session whose requests go through the shared RetryPolicy.
+
+    At most ``concurrency`` requests are in flight at once; a request
+    waiting to be retried does not hold a slot. ``pool_sizes`` further
+    limits the requests in flight to a pool of hosts (transport.API or
+    transport.S3), as the pool sizes of the requests transport do. Use as
+    an async context manager, one per run.
+    """
+
+    def __init__(
+        self,
+        concurrency: int = DEFAULT_CONCURRENCY,
+        policy: RetryPolicy = None,
+        pool_sizes: Dict[str, int] = None,
+    ):
+        self.concurrency = max(1, concurrency)
+        self.policy = policy or retry_policy
+        self._slots = asyncio.Semaphore(self.concurrency)
+        self._pools = {
+            pool: asyncio.Semaphore(max(1, size))
+            for pool, size in (pool_sizes or {}).items()
+        }
+        self._session: Optional[aiohttp.ClientSession] = None
+
+    async def __aenter__(self):
+        self._session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=self.concurrency),
+            timeout=aiohttp.ClientTimeout(sock_connect=10, sock_read=300),
+        )
+        return self
+
+    async def __aexit__(self, *exc):
+        await self._session.close()
+
+    async def send(
+        self, method: str, url: str, body=None, pool: str = API, **kwargs
+    ) -> AsyncResponse:
+        """Send a request once. ``body``, if given, makes a fresh request body."""
+        async with self._slots, self._pools.get(pool, _UNLIMITED):
+            data = body() if body is not None else kwargs.pop("data", None)
+            async with self._session.request(method, url, data=data, **kwargs) as r:
+                return AsyncResponse(r.status, r.headers, await r.read())
+
+    async def request(
+        self,
+        method: str,
+        url: str,
+        retryable=None,
+        attempts: int = None,
+        pool: str = API,
+        **kwargs,
+    ) -> AsyncResponse:
+        """Send a request, retrying transient failures; kwargs go to aiohttp.
+
+        A request that is not idempotent (POST) is only resent when the
+        server cannot have acted on it.
+        """
+        return await self.policy.call_async(
+            endpoint_of(url),
+            lambda: self.send(method, url, pool=pool, **kwargs),
+            retryable=retryable or _retryable_for(method),
+            attempts=attempts,
+        )
+
+    async def put_file(
+        self,
+        url: str,
+        path: str,
+        headers: Dict[str, str] = None,
+        offset: int = 0,
+        length: int = None,
+        retryable=None,
+        attempts: int = None,
+        pool: str = S3,
+        rate_controller=None,
+    ) -> AsyncResponse:
+        """PUT part of a file (all of it by default), streamed from disk.
+
+        Content-Length is sent explicitly, since S3 rejects chunked PUTs to
+        presigned URLs. Each try reopens the file at ``offset``, and first
+        takes a token from ``rate_controller`` (an AdaptiveRateController),
+        if given, which then hears how that try went.
+        """
+        if length is None:
+            length = await asyncio.to_thread(os.path.getsize, path)
+            length -= offset
+        headers = dict(headers or {}, **{"Content-Length": str(length)})
+
+        async def attempt():
+            if rate_controller is not None:
+                await rate_controller.acquire_async()
+            try:
+                response = await self.send(
+                    "PUT",
+                    url,
+                    body=lambda: file_chunks(path, offset, length),
+                    pool=pool,
+                    headers=headers,
+                )
+            except aiohttp.ClientConnectionError:
+                if rate_controller is not None:
+                    rate_controller.on_throttle()
+                raise
+            if rate_controller is not None:
+                rate_controller.observe(response)
+            return response
+
+        return await self.policy.call_async(
+            endpoint_of(url),
+            attempt,
+            retryable=retryable or retryable_async,
+            attempts=attempts,
+        )
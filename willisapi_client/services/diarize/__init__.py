@@ -3,5 +3,12 @@ from willisapi_client.services.diarize.willisdiarize_call_remaining import (
     willis_diarize_call_remaining,
 )
 from willisapi_client.services.diarize.willisdiarize import willis_diarize
+from willisapi_client.services.diarize.willisdiarize_async import (
+    willis_diarize_async,
+)
 
-__all__ = ["willis_diarize_call_remaining", "willis_diarize"]
+__all__ = [
+    "willis_diarize_call_remaining",
+    "willis_diarize",
+    "willis_diarize_async",
+]
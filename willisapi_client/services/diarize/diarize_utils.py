@@ -1,11 +1,39 @@
-import requests
 import json
-import time
-import random
 import os
 import gzip
 import base64
 from willisapi_client.logging_setup import logger as logger
+from willisapi_client.services.retry import (
+    endpoint_of,
+    retry_policy,
+    retryable_response,
+)
+from willisapi_client.services.transport import API, session
+
+# request_diarize / request_call_remaining give up after this many tries.
+DIARIZE_ATTEMPTS = 3
+
+
+def _retryable(result, error):
+    # A response that is not JSON (e.g. a gateway error page) is retried too.
+    if isinstance(error, json.decoder.JSONDecodeError):
+        return True, None
+    return retryable_response(result[0] if result else None, error)
+
+
+def _request_json(url, send, try_number):
+    def attempt():
+        response = send()
+        return response, response.json()
+
+    _, res_json = retry_policy.call(
+        endpoint_of(url),
+        attempt,
+        retryable=_retryable,
+        attempts=DIARIZE_ATTEMPTS,
+        attempt=try_number,
+    )
+    return res_json
 
 
 class DiarizeUtils:
@@ -39,28 +67,18 @@ class DiarizeUtils:
         ----------
         url: The URL of the API endpoint.
         headers: The headers to be sent in the request.
-        try_number: The number of times the function has been tried.
+        try_number: The number of the first try; the call gives up after try 3.
 
         Returns:
         ----------
         json: The JSON response from the API server.
         ------------------------------------------------------------------------------------------------------
         """
-        try:
-            response = requests.post(url, json=data, headers=headers)
-            res_json = response.json()
-        except (
-            requests.exceptions.ConnectionError,
-            json.decoder.JSONDecodeError,
-        ) as ex:
-            if try_number == 3:
-                raise
-            time.sleep(random.random() * 2)
-            return DiarizeUtils.request_diarize(
-                url, data, headers, try_number=try_number + 1
-            )
-        else:
-            return res_json
+        return _request_json(
+            url,
+            lambda: session(API).post(url, json=data, headers=headers),
+            try_number,
+        )
 
     def request_call_remaining(url, headers, try_number):
         """
@@ -75,25 +93,13 @@ class DiarizeUtils:
         ----------
         url: The URL of the API endpoint.
         headers: The headers to be sent in the request.
-        try_number: The number of times the function has been tried.
+        try_number: The number of the first try; the call gives up after try 3.
 
         Returns:
         ----------
         json: The JSON response from the API server.
         ------------------------------------------------------------------------------------------------------
         """
-        try:
-            response = requests.get(url, headers=headers)
-            res_json = response.json()
-        except (
-            requests.exceptions.ConnectionError,
-            json.decoder.JSONDecodeError,
-        ) as ex:
-            if try_number == 3:
-                raise
-            time.sleep(random.random() * 2)
-            return DiarizeUtils.request_call_remaining(
-                url, headers, try_number=try_number + 1
-            )
-        else:
-            return res_json
+        return _request_json(
+            url, lambda: session(API).get(url, headers=headers), try_number
+        )
@@ -0,0 +1,87 @@
+import asyncio
+import json
+from http import HTTPStatus
+
+from willisapi_client.willisapi_client import WillisapiClient
+from willisapi_client.logging_setup import logger as logger
+from willisapi_client.services.async_transport import AsyncClient, retryable_async
+from willisapi_client.services.retry import endpoint_of
+from willisapi_client.services.diarize.diarize_utils import (
+    DIARIZE_ATTEMPTS,
+    DiarizeUtils,
+)
+
+
+def _retryable(result, error):
+    # As for request_diarize, a response that is not JSON is retried too.
+    if isinstance(error, json.decoder.JSONDecodeError):
+        return True, None
+    return retryable_async(result[0] if result else None, error)
+
+
+async def request_diarize_async(client: AsyncClient, url, data, headers):
+    """DiarizeUtils.request_diarize over an AsyncClient."""
+
+    async def attempt():
+        response = await client.send("POST", url, json=data, headers=headers)
+        return response, response.json()
+
+    _, res_json = await client.policy.call_async(
+        endpoint_of(url), attempt, retryable=_retryable, attempts=DIARIZE_ATTEMPTS
+    )
+    return res_json
+
+
+async def willis_diarize_async(key: str, file_path: str, **kwargs):
+    """
+    ---------------------------------------------------------------------------------------------------
+    Function: willis_diarize_async
+
+    Description: Coroutine version of willis_diarize; returns the same result
+
+    Parameters:
+    ----------
+    key: AWS access id token (str)
+    file_path: String
+    client: AsyncClient to send the request with (optional). Share one
+        between concurrent calls to bound how many requests are in flight.
+
+    Returns:
+    ----------
+    json: JSON
+    ---------------------------------------------------------------------------------------------------
+    """
+
+    logger.info("Passing through WillisDiarize...")
+    wc = WillisapiClient(env=kwargs.get("env"))
+    url = wc.get_diarize()
+    headers = wc.get_headers()
+    headers["Authorization"] = key
+    corrected_transcript = None
+
+    if not DiarizeUtils.is_valid_file_path(file_path):
+        logger.info("Input file type is incorrect. We only accept JSON files.")
+        logger.info("Failed!")
+        return corrected_transcript
+
+    data = await asyncio.to_thread(DiarizeUtils.read_json_file, file_path)
+
+    if not data:
+        return corrected_transcript
+
+    client = kwargs.get("client")
+    if client is not None:
+        response = await request_diarize_async(client, url, data, headers)
+    else:
+        async with AsyncClient(concurrency=1) as client:
+            response = await request_diarize_async(client, url, data, headers)
+    if response["status_code"] != HTTPStatus.OK:
+        logger.info(response["message"])
+        logger.info("Failed!")
+    else:
+        logger.info("Returning processed JSON...")
+        corrected_transcript = await asyncio.to_thread(
+            DiarizeUtils.decode_response, response["data"]
+        )
+        logger.info("Done!")
+    return corrected_transcript
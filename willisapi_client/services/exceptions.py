@@ -1,3 +1,6 @@
+import requests
+
+
 class UnableToLoginClientError(Exception):
     pass
 
@@ -24,3 +27,9 @@ class InvalidCSVColumns(Exception):
 
 class UnableToUpdatePermissionsClientError(Exception):
     pass
+
+
+class CircuitOpenError(requests.exceptions.ConnectionError):
+    """Raised without sending a request while an endpoint's circuit is open."""
+
+    pass
@@ -1,4 +1,10 @@
 # website:   https://www.brooklyn.health
 from .upload import upload, processed_upload
+from .upload_async import upload_async, processed_upload_async
 
-__all__ = ["upload", "processed_upload"]
+__all__ = [
+    "upload",
+    "processed_upload",
+    "upload_async",
+    "processed_upload_async",
+]
@@ -1,8 +1,10 @@
 import os
-import requests
 
 from willisapi_client.willisapi_client import WillisapiClient
 from willisapi_client.logging_setup import logger as logger
+from willisapi_client.services.metadata.rate_control import s3_rate_controller
+from willisapi_client.services.metadata.utils import s3_content_type
+from willisapi_client.services.transport import API, S3, session
 
 
 def _archive_headers(api_key):
@@ -16,9 +18,10 @@ def _archive_headers(api_key):
 def archive_metadata_csv(api_key, csv_path, total_rows, upload_type, env=None):
     """Archive the source metadata CSV alongside the data upload.
 
-    Creates a server-side tracking row, then PUTs the raw CSV to the returned
-    presigned S3 URL. Returns the tracking ``record_id`` on success (so the
-    caller can finalize it with row counts), or ``None`` on failure.
+    Creates a server-side tracking row, then PUTs the raw manifest, as it
+    is on disk (CSV, Parquet or Arrow), to the returned presigned S3 URL.
+    Returns the tracking ``record_id`` on success (so the caller can
+    finalize it with row counts), or ``None`` on failure.
 
     All failures are logged and swallowed — archiving must never abort the
     actual data upload.
@@ -30,7 +33,7 @@ def archive_metadata_csv(api_key, csv_path, total_rows, upload_type, env=None):
             "total_rows": total_rows,
             "upload_type": upload_type,
         }
-        res = requests.post(
+        res = session(API).post(
             wc.get_csv_archive_url(), headers=_archive_headers(api_key), json=payload
         )
         if res.status_code != 201:
@@ -45,8 +48,13 @@ def archive_metadata_csv(api_key, csv_path, total_rows, upload_type, env=None):
             return None
 
         with open(csv_path, "rb") as f:
-            put_res = requests.put(
-                presigned, data=f, headers={"Content-Type": "text/csv"}
+            put_res = s3_rate_controller.put(
+                session(S3),
+                presigned,
+                data=f,
+                headers={
+                    "Content-Type": s3_content_type(os.path.basename(csv_path))
+                },
             )
         if put_res.status_code not in (200, 204):
             logger.warning(f"CSV archive S3 upload failed: {put_res.status_code}")
@@ -72,7 +80,7 @@ def finalize_metadata_csv(
             "successful_rows": successful_rows,
             "failed_rows": failed_rows,
         }
-        res = requests.patch(
+        res = session(API).patch(
             wc.get_csv_archive_finalize_url(record_id),
             headers=_archive_headers(api_key),
             json=payload,
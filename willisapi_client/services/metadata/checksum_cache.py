@@ -0,0 +1,142 @@
+import os
+import sqlite3
+import threading
+import time
+from typing import Callable, Optional
+
+from willisapi_client.logging_setup import logger as logger
+
+CHECKSUM_CACHE_DIR_ENV = "WILLISAPI_CHECKSUM_CACHE_DIR"
+DEFAULT_MAX_ENTRIES = 1_000_000
+# Counting rows is a table scan, so the size bound is enforced every this
+# many writes rather than on each one.
+EVICT_EVERY = 1024
+
+
+class ChecksumCache:
+    """On-disk cache of file checksums keyed on file identity.
+
+    An entry is only trusted while the file's (path, size, mtime_ns, inode)
+    still match what was recorded, so edited or replaced files are rehashed.
+    When the cache grows past ``max_entries`` the least recently used
+    entries are evicted.
+    """
+
+    FILENAME = "checksums.sqlite3"
+
+    def __init__(self, cache_dir: str, max_entries: int = DEFAULT_MAX_ENTRIES):
+        os.makedirs(cache_dir, exist_ok=True)
+        self.path = os.path.join(cache_dir, self.FILENAME)
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._writes_since_evict = 0
+        self._conn = sqlite3.connect(
+            self.path, check_same_thread=False, isolation_level=None
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS checksums (
+                path TEXT PRIMARY KEY,
+                size INTEGER NOT NULL,
+                mtime_ns INTEGER NOT NULL,
+                inode INTEGER NOT NULL,
+                checksum TEXT NOT NULL,
+                last_used REAL NOT NULL
+            )
+            """
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS checksums_last_used ON checksums (last_used)"
+        )
+        self._evict()
+
+    @classmethod
+    def from_kwargs(cls, kwargs: dict) -> Optional["ChecksumCache"]:
+        """Build the cache configured for an upload run, or None if disabled.
+
+        ``checksum_cache_dir`` takes precedence over the
+        ``WILLISAPI_CHECKSUM_CACHE_DIR`` environment variable.
+        """
+        cache_dir = kwargs.get("checksum_cache_dir") or os.environ.get(
+            CHECKSUM_CACHE_DIR_ENV
+        )
+        if not cache_dir:
+            return None
+        try:
+            return cls(
+                os.path.expanduser(cache_dir),
+                max_entries=kwargs.get("checksum_cache_max_entries", DEFAULT_MAX_ENTRIES),
+            )
+        except (OSError, sqlite3.Error) as ex:
+            logger.warning(f"Checksum cache disabled: {ex}")
+            return None
+
+    @staticmethod
+    def _identity(file_path: str):
+        st = os.stat(file_path)
+        return os.path.abspath(file_path), st.st_size, st.st_mtime_ns, st.st_ino
+
+    def get(self, file_path: str) -> Optional[str]:
+        path, size, mtime_ns, inode = self._identity(file_path)
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT checksum FROM checksums "
+                "WHERE path = ? AND size = ? AND mtime_ns = ? AND inode = ?",
+                (path, size, mtime_ns, inode),
+            ).fetchone()
+            if row is None:
+                return None
+            self._conn.execute(
+                "UPDATE checksums SET last_used = ? WHERE path = ?",
+                (time.time(), path),
+            )
+        return row[0]
+
+    def put(self, file_path: str, checksum: str, identity=None):
+        path, size, mtime_ns, inode = identity or self._identity(file_path)
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO checksums "
+                "(path, size, mtime_ns, inode, checksum, last_used) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (path, size, mtime_ns, inode, checksum, time.time()),
+            )
+            self._writes_since_evict += 1
+            if self._writes_since_evict >= EVICT_EVERY:
+                self._evict()
+
+    def checksum(self, file_path: str, compute: Callable[[str], str]) -> str:
+        """Return the cached checksum for file_path, computing it on a miss."""
+        try:
+            cached = self.get(file_path)
+        except sqlite3.Error as ex:
+            logger.warning(f"Checksum cache read failed: {ex}")
+            return compute(file_path)
+        if cached is not None:
+            return cached
+
+        before = self._identity(file_path)
+        checksum = compute(file_path)
+        # Only record the result if the file did not change while hashing.
+        if self._identity(file_path) == before:
+            try:
+                self.put(file_path, checksum, identity=before)
+            except sqlite3.Error as ex:
+                logger.warning(f"Checksum cache write failed: {ex}")
+        return checksum
+
+    def _evict(self):
+        self._writes_since_evict = 0
+        (count,) = self._conn.execute("SELECT COUNT(*) FROM checksums").fetchone()
+        if count <= self.max_entries:
+            return
+        self._conn.execute(
+            "DELETE FROM checksums WHERE path IN "
+            "(SELECT path FROM checksums ORDER BY last_used ASC LIMIT ?)",
+            (count - self.max_entries,),
+        )
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,160 @@
+import asyncio
+import os
+import threading
+from concurrent.futures import Future
+from typing import Awaitable, Callable, Dict, Hashable, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+import pandas as pd
+
+
+class FileDeduplicator:
+    """Hash each distinct file once per run, whatever path it is reached by.
+
+    Files are identified by inode first: paths that are hard links, symlinks
+    or repeats of one file share a single hash, even when asked for at the
+    same time from different threads. Byte-identical copies under other
+    inodes are still hashed, and are then matched by checksum.
+
+    checksum() has the signature of ChecksumCache.checksum, so UploadUtils
+    (or a ChecksumPrefetcher) can use it in place of the cache.
+    """
+
+    def __init__(self, compute: Callable[[str], str], checksum_cache=None):
+        self.compute = compute
+        self.checksum_cache = checksum_cache
+        self._lock = threading.Lock()
+        self._by_identity: Dict[Tuple[int, int, int, int], Future] = {}
+        self._by_path: Dict[str, str] = {}
+        self.hashed = 0
+
+    @staticmethod
+    def _identity(file_path: str) -> Tuple[int, int, int, int]:
+        # Size and mtime make an inode reused for a new file a different key.
+        st = os.stat(file_path)
+        return st.st_dev, st.st_ino, st.st_size, st.st_mtime_ns
+
+    def _hash(self, file_path: str) -> str:
+        if self.checksum_cache is not None:
+            return self.checksum_cache.checksum(file_path, self.compute)
+        return self.compute(file_path)
+
+    def checksum(self, file_path: str, compute: Callable[[str], str] = None) -> str:
+        identity = self._identity(file_path)
+        with self._lock:
+            future = self._by_identity.get(identity)
+            owner = future is None
+            if owner:
+                future = self._by_identity[identity] = Future()
+        if owner:
+            try:
+                future.set_result(self._hash(file_path))
+                with self._lock:
+                    self.hashed += 1
+            except BaseException as ex:
+                future.set_exception(ex)
+                with self._lock:
+                    # Let a later request try again.
+                    del self._by_identity[identity]
+        checksum = future.result()
+        with self._lock:
+            self._by_path[file_path] = checksum
+        return checksum
+
+    def known(self, file_path) -> Optional[str]:
+        """The checksum file_path had in this run, or None if it was not hashed."""
+        with self._lock:
+            return self._by_path.get(file_path)
+
+
+def duplicate_positions(keys: List[Optional[Hashable]]) -> pd.arrays.IntegerArray:
+    """For each key, the position of the first earlier equal key, else <NA>.
+
+    None keys (rows whose files were not hashed) are never duplicates.
+    """
+    first: Dict[Hashable, int] = {}
+    positions = []
+    for position, key in enumerate(keys):
+        if key is None:
+            positions.append(None)
+            continue
+        earlier = first.setdefault(key, position)
+        positions.append(earlier if earlier != position else None)
+    return pd.array(positions, dtype="Int64")
+
+
+class PutLedger:
+    """S3 objects this run has already written, keyed by object URL and checksum.
+
+    A presigned URL names one object; its query string only carries the
+    signature. Writing the same bytes to the same object again changes
+    nothing, so a PUT whose (object, checksum) already succeeded in this run
+    is skipped. A PUT to another object is never skipped, even for
+    identical bytes: the server expects each object it signed to be written.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._puts: Dict[Tuple[str, str], Future] = {}
+        self._async_puts: Dict[Tuple[str, str], asyncio.Future] = {}
+        self.skipped = 0
+
+    @staticmethod
+    def _object(url: str) -> str:
+        return urlsplit(url)._replace(query="", fragment="").geturl()
+
+    def put_once(
+        self, url: str, checksum: str, put: Callable[[], Optional[str]]
+    ) -> Optional[str]:
+        """Run put() unless this object already received these bytes.
+
+        put() returns an error string, or None on success; so does this.
+        """
+        key = (self._object(url), checksum)
+        with self._lock:
+            future = self._puts.get(key)
+            owner = future is None
+            if owner:
+                future = self._puts[key] = Future()
+        if not owner:
+            if future.result() is None:
+                with self._lock:
+                    self.skipped += 1
+                return None
+            # The earlier PUT failed; this row makes its own attempt.
+            return put()
+        try:
+            error = put()
+        except Exception as ex:
+            error = str(ex)
+        future.set_result(error)
+        if error is not None:
+            with self._lock:
+                self._puts.pop(key, None)
+        return error
+
+    async def put_once_async(
+        self, url: str, checksum: str, put: Callable[[], Awaitable[Optional[str]]]
+    ) -> Optional[str]:
+        """put_once for a coroutine function, within one event loop."""
+        key = (self._object(url), checksum)
+        future = self._async_puts.get(key)
+        if future is not None:
+            if await asyncio.shield(future) is None:
+                with self._lock:
+                    self.skipped += 1
+                return None
+            return await put()
+        future = self._async_puts[key] = asyncio.get_running_loop().create_future()
+        try:
+            error = await put()
+        except asyncio.CancelledError:
+            self._async_puts.pop(key, None)
+            future.cancel()
+            raise
+        except Exception as ex:
+            error = str(ex)
+        future.set_result(error)
+        if error is not None:
+            self._async_puts.pop(key, None)
+        return error
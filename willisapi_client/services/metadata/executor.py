@@ -0,0 +1,49 @@
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Iterable, List
+
+# Threads for S3 PUTs in one upload run. The work is network-bound, so the
+# pool is sized for concurrent requests rather than for CPU count.
+S3_WORKERS = 32
+
+
+class BoundedExecutor:
+    """A run-scoped thread pool whose submit() blocks when it is full.
+
+    At most ``max_pending`` tasks (default twice ``max_workers``) are queued
+    or running at once; a caller submitting beyond that waits for a slot.
+    This keeps the queue short, so a batch submitted now starts within a
+    bounded time instead of behind everything submitted earlier — which is
+    what keeps a row's presigned URLs inside their expiry window.
+    """
+
+    def __init__(self, max_workers: int = S3_WORKERS, max_pending: int = None):
+        self.max_workers = max(1, max_workers)
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.max_workers, thread_name_prefix="willisapi-s3"
+        )
+        self._slots = threading.BoundedSemaphore(max_pending or 2 * self.max_workers)
+
+    def submit(self, fn: Callable, *args, **kwargs) -> Future:
+        self._slots.acquire()
+        try:
+            future = self._executor.submit(fn, *args, **kwargs)
+        except BaseException:
+            self._slots.release()
+            raise
+        future.add_done_callback(lambda _: self._slots.release())
+        return future
+
+    def run_batch(self, fn: Callable, items: Iterable[Any]) -> List[Any]:
+        """Run fn over items on the pool and return the results in order."""
+        futures = [self.submit(fn, item) for item in items]
+        return [future.result() for future in futures]
+
+    def shutdown(self, wait: bool = True):
+        self._executor.shutdown(wait=wait)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.shutdown()
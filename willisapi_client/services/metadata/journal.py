@@ -0,0 +1,160 @@
+import hashlib
+import json
+import os
+import threading
+from typing import Any, Dict, List, Set
+
+from willisapi_client.logging_setup import logger as logger
+
+# Where journals go when the caller gives no journal_path.
+JOURNAL_DIR_ENV = "WILLISAPI_JOURNAL_DIR"
+
+# Columns that identify one transformed row across runs of the same manifest.
+DATA_ROW_KEY_COLUMNS = [
+    "study_id",
+    "site_id",
+    "participant_id",
+    "visit_name",
+    "visit_order",
+    "coa_name",
+    "file_path",
+    "recording_order",
+]
+PROCESSED_ROW_KEY_COLUMNS = ["pt_id", "visit_id", "visit_order", "coa_id"]
+
+
+def row_key(row, columns: List[str]) -> str:
+    """Return a stable identifier for a transformed row."""
+    values = [str(row[col]) if col in row else None for col in columns]
+    return hashlib.sha1(json.dumps(values).encode("utf-8")).hexdigest()
+
+
+def default_journal_dir() -> str:
+    """``$WILLISAPI_JOURNAL_DIR``, else willisapi/journals in the user cache dir."""
+    journal_dir = os.environ.get(JOURNAL_DIR_ENV)
+    if not journal_dir:
+        cache_home = os.environ.get("XDG_CACHE_HOME") or os.path.join("~", ".cache")
+        journal_dir = os.path.join(cache_home, "willisapi", "journals")
+    return os.path.expanduser(journal_dir)
+
+
+def default_journal_path(csv_path: str) -> str:
+    """The journal of a manifest, kept out of the manifest's own directory.
+
+    Keyed by the manifest's absolute path, so runs of the same manifest
+    share a journal and different manifests never do.
+    """
+    manifest = os.path.abspath(csv_path)
+    digest = hashlib.sha1(manifest.encode("utf-8")).hexdigest()[:16]
+    name = f"{os.path.basename(manifest)}.{digest}.journal.jsonl"
+    return os.path.join(default_journal_dir(), name)
+
+
+def _has_entries(path: str) -> bool:
+    try:
+        return os.path.getsize(path) > 0
+    except OSError:
+        return False
+
+
+def _torn(path: str) -> bool:
+    """True if the journal at path ends part way through a line."""
+    if not _has_entries(path):
+        return False
+    with open(path, "rb") as f:
+        f.seek(-1, os.SEEK_END)
+        return f.read(1) != b"\n"
+
+
+class UploadJournal:
+    """Append-only JSON-lines record of per-row upload outcomes.
+
+    Each completed row is written and flushed as soon as it finishes, so a
+    run that is killed part way through leaves behind every outcome it
+    reached. When a key appears more than once the last entry wins.
+    """
+
+    def __init__(self, path: str, resume: bool = False, fresh: bool = False):
+        """Open the journal at path, creating its directory if needed.
+
+        ``resume`` loads the outcomes already recorded. An existing journal
+        is only emptied when ``fresh`` is set (and not resuming); otherwise
+        new outcomes are appended, so a later resume still sees old ones.
+        """
+        self.path = path
+        self._lock = threading.Lock()
+        self._entries = self._load() if resume else {}
+        truncate = fresh and not resume
+        if not resume and not truncate and _has_entries(path):
+            logger.warning(
+                f"Journal {path} holds an earlier run of this manifest; appending "
+                "to it. Pass resume=True to skip the rows it records as "
+                "uploaded, or fresh=True to discard it."
+            )
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        torn = not truncate and _torn(path)
+        self._file = open(path, "w" if truncate else "a", encoding="utf-8")
+        if torn:
+            # End a killed run's partial line so the next entry stays whole.
+            self._file.write("\n")
+
+    def _load(self) -> Dict[str, Dict[str, Any]]:
+        entries = {}
+        if not os.path.exists(self.path):
+            logger.info(f"No journal found at {self.path}; starting a fresh upload")
+            return entries
+        with open(self.path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except json.decoder.JSONDecodeError:
+                    # A torn final line from a killed run; the row is re-driven.
+                    continue
+                entries[entry["key"]] = entry
+        return entries
+
+    def successful_keys(self) -> Set[str]:
+        return {
+            key
+            for key, entry in self._entries.items()
+            if entry.get("upload_status") == "Success"
+        }
+
+    def record(self, key: str, result_row: Dict[str, Any]):
+        entry = {
+            "key": key,
+            "upload_status": result_row.get("upload_status"),
+            "error": result_row.get("error"),
+        }
+        line = json.dumps(entry, default=str)
+        with self._lock:
+            self._file.write(line + "\n")
+            self._file.flush()
+            self._entries[key] = entry
+
+    def close(self):
+        with self._lock:
+            self._file.close()
+
+    @classmethod
+    def from_kwargs(cls, csv_path: str, kwargs: dict):
+        """Open the journal configured for an upload run, or None if disabled.
+
+        Every run journals, to ``journal_path`` or by default to a file in
+        default_journal_dir() keyed by the manifest, so an interrupted run
+        can be picked up by calling again with ``resume=True``, which reads
+        that journal. ``fresh=True`` discards an earlier journal instead of
+        appending to it. ``journal=False`` turns journaling off; a journal
+        that cannot be created is skipped with a warning.
+        """
+        resume = kwargs.get("resume", False)
+        if not kwargs.get("journal", True) and not resume:
+            return None
+        path = kwargs.get("journal_path") or default_journal_path(csv_path)
+        try:
+            return cls(path, resume=resume, fresh=kwargs.get("fresh", False))
+        except OSError as ex:
+            logger.warning(f"Not journaling this upload: {ex}")
+            return None
@@ -117,6 +117,8 @@ SUPPORTED_LANGUAGES = [
 ]
 
 LANGUAGE_CHOICES = [code for code, _ in SUPPORTED_LANGUAGES]
+# Constant-time membership checks against the supported codes.
+LANGUAGE_CODES = frozenset(LANGUAGE_CHOICES)
 
 SEX_CHOICES = [
     ("Male", "M"),
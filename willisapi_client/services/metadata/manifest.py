@@ -0,0 +1,132 @@
+import os
+from typing import Callable, Iterator, List
+
+import pandas as pd
+
+PARQUET_EXTENSIONS = (".parquet", ".pq")
+ARROW_EXTENSIONS = (".arrow", ".feather", ".ipc")
+
+
+def manifest_format(path: str) -> str:
+    """Return "parquet", "arrow" or "csv" based on the manifest's extension."""
+    extension = os.path.splitext(str(path))[1].lower()
+    if extension in PARQUET_EXTENSIONS:
+        return "parquet"
+    if extension in ARROW_EXTENSIONS:
+        return "arrow"
+    return "csv"
+
+
+def _pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.ipc
+        import pyarrow.parquet
+    except ImportError:
+        raise ImportError(
+            "Reading Parquet or Arrow manifests requires pyarrow (pip install pyarrow)"
+        )
+    return pyarrow
+
+
+def _selected(names: List[str], wanted: Callable[[str], bool]) -> List[str]:
+    # Match on stripped names, as the validators strip column names.
+    return [name for name in names if wanted(name.strip())]
+
+
+def _open_arrow(path: str):
+    """Open an Arrow IPC file (or stream) memory-mapped, as a Table.
+
+    The file format is read zero-copy from the mapping, so only the columns
+    that are later converted are paged in.
+    """
+    pa = _pyarrow()
+    source = pa.memory_map(path, "r")
+    try:
+        return pa.ipc.open_file(source).read_all()
+    except pa.ArrowInvalid:
+        source.seek(0)
+        return pa.ipc.open_stream(source).read_all()
+
+
+def count_rows(path: str) -> int:
+    """Number of rows in a Parquet or Arrow manifest, read from its metadata."""
+    pa = _pyarrow()
+    if manifest_format(path) == "parquet":
+        return pa.parquet.ParquetFile(path).metadata.num_rows
+    return _open_arrow(path).num_rows
+
+
+def _to_frame(table, categorical: List[str]) -> pd.DataFrame:
+    pa = _pyarrow()
+    table = table.rename_columns([name.strip() for name in table.column_names])
+    # Identifier columns come back as pandas categoricals; numbers keep
+    # their nulls as <NA> instead of falling back to float or object.
+    for name in categorical:
+        if name in table.column_names:
+            index = table.column_names.index(name)
+            column = table.column(index)
+            if not pa.types.is_dictionary(column.type):
+                table = table.set_column(index, name, column.dictionary_encode())
+    nullable = {
+        pa.int8(): pd.Int8Dtype(),
+        pa.int16(): pd.Int16Dtype(),
+        pa.int32(): pd.Int32Dtype(),
+        pa.int64(): pd.Int64Dtype(),
+        pa.float32(): pd.Float32Dtype(),
+        pa.float64(): pd.Float64Dtype(),
+        pa.bool_(): pd.BooleanDtype(),
+    }
+    return table.to_pandas(types_mapper=nullable.get)
+
+
+def read_arrow_manifest(
+    path: str,
+    wanted: Callable[[str], bool],
+    categorical: List[str],
+    chunksize: int = None,
+):
+    """Read the wanted columns of a Parquet or Arrow IPC manifest.
+
+    Returns one DataFrame, or an iterator of DataFrames of at most
+    ``chunksize`` rows when chunksize is set. Columns for which ``wanted``
+    is false are never read from disk (Parquet) or paged in (Arrow).
+    """
+    pa = _pyarrow()
+    categorical = [name for name in categorical if wanted(name)]
+    if manifest_format(path) == "parquet":
+        parquet_file = pa.parquet.ParquetFile(path, memory_map=True)
+        columns = _selected(parquet_file.schema_arrow.names, wanted)
+        if chunksize:
+            batches = parquet_file.iter_batches(batch_size=chunksize, columns=columns)
+            return _frames(
+                (pa.Table.from_batches([batch]) for batch in batches), categorical
+            )
+        # Only the categorical columns that exist can be read as dictionaries.
+        read_dictionary = [name for name in columns if name.strip() in categorical]
+        table = pa.parquet.read_table(
+            path, columns=columns, memory_map=True, read_dictionary=read_dictionary
+        )
+        return _to_frame(table, categorical)
+
+    table = _open_arrow(path)
+    table = table.select(_selected(table.column_names, wanted))
+    if chunksize:
+        return _frames(
+            (
+                pa.Table.from_batches([batch])
+                for batch in table.to_batches(max_chunksize=chunksize)
+            ),
+            categorical,
+        )
+    return _to_frame(table, categorical)
+
+
+def _frames(tables, categorical: List[str]) -> Iterator[pd.DataFrame]:
+    # Number rows across batches, as pd.read_csv(chunksize=...) does.
+    start = 0
+    for table in tables:
+        frame = _to_frame(table, categorical)
+        frame.index = pd.RangeIndex(start, start + len(frame))
+        start += len(frame)
+        yield frame
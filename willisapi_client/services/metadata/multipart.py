@@ -0,0 +1,340 @@
+import asyncio
+import base64
+import hashlib
+import math
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from xml.sax.saxutils import escape
+
+from willisapi_client.logging_setup import logger as logger
+from willisapi_client.services.metadata.rate_control import s3_rate_controller
+from willisapi_client.services.retry import endpoint_of, retry_after, retry_policy
+from willisapi_client.services.transport import S3, transport
+
+# Files at or above this size are sent as an S3 multipart upload.
+MULTIPART_THRESHOLD = 64 * 1024 * 1024
+MULTIPART_PART_SIZE = 16 * 1024 * 1024
+MULTIPART_WORKERS = 4
+MULTIPART_PART_ATTEMPTS = 3
+# S3 rejects multipart uploads with more parts than this.
+MAX_PARTS = 10000
+# Bytes of a part read from disk at a time while hashing it.
+READ_CHUNK_SIZE = 1024 * 1024
+
+
+def plan_parts(file_size: int, part_size: int) -> List[Tuple[int, int, int]]:
+    """Split a file into (part_number, offset, length) triples."""
+    part_size = max(part_size, math.ceil(file_size / MAX_PARTS))
+    return [
+        (number, offset, min(part_size, file_size - offset))
+        for number, offset in enumerate(range(0, file_size, part_size), start=1)
+    ]
+
+
+def multipart_request(
+    file_path: str,
+    threshold: int = MULTIPART_THRESHOLD,
+    part_size: int = MULTIPART_PART_SIZE,
+    file_size: Optional[int] = None,
+) -> Optional[Dict[str, int]]:
+    """Return the multipart section of a metadata payload, or None.
+
+    The metadata endpoint answers a request carrying this section with
+    presigned part URLs instead of a single presigned PUT URL. Pass
+    ``file_size`` when it is already known to skip the stat.
+    """
+    if file_size is None:
+        file_size = os.path.getsize(file_path)
+    if file_size < threshold:
+        return None
+    parts = plan_parts(file_size, part_size)
+    return {
+        "file_size": file_size,
+        "part_size": parts[0][2],
+        "part_count": len(parts),
+    }
+
+
+class _FilePart:
+    """A read-only file object over ``length`` bytes of a file from ``offset``.
+
+    requests streams it as a PUT body a block at a time, taking its size
+    from len(), so a part is never held in memory.
+    """
+
+    def __init__(self, file_path: str, offset: int, length: int):
+        self._file = open(file_path, "rb")
+        self._offset = offset
+        self._length = length
+        self._file.seek(offset)
+
+    def __len__(self) -> int:
+        return self._length
+
+    def tell(self) -> int:
+        return self._file.tell() - self._offset
+
+    def seek(self, position: int, whence: int = os.SEEK_SET) -> int:
+        if whence == os.SEEK_CUR:
+            position += self.tell()
+        elif whence == os.SEEK_END:
+            position += self._length
+        position = min(max(0, position), self._length)
+        self._file.seek(self._offset + position)
+        return position
+
+    def read(self, size: int = -1) -> bytes:
+        remaining = self._length - self.tell()
+        if size is None or size < 0 or size > remaining:
+            size = remaining
+        return self._file.read(size)
+
+    def close(self):
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def _upload_part(
+    session, url: str, file_path: str, offset: int, length: int, attempts: int
+) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
+    """PUT one part, retrying only this part on failure.
+
+    The part is hashed and then streamed from disk on each try. Returns
+    ({"ETag": ..., "ChecksumSHA256": ...}, None) on success, or
+    (None, error).
+    """
+    checksum = _part_checksum(file_path, offset, length)
+
+    def put():
+        with _FilePart(file_path, offset, length) as body:
+            return s3_rate_controller.put(
+                session,
+                url,
+                data=body,
+                headers={
+                    "x-amz-checksum-sha256": checksum,
+                    "x-amz-sdk-checksum-algorithm": "SHA256",
+                },
+                timeout=(10, 300),
+            )
+
+    try:
+        response = retry_policy.call(
+            endpoint_of(url), put, retryable=_part_retryable, attempts=attempts
+        )
+    except Exception as ex:
+        return None, str(ex)
+    return _part_result(response, checksum)
+
+
+def _part_retryable(response, error):
+    # Any failed part is worth another try; S3 keeps the other parts.
+    if error is not None:
+        return True, None
+    return response.status_code != 200, retry_after(response)
+
+
+def _part_result(response, checksum: str):
+    if response.status_code == 200:
+        etag = response.headers.get("ETag")
+        return {"ETag": etag, "ChecksumSHA256": checksum}, None
+    return None, f"status code {response.status_code}: {response.text}"
+
+
+def _part_checksum(file_path: str, offset: int, length: int) -> str:
+    digest = hashlib.sha256()
+    with _FilePart(file_path, offset, length) as part:
+        for chunk in iter(lambda: part.read(READ_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return base64.b64encode(digest.digest()).decode("utf-8")
+
+
+def _complete_body(parts: List[Dict[str, Any]]) -> str:
+    body = ["<CompleteMultipartUpload>"]
+    for part in parts:
+        body.append(
+            "<Part>"
+            f"<PartNumber>{part['PartNumber']}</PartNumber>"
+            f"<ETag>{escape(part['ETag'] or '')}</ETag>"
+            f"<ChecksumSHA256>{part['ChecksumSHA256']}</ChecksumSHA256>"
+            "</Part>"
+        )
+    body.append("</CompleteMultipartUpload>")
+    return "".join(body)
+
+
+def _part_urls(file_path: str, multipart: Dict[str, Any]):
+    """Plan a file's parts; return (plan, {part number: url}, error or None)."""
+    file_size = os.path.getsize(file_path)
+    part_size = multipart.get("part_size") or MULTIPART_PART_SIZE
+    urls = {int(p["part_number"]): p["url"] for p in multipart.get("parts", [])}
+    plan = plan_parts(file_size, part_size)
+    if sorted(urls) != [number for number, _, _ in plan]:
+        return plan, urls, (
+            f"Multipart upload for {file_path} expected {len(plan)} part URLs, "
+            f"received {len(urls)}"
+        )
+    return plan, urls, None
+
+
+def upload_multipart(
+    file_path: str,
+    multipart: Dict[str, Any],
+    workers: int = MULTIPART_WORKERS,
+    attempts: int = MULTIPART_PART_ATTEMPTS,
+    sessions: Callable[[], Any] = None,
+) -> Optional[str]:
+    """Upload a file through presigned multipart URLs.
+
+    ``multipart`` is the section returned by the metadata endpoint::
+
+        {
+            "part_size": 16777216,
+            "parts": [{"part_number": 1, "url": "..."}, ...],
+            "complete_url": "...",
+            "abort_url": "...",  # optional
+        }
+
+    Parts are uploaded concurrently, each with its own SHA-256 checksum,
+    and then the upload is completed. Parts are streamed from disk, so at
+    most a few blocks per worker are in memory. ``sessions()`` returns the
+    session for the calling thread (the transport's S3 session by
+    default); each part thread uses its own. Returns an error string on
+    failure, otherwise None.
+    """
+    plan, urls, error = _part_urls(file_path, multipart)
+    if error:
+        return error
+    sessions = sessions or (lambda: transport.session(S3))
+
+    def send(part):
+        number, offset, length = part
+        result, error = _upload_part(
+            sessions(), urls[number], file_path, offset, length, attempts
+        )
+        if result is not None:
+            result["PartNumber"] = number
+        return result, error
+
+    errors = []
+    completed = []
+    with ThreadPoolExecutor(max_workers=max(1, min(workers, len(plan)))) as executor:
+        for (number, _, _), (result, error) in zip(plan, executor.map(send, plan)):
+            if error:
+                errors.append(f"part {number}: {error}")
+            else:
+                completed.append(result)
+
+    if not errors:
+        try:
+            response = sessions().post(
+                multipart["complete_url"],
+                data=_complete_body(completed),
+                headers={"Content-Type": "application/xml"},
+                timeout=(10, 300),
+            )
+            # S3 can report a failed completion inside a 200 response.
+            if response.status_code == 200 and "<Error>" not in response.text:
+                return None
+            errors.append(
+                f"complete failed with status code {response.status_code}: "
+                f"{response.text}"
+            )
+        except Exception as ex:
+            errors.append(f"complete failed: {ex}")
+
+    abort_url = multipart.get("abort_url")
+    if abort_url:
+        try:
+            sessions().delete(abort_url, timeout=(10, 60))
+        except Exception as ex:
+            logger.warning(f"Multipart abort failed for {file_path}: {ex}")
+    return f"S3 multipart upload failed for file {file_path}: " + "; ".join(errors)
+
+
+async def upload_multipart_async(
+    client,
+    file_path: str,
+    multipart: Dict[str, Any],
+    workers: int = MULTIPART_WORKERS,
+    attempts: int = MULTIPART_PART_ATTEMPTS,
+) -> Optional[str]:
+    """upload_multipart over an AsyncClient.
+
+    Up to ``workers`` parts are hashed and streamed from disk at a time, so
+    a large file is never held in memory. Returns an error string on
+    failure, otherwise None.
+    """
+    plan, urls, error = _part_urls(file_path, multipart)
+    if error:
+        return error
+    slots = asyncio.Semaphore(max(1, workers))
+
+    async def send(part):
+        number, offset, length = part
+        async with slots:
+            try:
+                checksum = await asyncio.to_thread(
+                    _part_checksum, file_path, offset, length
+                )
+                response = await client.put_file(
+                    urls[number],
+                    file_path,
+                    headers={
+                        "x-amz-checksum-sha256": checksum,
+                        "x-amz-sdk-checksum-algorithm": "SHA256",
+                    },
+                    offset=offset,
+                    length=length,
+                    retryable=_part_retryable,
+                    attempts=attempts,
+                    rate_controller=s3_rate_controller,
+                )
+            except Exception as ex:
+                return None, str(ex)
+        result, error = _part_result(response, checksum)
+        if result is not None:
+            result["PartNumber"] = number
+        return result, error
+
+    errors = []
+    completed = []
+    outcomes = await asyncio.gather(*(send(part) for part in plan))
+    for (number, _, _), (result, error) in zip(plan, outcomes):
+        if error:
+            errors.append(f"part {number}: {error}")
+        else:
+            completed.append(result)
+
+    if not errors:
+        try:
+            response = await client.request(
+                "POST",
+                multipart["complete_url"],
+                data=_complete_body(completed),
+                headers={"Content-Type": "application/xml"},
+                pool=S3,
+            )
+            # S3 can report a failed completion inside a 200 response.
+            if response.status_code == 200 and "<Error>" not in response.text:
+                return None
+            errors.append(
+                f"complete failed with status code {response.status_code}: "
+                f"{response.text}"
+            )
+        except Exception as ex:
+            errors.append(f"complete failed: {ex}")
+
+    abort_url = multipart.get("abort_url")
+    if abort_url:
+        try:
+            await client.request("DELETE", abort_url, pool=S3)
+        except Exception as ex:
+            logger.warning(f"Multipart abort failed for {file_path}: {ex}")
+    return f"S3 multipart upload failed for file {file_path}: " + "; ".join(errors)
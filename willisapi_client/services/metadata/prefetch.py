@@ -0,0 +1,169 @@
+import threading
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterable, Optional
+
+# Threads hashing files ahead of the upload workers. hashlib releases the
+# GIL while it digests, so these overlap with each other and with the
+# network threads.
+HASH_WORKERS = 4
+# How many upcoming files may be hashed (or hashing) before they are used.
+LOOKAHEAD = 16
+
+
+class ChecksumPrefetcher:
+    """Hash files a bounded distance ahead of the rows that will upload them.
+
+    start() is given the files in the order rows are expected to use them.
+    Up to ``lookahead`` of those are hashed on a worker pool before they are
+    asked for; each checksum() call hands over a result (waiting for it if
+    it is still being hashed) and lets one more file into the window. A
+    file that was not prefetched is hashed inline, as without a prefetcher,
+    and that use is struck from the plan so the window does not later fill
+    with a file nobody will ask for. discard() does the same for files
+    whose rows will not be uploaded after all.
+
+    checksum() has the signature of ChecksumCache.checksum, so UploadUtils
+    can take a prefetcher in place of the cache.
+    """
+
+    def __init__(
+        self,
+        compute: Callable[[str], str],
+        workers: int = HASH_WORKERS,
+        lookahead: int = LOOKAHEAD,
+    ):
+        self.compute = compute
+        self.lookahead = max(1, lookahead)
+        self._executor = ThreadPoolExecutor(
+            max_workers=max(1, workers), thread_name_prefix="willisapi-hash"
+        )
+        self._lock = threading.Lock()
+        self._plan = iter(())
+        # Uses of each path still in the plan, and uses to skip when reached.
+        self._upcoming: Counter = Counter()
+        self._skip: Counter = Counter()
+        # path -> [future, number of uses still expected]
+        self._pending: Dict[str, list] = {}
+        self._ahead = 0
+        self._hits = 0
+        self._misses = 0
+        self._ready_sum = 0
+
+    @classmethod
+    def from_kwargs(
+        cls, kwargs: dict, compute: Callable[[str], str], checksum_cache=None
+    ) -> Optional["ChecksumPrefetcher"]:
+        """Build the prefetcher configured for an upload run, or None if disabled.
+
+        ``checksum_lookahead=0`` turns prefetching off. Files are hashed
+        with ``compute``, through ``checksum_cache`` when one is configured.
+        """
+        lookahead = int(kwargs.get("checksum_lookahead", LOOKAHEAD))
+        if lookahead <= 0:
+            return None
+        if checksum_cache is not None:
+
+            def compute(path, hash_file=compute):
+                return checksum_cache.checksum(path, hash_file)
+
+        return cls(
+            compute,
+            workers=int(kwargs.get("checksum_workers", HASH_WORKERS)),
+            lookahead=lookahead,
+        )
+
+    def start(self, paths: Iterable[str]):
+        """Set the order files will be asked for and begin hashing the first ones."""
+        paths = list(paths)
+        with self._lock:
+            self._plan = iter(paths)
+            self._upcoming = Counter(paths)
+            self._skip = Counter()
+        self._fill()
+
+    def _fill(self):
+        with self._lock:
+            while self._ahead < self.lookahead:
+                path = next(self._plan, None)
+                if path is None:
+                    return
+                self._upcoming[path] -= 1
+                if self._skip[path]:
+                    self._skip[path] -= 1
+                    continue
+                entry = self._pending.get(path)
+                if entry is None:
+                    self._pending[path] = [self._executor.submit(self.compute, path), 1]
+                else:
+                    entry[1] += 1
+                self._ahead += 1
+
+    def checksum(self, file_path: str, compute: Callable[[str], str] = None) -> str:
+        """Return file_path's checksum, from the prefetch window when possible."""
+        with self._lock:
+            entry = self._pending.get(file_path)
+            if entry is not None:
+                self._hits += 1
+                self._ready_sum += sum(
+                    1 for future, _ in self._pending.values() if future.done()
+                )
+                entry[1] -= 1
+                if entry[1] == 0:
+                    del self._pending[file_path]
+                self._ahead -= 1
+            else:
+                self._misses += 1
+                self._strike(file_path)
+        if entry is None:
+            return self.compute(file_path)
+        try:
+            return entry[0].result()
+        finally:
+            self._fill()
+
+    def discard(self, paths: Iterable[str]):
+        """Give up one planned use of each path, e.g. for a row held back."""
+        with self._lock:
+            for path in paths:
+                entry = self._pending.get(path)
+                if entry is None:
+                    self._strike(path)
+                    continue
+                entry[1] -= 1
+                if entry[1] == 0:
+                    del self._pending[path]
+                    entry[0].cancel()
+                self._ahead -= 1
+        self._fill()
+
+    def _strike(self, path: str):
+        # Called with the lock held: skip one use of path still in the plan.
+        if self._upcoming[path] > self._skip[path]:
+            self._skip[path] += 1
+
+    def stats(self) -> Dict[str, Any]:
+        """Queue depths now, plus hit counts and the mean depth seen by consumers.
+
+        ``queued`` files wait for a hashing thread, ``hashing`` are being
+        hashed and ``ready`` are hashed but not yet used. A ``mean_ready``
+        near zero means uploads are waiting on hashing; near ``lookahead``
+        means hashing is comfortably ahead.
+        """
+        with self._lock:
+            futures = [future for future, _ in self._pending.values()]
+            hits, misses, ready_sum = self._hits, self._misses, self._ready_sum
+        ready = sum(1 for future in futures if future.done())
+        hashing = sum(1 for future in futures if future.running())
+        return {
+            "lookahead": self.lookahead,
+            "queued": len(futures) - ready - hashing,
+            "hashing": hashing,
+            "ready": ready,
+            "hits": hits,
+            "misses": misses,
+            "mean_ready": ready_sum / hits if hits else 0.0,
+        }
+
+    def close(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
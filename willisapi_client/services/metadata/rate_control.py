@@ -0,0 +1,160 @@
+import asyncio
+import threading
+import time
+from typing import Any, Dict
+
+import requests
+
+from willisapi_client.services.retry import RetryPolicy, endpoint_of, retry_policy
+
+# S3 answers with 503 SlowDown when a prefix is receiving more requests than
+# it can absorb.
+THROTTLE_STATUS_CODES = (503,)
+
+
+class AdaptiveRateController:
+    """Token bucket whose refill rate is tuned by AIMD.
+
+    Every S3 PUT takes a token before it is sent. Healthy responses raise the
+    rate by ``increase`` at most once per ``increase_interval`` seconds, so
+    the rate grows with time rather than with the number of successes; a
+    503/SlowDown or a reset connection halves it. A burst of throttled
+    responses from requests that were already in flight only counts once per
+    ``cooldown`` seconds, so one congestion event does not collapse the rate
+    to the floor.
+
+    put() also owns the retries of a throttled or reset PUT, through
+    ``policy``: every attempt takes its own token and reports its own
+    outcome, so retries slow the rate down rather than hiding throttling
+    from it. (A retrying transport session underneath sends once while
+    put() is retrying.)
+    """
+
+    def __init__(
+        self,
+        initial_rate: float = 20.0,
+        min_rate: float = 0.5,
+        max_rate: float = 1000.0,
+        increase: float = 1.0,
+        decrease: float = 0.5,
+        cooldown: float = 1.0,
+        increase_interval: float = 1.0,
+        policy: RetryPolicy = None,
+    ):
+        self.policy = policy or retry_policy
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.increase = increase
+        self.decrease = decrease
+        self.cooldown = cooldown
+        self.increase_interval = increase_interval
+        self._rate = initial_rate
+        self._tokens = 1.0
+        self._last_refill = time.monotonic()
+        self._last_decrease = float("-inf")
+        self._last_increase = float("-inf")
+        self._successes = 0
+        self._throttles = 0
+        self._lock = threading.Lock()
+
+    @property
+    def rate(self) -> float:
+        """Requests per second currently allowed."""
+        return self._rate
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "rate": self._rate,
+                "successes": self._successes,
+                "throttles": self._throttles,
+            }
+
+    def acquire(self):
+        """Block until a request may be sent."""
+        while True:
+            wait = self._take()
+            if not wait:
+                return
+            time.sleep(wait)
+
+    async def acquire_async(self):
+        """acquire() for a coroutine: waits without blocking the event loop."""
+        while True:
+            wait = self._take()
+            if not wait:
+                return
+            await asyncio.sleep(wait)
+
+    def _take(self) -> float:
+        """Take a token and return 0, or return how long until one is due."""
+        with self._lock:
+            now = time.monotonic()
+            burst = max(1.0, self._rate)
+            self._tokens = min(
+                burst, self._tokens + (now - self._last_refill) * self._rate
+            )
+            self._last_refill = now
+            if self._tokens >= 1.0:
+                self._tokens -= 1.0
+                return 0.0
+            return (1.0 - self._tokens) / self._rate
+
+    def on_success(self):
+        with self._lock:
+            self._successes += 1
+            now = time.monotonic()
+            if now - self._last_increase < self.increase_interval:
+                return
+            self._last_increase = now
+            self._rate = min(self.max_rate, self._rate + self.increase)
+
+    def on_throttle(self):
+        with self._lock:
+            self._throttles += 1
+            now = time.monotonic()
+            if now - self._last_decrease < self.cooldown:
+                return
+            self._last_decrease = now
+            self._rate = max(self.min_rate, self._rate * self.decrease)
+            self._tokens = min(self._tokens, 0.0)
+
+    def observe(self, response):
+        if response.status_code in THROTTLE_STATUS_CODES or (
+            response.status_code >= 400 and "SlowDown" in response.text
+        ):
+            self.on_throttle()
+        elif response.status_code < 400:
+            self.on_success()
+
+    def put(self, session, url: str, **kwargs):
+        """Send a rate-limited PUT, retrying it through the policy.
+
+        Each attempt waits for a token and feeds its outcome back into the
+        rate. A file body is sought back to where it started before a retry.
+        """
+        data = kwargs.get("data")
+        start = data.tell() if hasattr(data, "seek") else None
+
+        def attempt():
+            self.acquire()
+            try:
+                response = session.put(url, **kwargs)
+            except requests.exceptions.ConnectionError:
+                self.on_throttle()
+                raise
+            self.observe(response)
+            return response
+
+        def before_retry(response):
+            if response is not None:
+                response.close()
+            if start is not None:
+                data.seek(start)
+
+        return self.policy.call(endpoint_of(url), attempt, before_retry=before_retry)
+
+
+# Shared by every S3 PUT in the process, since they all compete for the
+# same link and the same S3 prefixes.
+s3_rate_controller = AdaptiveRateController()
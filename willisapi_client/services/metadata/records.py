@@ -0,0 +1,97 @@
+from typing import Any, Dict, List
+
+import pandas as pd
+
+
+class _Record:
+    """One transformed manifest row, held in slots instead of a pd.Series.
+
+    Fields are read by attribute, as on the Series from iterrows(). A field
+    whose column is absent from the frame is left unset, so getattr() with
+    a default and ``in`` behave as they do on a Series.
+    """
+
+    __slots__ = ("index",)
+    FIELDS = ()
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.FIELDS and hasattr(self, name)
+
+    def __getitem__(self, name: str) -> Any:
+        if name not in self.FIELDS:
+            raise KeyError(name)
+        try:
+            return getattr(self, name)
+        except AttributeError:
+            raise KeyError(name)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {name: getattr(self, name) for name in self.FIELDS if name in self}
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame) -> List["_Record"]:
+        """Build one record per row of df, in order, with ``index`` set to its label."""
+        columns = [name for name in cls.FIELDS if name in df.columns]
+        # Slot descriptors set a field without going through setattr().
+        setters = [getattr(cls, name).__set__ for name in ["index"] + columns]
+        records = []
+        for values in df[columns].itertuples(index=True, name=None):
+            record = cls.__new__(cls)
+            for setter, value in zip(setters, values):
+                setter(record, value)
+            records.append(record)
+        return records
+
+
+class DataRow(_Record):
+    """A row of MetadataValidation.transformed_df: one recording to upload."""
+
+    FIELDS = (
+        "study_id",
+        "site_id",
+        "participant_id",
+        "visit_name",
+        "visit_order",
+        "coa_name",
+        "file_path",
+        "time_collected",
+        "recording_order",
+        "rater_id",
+        "age",
+        "sex",
+        "race",
+        "language",
+        "is_last_recording",
+        "actual_scores",
+        "force_upload",
+    )
+    __slots__ = FIELDS
+
+
+class ProcessedRow(_Record):
+    """A row of ProcessedMetadataValidation.transformed_df: one merged recording."""
+
+    FIELDS = (
+        "study_id",
+        "site_id",
+        "pt_id",
+        "visit_id",
+        "visit_order",
+        "coa_id",
+        "timestamp",
+        "timestamp_iso",
+        "recording_order",
+        "workflow",
+        "recording",
+        "rater_id",
+        "language",
+        "site_country",
+        "age",
+        "sex",
+        "race",
+        "recording_count",
+        "original_recordings",
+        "scores_actual",
+        "force_upload",
+    )
+    __slots__ = FIELDS
@@ -0,0 +1,206 @@
+import asyncio
+import heapq
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Dict,
+    Hashable,
+    Iterable,
+    Iterator,
+    List,
+    Tuple,
+)
+
+# Reported for a visit's last recording when a sibling did not upload.
+BLOCKED_ERROR = (
+    "Not uploaded: another recording of this visit failed, so its last "
+    "recording was held back"
+)
+
+
+class UploadTask:
+    """One row to upload: its position in the run, visit, and scheduling facts."""
+
+    __slots__ = ("position", "visit", "is_last", "size")
+
+    def __init__(
+        self,
+        position: int,
+        visit: Hashable = None,
+        is_last: bool = False,
+        size: int = 0,
+    ):
+        self.position = position
+        self.visit = visit
+        self.is_last = is_last
+        self.size = size
+
+
+class _Visit:
+    __slots__ = ("outstanding", "held", "failed")
+
+    def __init__(self):
+        self.outstanding = 0
+        self.held = []
+        self.failed = False
+
+
+class VisitScheduler:
+    """Run upload tasks with a per-visit barrier on the last recording.
+
+    Tasks of different visits run fully in parallel, up to ``workers`` at a
+    time, largest ``size`` first (ties keep their original order). A task
+    marked ``is_last`` is held until every other task of its visit has
+    finished, and is only sent if all of them succeeded; otherwise it fails
+    with BLOCKED_ERROR without being run. With one worker, tasks run in the
+    calling thread.
+    """
+
+    def __init__(self, workers: int = 1):
+        self.workers = max(1, workers)
+
+    def run(
+        self,
+        tasks: Iterable[UploadTask],
+        execute: Callable[[UploadTask], Dict[str, Any]],
+        failed_visits: Iterable[Hashable] = (),
+    ) -> Iterator[Tuple[int, Dict[str, Any]]]:
+        """Yield (position, result) for every task as it finishes.
+
+        ``execute`` returns a result dict with ``upload_status``.
+        ``failed_visits`` names visits where a recording already failed
+        outside this run (e.g. in pre-validation), so their last recordings
+        are held back too.
+        """
+        ready, blocked, finished = self._plan(tasks, failed_visits)
+        for task in blocked:
+            yield task.position, _blocked_result()
+
+        if self.workers == 1:
+            while ready:
+                task = heapq.heappop(ready)[2]
+                result = execute(task)
+                yield task.position, result
+                for held in finished(task, result):
+                    yield held.position, _blocked_result()
+            return
+
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            in_flight = {}
+            while ready or in_flight:
+                while ready and len(in_flight) < self.workers:
+                    task = heapq.heappop(ready)[2]
+                    in_flight[executor.submit(execute, task)] = task
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    task = in_flight.pop(future)
+                    result = future.result()
+                    yield task.position, result
+                    for held in finished(task, result):
+                        yield held.position, _blocked_result()
+
+    def order(
+        self, tasks: Iterable[UploadTask], failed_visits: Iterable[Hashable] = ()
+    ) -> List[UploadTask]:
+        """The order run() dispatches tasks in, if every one of them succeeds.
+
+        Exact with one worker; with more, a visit's last recording may be
+        released somewhat later. Tasks blocked from the start are left out.
+        """
+        ready, _, finished = self._plan(tasks, failed_visits)
+        order = []
+        while ready:
+            task = heapq.heappop(ready)[2]
+            order.append(task)
+            finished(task, {"upload_status": "Success"})
+        return order
+
+    def _plan(
+        self, tasks: Iterable[UploadTask], failed_visits: Iterable[Hashable]
+    ) -> Tuple[list, List[UploadTask], Callable]:
+        """Queue tasks by visit; return (ready heap, blocked tasks, finished).
+
+        ``finished(task, result)`` books a task's outcome and returns the
+        held tasks it blocks; tasks it releases are pushed onto the heap.
+        """
+        visits: Dict[Hashable, _Visit] = {}
+        ready: List[Tuple[int, int, UploadTask]] = []
+        for task in tasks:
+            if task.visit is None:
+                heapq.heappush(ready, (-task.size, task.position, task))
+                continue
+            visit = visits.setdefault(task.visit, _Visit())
+            if task.is_last:
+                visit.held.append(task)
+            else:
+                visit.outstanding += 1
+                heapq.heappush(ready, (-task.size, task.position, task))
+        for key in failed_visits:
+            if key in visits:
+                visits[key].failed = True
+
+        blocked = []
+        for visit in visits.values():
+            blocked.extend(self._release(visit, ready))
+
+        def finished(task, result):
+            released = []
+            if task.visit is not None and not task.is_last:
+                visit = visits[task.visit]
+                visit.outstanding -= 1
+                if result.get("upload_status") != "Success":
+                    visit.failed = True
+                released = self._release(visit, ready)
+            return released
+
+        return ready, blocked, finished
+
+    async def run_async(
+        self,
+        tasks: Iterable[UploadTask],
+        execute: Callable[[UploadTask], Awaitable[Dict[str, Any]]],
+        failed_visits: Iterable[Hashable] = (),
+    ) -> AsyncIterator[Tuple[int, Dict[str, Any]]]:
+        """run() for a coroutine function: up to ``workers`` tasks await at once."""
+        ready, blocked, finished = self._plan(tasks, failed_visits)
+        for task in blocked:
+            yield task.position, _blocked_result()
+
+        in_flight = {}
+        try:
+            while ready or in_flight:
+                while ready and len(in_flight) < self.workers:
+                    task = heapq.heappop(ready)[2]
+                    in_flight[asyncio.ensure_future(execute(task))] = task
+                done, _ = await asyncio.wait(
+                    in_flight, return_when=asyncio.FIRST_COMPLETED
+                )
+                for future in done:
+                    task = in_flight.pop(future)
+                    result = future.result()
+                    yield task.position, result
+                    for held in finished(task, result):
+                        yield held.position, _blocked_result()
+        finally:
+            # Stop the rest of the run if the caller stops or a task raised.
+            for future in in_flight:
+                future.cancel()
+
+    @staticmethod
+    def _release(visit: _Visit, ready: list) -> List[UploadTask]:
+        """Queue a visit's held tasks once its siblings finish; return blocked ones."""
+        if visit.outstanding or not visit.held:
+            return []
+        held, visit.held = visit.held, []
+        if visit.failed:
+            return held
+        for task in held:
+            heapq.heappush(ready, (-task.size, task.position, task))
+        return []
+
+
+def _blocked_result() -> Dict[str, Any]:
+    return {"upload_status": "Failed", "error": BLOCKED_ERROR}
@@ -0,0 +1,110 @@
+import math
+import os
+import pickle
+import shutil
+import tempfile
+from typing import Iterator, List, Optional
+
+import pandas as pd
+
+# Upper bound on the number of partition files one spill writes to.
+MAX_PARTITIONS = 4096
+# Bytes read from the start of a CSV to estimate its average line length.
+SAMPLE_BYTES = 1024 * 1024
+
+
+def estimate_partitions(csv_path: str, rows_per_partition: int) -> int:
+    """Return how many partitions keep each one near ``rows_per_partition`` rows.
+
+    The row count is estimated from the average line length of the first
+    ``SAMPLE_BYTES`` of the file, so no extra pass over the CSV is needed.
+    """
+    size = os.path.getsize(csv_path)
+    with open(csv_path, "rb") as f:
+        sample = f.read(SAMPLE_BYTES)
+    lines = max(1, sample.count(b"\n"))
+    estimated_rows = size / (len(sample) / lines) if sample else 0
+    return partitions_for_rows(estimated_rows, rows_per_partition)
+
+
+def partitions_for_rows(rows: float, rows_per_partition: int) -> int:
+    return max(1, min(MAX_PARTITIONS, math.ceil(rows / rows_per_partition)))
+
+
+def _partition_keys(series: pd.Series) -> pd.Series:
+    """Spell equal keys identically, whatever dtype their chunk was parsed as.
+
+    A chunk with a missing value parses an integer column as float, so 1 and
+    1.0 must land in the same partition; NaN and None must too.
+    """
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        series = series.astype(object)
+    keys = series.astype(str)
+    if pd.api.types.infer_dtype(series, skipna=True) not in ("string", "empty"):
+        numbers = pd.to_numeric(series, errors="coerce")
+        is_number = numbers.notna()
+        keys[is_number] = numbers[is_number].astype(float).astype(str)
+    keys[series.isna()] = ""
+    return keys
+
+
+class SpillPartitions:
+    """Hash-partition DataFrame chunks to disk, then read back one partition at a time.
+
+    Rows with equal values in ``key_columns`` always land in the same
+    partition, in the order they were added, so a partition can be grouped
+    on those columns exactly as the whole frame would be. Only one chunk is
+    held while writing and one partition while reading.
+    """
+
+    def __init__(
+        self,
+        key_columns: List[str],
+        n_partitions: int,
+        spill_dir: Optional[str] = None,
+    ):
+        self.key_columns = key_columns
+        self.n_partitions = n_partitions
+        self.empty = None
+        self._dir = tempfile.mkdtemp(prefix="willisapi-spill-", dir=spill_dir)
+        self._written = set()
+
+    def _path(self, partition: int) -> str:
+        return os.path.join(self._dir, f"{partition:05d}.pkl")
+
+    def add(self, chunk: pd.DataFrame):
+        if self.empty is None:
+            self.empty = chunk.iloc[:0]
+        if chunk.empty:
+            return
+        keys = pd.DataFrame(
+            {col: _partition_keys(chunk[col]) for col in self.key_columns}
+        )
+        hashes = pd.util.hash_pandas_object(keys, index=False).to_numpy()
+        partitions = hashes % self.n_partitions
+        for partition, rows in chunk.groupby(partitions, sort=False):
+            # Each add() appends one more pickle to the partition's file.
+            with open(self._path(partition), "ab") as f:
+                pickle.dump(rows, f, protocol=pickle.HIGHEST_PROTOCOL)
+            self._written.add(partition)
+
+    def partitions(self) -> Iterator[pd.DataFrame]:
+        """Yield each non-empty partition as one DataFrame."""
+        for partition in sorted(self._written):
+            pieces = []
+            with open(self._path(partition), "rb") as f:
+                while True:
+                    try:
+                        pieces.append(pickle.load(f))
+                    except EOFError:
+                        break
+            yield pd.concat(pieces)
+
+    def close(self):
+        shutil.rmtree(self._dir, ignore_errors=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,117 @@
+from datetime import date, datetime, time
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+from dateutil import parser
+
+# Layouts tried, in order, to find one strptime can parse a column with.
+# Only year/month/day layouts are listed: each parses a string to the same
+# datetime dateutil does, so the fast path never changes a result.
+CANDIDATE_FORMATS = [
+    "%Y-%m-%dT%H:%M:%S",
+    "%Y-%m-%dT%H:%M:%S.%f",
+    "%Y-%m-%dT%H:%M:%S%z",
+    "%Y-%m-%dT%H:%M:%S.%f%z",
+    "%Y-%m-%dT%H:%M",
+    "%Y-%m-%d %H:%M:%S",
+    "%Y-%m-%d %H:%M:%S.%f",
+    "%Y-%m-%d %H:%M:%S%z",
+    "%Y-%m-%d %H:%M:%S.%f%z",
+    "%Y-%m-%d %H:%M",
+    "%Y-%m-%d",
+    "%m/%d/%Y %H:%M:%S",
+    "%m/%d/%Y %H:%M",
+    "%m/%d/%Y",
+]
+
+
+def infer_format(value: str) -> Optional[str]:
+    """Return the first candidate layout that parses value as dateutil does."""
+    try:
+        expected = parser.parse(value)
+    except (ValueError, OverflowError, TypeError):
+        return None
+    for fmt in CANDIDATE_FORMATS:
+        try:
+            if datetime.strptime(value, fmt) == expected:
+                return fmt
+        except ValueError:
+            continue
+    return None
+
+
+class TimestampParser:
+    """Parse timestamp columns to ISO 8601 strings, each distinct value once.
+
+    The layout is inferred from the first parseable value and tried with
+    strptime first; values it does not fit go through dateutil. Results are
+    cached by string, so a column read in chunks parses a repeated value
+    only once across all chunks. Values that are already dates or times,
+    as Parquet and Arrow manifests hold them, are formatted directly.
+    """
+
+    def __init__(self):
+        self.format = None
+        self._cache: Dict[str, Optional[str]] = {}
+
+    def _parse(self, value) -> Optional[str]:
+        if isinstance(value, (date, np.datetime64)):
+            return _isoformat(value)
+        if not isinstance(value, str):
+            return None
+        if self.format is None:
+            self.format = infer_format(value)
+        if self.format is not None:
+            try:
+                return datetime.strptime(value, self.format).isoformat()
+            except ValueError:
+                pass
+        try:
+            return parser.parse(value).isoformat()
+        except (ValueError, OverflowError):
+            return None
+
+    def parse(self, values: pd.Series) -> Tuple[pd.Series, List[Any]]:
+        """Return values as categorical ISO strings, and the values that failed.
+
+        Missing and unparseable values are <NA> in the result; the failed
+        list holds each distinct one once, in order of appearance.
+        """
+        codes, uniques = pd.factorize(values, use_na_sentinel=False)
+        uniques = np.asarray(uniques, dtype=object)
+        iso = []
+        failed = []
+        for value in uniques:
+            key = value if isinstance(value, str) else None
+            if key is None or key not in self._cache:
+                parsed = self._parse(value)
+                if key is not None:
+                    self._cache[key] = parsed
+            else:
+                parsed = self._cache[key]
+            iso.append(parsed)
+            if parsed is None:
+                failed.append(value)
+        categories = pd.unique(
+            np.array([v for v in iso if v is not None], dtype=object)
+        )
+        lookup = {v: i for i, v in enumerate(categories)}
+        iso_codes = np.array([-1 if v is None else lookup[v] for v in iso], dtype=int)
+        result = pd.Series(
+            pd.Categorical.from_codes(iso_codes[codes], categories=categories),
+            index=values.index,
+            name=values.name,
+        )
+        return result, failed
+
+
+def _isoformat(value) -> Optional[str]:
+    """ISO 8601 for a datetime, pd.Timestamp, np.datetime64 or date; None for NaT."""
+    if pd.isna(value):
+        return None
+    if isinstance(value, (pd.Timestamp, np.datetime64)):
+        value = pd.Timestamp(value).to_pydatetime(warn=False)
+    elif not isinstance(value, datetime):
+        value = datetime.combine(value, time())
+    return value.isoformat()
@@ -1,22 +1,9 @@
 import pandas as pd
 from tqdm import tqdm
 from datetime import datetime
+from contextlib import ExitStack
 import requests
-import mimetypes
 import os
-import time
-from concurrent.futures import ThreadPoolExecutor
-
-# The server signs presigned URLs with Content-Types guessed from Python's
-# built-in mimetypes table (on Linux), so the client must produce identical
-# guesses. A private MimeTypes instance holds only that built-in table —
-# the module-level mimetypes.guess_type() on Windows also reads the registry
-# (e.g. .csv -> application/vnd.ms-excel, .wav -> audio/wav), which makes the
-# PUT's Content-Type differ from the signed one and S3 reject the upload with
-# SignatureDoesNotMatch. Also register extensions the built-in table lacks,
-# mirroring the server.
-_MIME_TYPES = mimetypes.MimeTypes()
-_MIME_TYPES.add_type("application/vnd.apache.parquet", ".parquet")
 
 from willisapi_client.timer import measure
 from willisapi_client.willisapi_client import WillisapiClient
@@ -25,61 +12,406 @@ from willisapi_client.services.metadata.utils import (
     MetadataValidation,
     ProcessedMetadataValidation,
     UploadUtils,
+    FilenameIndex,
+    INTERNAL_COLUMNS,
     build_retry_session,
-    find_files_with_pattern,
     get_last_n_directories,
+    s3_content_type,
+    sha256_base64,
+    validate_upload_rows,
 )
+from willisapi_client.services.metadata.checksum_cache import ChecksumCache
+from willisapi_client.services.metadata.journal import (
+    DATA_ROW_KEY_COLUMNS,
+    PROCESSED_ROW_KEY_COLUMNS,
+    UploadJournal,
+    row_key,
+)
+from willisapi_client.services.metadata.dedupe import (
+    FileDeduplicator,
+    PutLedger,
+    duplicate_positions,
+)
+from willisapi_client.services.metadata.executor import BoundedExecutor, S3_WORKERS
+from willisapi_client.services.metadata.prefetch import ChecksumPrefetcher
+from willisapi_client.services.metadata.records import DataRow, ProcessedRow
+from willisapi_client.services.metadata.multipart import (
+    MULTIPART_PART_SIZE,
+    MULTIPART_THRESHOLD,
+    multipart_request,
+    upload_multipart,
+)
+from willisapi_client.services.metadata.rate_control import s3_rate_controller
+from willisapi_client.services.metadata.scheduler import UploadTask, VisitScheduler
 from willisapi_client.services.metadata.archive import (
     archive_metadata_csv,
     finalize_metadata_csv,
 )
+from willisapi_client.services.retry import retry_policy
+from willisapi_client.services.transport import API, S3, transport
 
 VALID_SCORE_TYPES = ["rater", "reviewer"]
 
 
-def _put_file_to_s3(file_presigned: dict):
+def _s3_headers(name: str, checksum: str) -> dict:
+    """Headers for a single-PUT upload of a file called name."""
+    return {
+        "x-amz-checksum-sha256": checksum,
+        "x-amz-sdk-checksum-algorithm": "SHA256",
+        "Content-Type": s3_content_type(name),
+    }
+
+
+def _s3_put(presigned: str, file_path: str, name: str, checksum: str):
+    """PUT file_path to a presigned S3 URL and return the response."""
+    with open(file_path, "rb") as f:
+        session = build_retry_session()
+        return s3_rate_controller.put(
+            session,
+            presigned,
+            data=f,
+            headers=_s3_headers(name, checksum),
+            timeout=(10, 300),
+        )
+
+
+def _put_once(put_ledger, presigned: str, checksum: str, put):
+    """Run put(), or skip it if put_ledger saw this object get these bytes."""
+    if put_ledger is None or not checksum:
+        return put()
+    return put_ledger.put_once(presigned, checksum, put)
+
+
+def _put_file_to_s3(file_presigned: dict, put_ledger=None):
     """Upload a single file to its presigned S3 URL.
 
     Returns an error string if the upload fails, otherwise None. Presigned
     URLs from a single recording are all signed at once and share one expiry
-    window, so callers should run these concurrently to fit within it.
+    window, so callers should run these concurrently to fit within it. Large
+    files come back with a ``multipart`` section instead of a single URL.
     """
     presigned = file_presigned.get("presigned")
     checksum = file_presigned.get("checksum")
     recording = file_presigned.get("recording")
-    try:
-        content_type, _ = _MIME_TYPES.guess_type(recording)
-        if not content_type:
-            # Mirror the server's fallback — it signs the presigned URL with
-            # this Content-Type when the extension is unknown.
-            content_type = "application/octet-stream"
-        with open(recording, "rb") as f:
-            session = build_retry_session()
-            response = session.put(
-                presigned,
-                data=f,
-                headers={
-                    "x-amz-checksum-sha256": checksum,
-                    "x-amz-sdk-checksum-algorithm": "SHA256",
-                    "Content-Type": content_type,
-                },
-                timeout=(10, 300),
-            )
-        if response.status_code != 200:
-            return (
-                f"S3 upload failed with status code {response.status_code} "
-                f"for file {recording}: {response.text}"
+    if file_presigned.get("multipart"):
+        return upload_multipart(recording, file_presigned["multipart"])
+
+    def put():
+        try:
+            response = _s3_put(presigned, recording, recording, checksum)
+            if response.status_code != 200:
+                return (
+                    f"S3 upload failed with status code {response.status_code} "
+                    f"for file {recording}: {response.text}"
+                )
+        except Exception as ex:
+            return str(ex)
+        return None
+
+    return _put_once(put_ledger, presigned, checksum, put)
+
+
+def _upload_data_row(
+    row,
+    api_key: str,
+    url: str,
+    headers: dict,
+    checksum_cache=None,
+    multipart_threshold: int = MULTIPART_THRESHOLD,
+    multipart_part_size: int = MULTIPART_PART_SIZE,
+    file_size: int = None,
+    put_ledger=None,
+) -> dict:
+    """POST and PUT a single data-upload row that passed validate_upload_rows.
+
+    Returns a dict with the row's ``upload_status`` and ``error``. Safe to
+    call from worker threads: it only touches its own row.
+    """
+    u = UploadUtils(row, checksum_cache=checksum_cache)
+    result = {"upload_status": None, "error": None}
+    payload = u.generate_payload()
+    multipart = multipart_request(
+        row.file_path, multipart_threshold, multipart_part_size, file_size
+    )
+    if multipart:
+        payload["multipart"] = multipart
+    res = u.post(api_key, url, headers, payload)
+    if res.get("upload_status") == "Success":
+        result["upload_status"] = "Success"
+        result["error"] = None
+
+        # Handle S3 upload if presigned URL is provided
+        presigned = res.get("response", {}).get("presigned")
+        multipart_urls = res.get("response", {}).get("multipart")
+        if multipart_urls:
+            error = upload_multipart(row.file_path, multipart_urls)
+            if error:
+                result["upload_status"] = "Failed"
+                result["error"] = error
+        elif presigned:
+
+            def put():
+                try:
+                    response = _s3_put(
+                        presigned,
+                        row.file_path,
+                        payload.get("filename"),
+                        payload.get("checksum"),
+                    )
+                except Exception as ex:
+                    return str(ex)
+                if response.status_code != 200:
+                    return (
+                        f"S3 upload failed with status code {response.status_code}: {response.text}"
+                    )
+                return None
+
+            error = _put_once(put_ledger, presigned, payload.get("checksum"), put)
+            if error:
+                result["upload_status"] = "Failed"
+                result["error"] = error
+        else:
+            result["upload_status"] = "Failed"
+            result["error"] = "Collect recording upload URL not received"
+    else:
+        result["upload_status"] = "Failed"
+        result["error"] = res.get("error")
+    return result
+
+
+def _plan_rows(rows, key_columns, journal, checks, visits, is_last, sizes):
+    """Settle journaled and invalid rows; return the rest as UploadTasks.
+
+    Returns (results, keys, tasks, failed_visits): ``results`` holds the
+    outcome of every row already settled and None elsewhere, ``keys`` the
+    journal key of each row to upload. See _drive_rows for the arguments.
+    """
+    results = [None] * len(rows)
+    done_keys = journal.successful_keys() if journal is not None else set()
+    errors = checks["error"].to_numpy() if checks is not None else None
+    keys = [None] * len(rows)
+    tasks = []
+    failed_visits = set()
+    done_rows = invalid_rows = 0
+    for position, row in enumerate(rows):
+        key = row_key(row, key_columns) if journal is not None else None
+        visit = visits[position] if visits is not None else None
+        if key in done_keys:
+            results[position] = {"upload_status": "Success", "error": None}
+            done_rows += 1
+        elif errors is not None and errors[position] is not None:
+            result = {"upload_status": "Failed", "error": errors[position]}
+            if journal is not None:
+                journal.record(key, result)
+            results[position] = result
+            failed_visits.add(visit)
+            invalid_rows += 1
+        else:
+            keys[position] = key
+            tasks.append(
+                UploadTask(
+                    position,
+                    visit,
+                    bool(is_last[position]) if is_last is not None else False,
+                    int(sizes[position]) if sizes is not None else 0,
+                )
             )
-    except Exception as ex:
-        return str(ex)
-    return None
+    if invalid_rows:
+        logger.info(f"{invalid_rows} rows failed validation and will not be uploaded")
+    if done_keys:
+        logger.info(
+            f"Resuming upload: {done_rows} rows already "
+            f"uploaded, {len(tasks)} rows remaining"
+        )
+
+    return results, keys, tasks, failed_visits
+
+
+def _drive_rows(
+    rows,
+    upload_row,
+    key_columns,
+    workers=1,
+    journal=None,
+    checks=None,
+    visits=None,
+    is_last=None,
+    sizes=None,
+    prefetcher=None,
+    files_of=None,
+):
+    """Run upload_row(index, row) over every row record and collect outcomes.
+
+    Each outcome is a dict with ``upload_status`` and ``error``; they come
+    back in the order of rows regardless of ``workers``. Rows are handed to
+    a VisitScheduler: larger ``sizes`` go first, and a row marked
+    ``is_last`` is only uploaded after every other row of its ``visits``
+    entry succeeded. With a journal, each outcome is recorded as soon as
+    its row finishes, and rows the journal already holds as successful are
+    not uploaded again. Rows that ``checks`` (from validate_upload_rows)
+    marks invalid fail with its error and never reach upload_row. A
+    ChecksumPrefetcher is started on ``files_of(row)`` for every row to be
+    uploaded, in the scheduler's dispatch order; files of rows that end up
+    held back are discarded from it.
+    """
+    results, keys, tasks, failed_visits = _plan_rows(
+        rows, key_columns, journal, checks, visits, is_last, sizes
+    )
+    scheduler = VisitScheduler(workers)
+    planned, started = set(), set()
+    if prefetcher is not None:
+        order = scheduler.order(tasks, failed_visits)
+        planned = {task.position for task in order}
+        prefetcher.start(
+            path for task in order for path in files_of(rows[task.position])
+        )
+
+    def execute(task):
+        started.add(task.position)
+        row = rows[task.position]
+        return upload_row(row.index, row)
+
+    scheduled = scheduler.run(tasks, execute, failed_visits)
+    for position, result in tqdm(scheduled, total=len(tasks)):
+        if position in planned and position not in started:
+            # Held back after its visit failed: its files will not be asked for.
+            prefetcher.discard(files_of(rows[position]))
+        if journal is not None:
+            journal.record(keys[position], result)
+        results[position] = result
+    return results
+
+
+def _close_on_exit(cleanup, resource):
+    # Resources configured off by the caller are None.
+    if resource is not None:
+        cleanup.callback(resource.close)
+
+
+def _log_prefetch_stats(prefetcher):
+    stats = prefetcher.stats()
+    logger.info(
+        f"Checksum prefetch: {stats['hits']} prefetched, {stats['misses']} "
+        f"hashed inline, {stats['mean_ready']:.1f} of {stats['lookahead']} "
+        "ready on average when asked for"
+    )
+
+
+def _pool_sizes(kwargs):
+    """The connection limits the caller set for each pool of hosts."""
+    return {
+        pool: int(kwargs[key])
+        for pool, key in ((API, "api_pool_size"), (S3, "s3_pool_size"))
+        if kwargs.get(key) is not None
+    }
+
+
+def _configure_pools(kwargs):
+    # Per-thread connection limits for each host, when the caller sets them.
+    for pool, size in _pool_sizes(kwargs).items():
+        transport.configure(pool, size)
+
+
+def _log_http_stats():
+    for pool, stats in transport.stats().items():
+        logger.info(
+            f"{pool} connections: {stats['requests']} requests, "
+            f"{stats['connections']} new connections, {stats['reused']} reused"
+        )
+    stats = retry_policy.stats()
+    logger.info(
+        f"Retries: {stats['retries']} sent, {stats['gave_up']} requests gave up, "
+        f"{stats['budget_remaining']} left in this run's budget"
+    )
+    for endpoint, circuit in stats["circuits"].items():
+        if circuit["state"] != "closed":
+            logger.warning(f"Circuit for {endpoint} is {circuit['state']}")
+
+
+def _content_key(deduplicator, files):
+    """The checksums of a row's (file, key) pairs, or None if any was not hashed."""
+    checksums = [deduplicator.known(file) for file, _ in files]
+    if not checksums or None in checksums:
+        return None
+    return tuple(sorted(checksums))
+
+
+def _log_duplicates(duplicate_of, put_ledger):
+    duplicates = int((~duplicate_of.isna()).sum())
+    if duplicates or put_ledger.skipped:
+        logger.info(
+            f"{duplicates} rows have the same file contents as an earlier row "
+            f"(see duplicate_of); {put_ledger.skipped} repeated S3 uploads skipped"
+        )
+
+
+def _results_frame(df: pd.DataFrame, results, duplicate_of=None) -> pd.DataFrame:
+    """The transformed rows with each row's upload_status and error added.
+
+    Internal columns (INTERNAL_COLUMNS) are dropped and the rows keep df's
+    index. ``duplicate_of`` holds, for a row whose file contents match an
+    earlier row's, the position of that earlier row in the returned frame
+    (for ``.iloc``, not a label).
+    """
+    frame = df.drop(columns=[col for col in INTERNAL_COLUMNS if col in df.columns])
+    frame = frame.assign(
+        upload_status=[result["upload_status"] for result in results],
+        error=[result["error"] for result in results],
+    )
+    if duplicate_of is not None:
+        frame["duplicate_of"] = duplicate_of
+    return frame
+
+
+def _output_files(row, score_type: str, file_index):
+    """(file, key) for each output file uploaded with a processed-upload row."""
+    if score_type == "reviewer":
+        return []
+    recording_val = getattr(row, "recording", None)
+    filename = (
+        os.path.basename(recording_val).split(".")[0]
+        if isinstance(recording_val, str) and recording_val
+        else None
+    )
+    found = []
+    for file in file_index.find(filename) if filename else ():
+        key, error = get_last_n_directories(file, n=2)
+        if not error:
+            found.append((file, key))
+    return found
+
+
+def _processed_payload(
+    u, index, files, score_type: str, multipart_threshold, multipart_part_size
+) -> dict:
+    """Hash a processed-upload row's files and build its metadata payload."""
+    entries = []
+    for file, key in files:
+        checksum = u.calculate_file_checksum(file)
+        file_entry = {
+            "index": index,
+            "recording": file,
+            "key": key,
+            "checksum": checksum,
+        }
+        multipart = multipart_request(file, multipart_threshold, multipart_part_size)
+        if multipart:
+            file_entry["multipart"] = multipart
+        entries.append(file_entry)
+    return u.generate_processed_payload(entries, score_type=score_type)
 
 
 @measure
 def upload(api_key: str, csv_path: str, **kwargs):
 
     force_upload = kwargs.get("force_upload", False)
-    csv = MetadataValidation(csv_path=csv_path, force_upload=force_upload)
+    csv = MetadataValidation(
+        csv_path=csv_path,
+        force_upload=force_upload,
+        chunksize=kwargs.get("chunksize"),
+        spill_dir=kwargs.get("spill_dir"),
+        csv_engine=kwargs.get("csv_engine"),
+    )
     if csv.load_and_validate():
         logger.info(f'{datetime.now().strftime("%H:%M:%S")}: csv check passed')
         csv.create_final_csv()
@@ -89,6 +421,8 @@ def upload(api_key: str, csv_path: str, **kwargs):
         headers = wc.get_headers()
         headers["Authorization"] = f"token {api_key}"
         logger.info(f'{datetime.now().strftime("%H:%M:%S")}: beginning upload')
+        _configure_pools(kwargs)
+        retry_policy.start_run()
 
         # Archive the source metadata CSV and open a tracking record.
         archive_record_id = archive_metadata_csv(
@@ -99,65 +433,63 @@ def upload(api_key: str, csv_path: str, **kwargs):
             env=kwargs.get("env"),
         )
 
-        results = []
-        for index, row in tqdm(
-            csv.transformed_df.iterrows(), total=csv.transformed_df.shape[0]
-        ):
-            u = UploadUtils(row)
-            valid, err = u.validate_row()
-            result_row = row.to_dict()
-            if valid:
-                payload = u.generate_payload()
-                res = u.post(api_key, url, headers, payload)
-                if res.get("upload_status") == "Success":
-                    result_row["upload_status"] = "Success"
-                    result_row["error"] = None
-
-                    # Handle S3 upload if presigned URL is provided
-                    presigned = res.get("response", {}).get("presigned")
-                    if presigned:
-                        try:
-                            content_type, _ = _MIME_TYPES.guess_type(
-                                payload.get("filename")
-                            )
-                            if not content_type:
-                                content_type = "application/octet-stream"
-                            with open(row.file_path, "rb") as f:
-                                session = build_retry_session()
-                                response = session.put(
-                                    presigned,
-                                    data=f,
-                                    headers={
-                                        "x-amz-checksum-sha256": payload.get(
-                                            "checksum"
-                                        ),
-                                        "x-amz-sdk-checksum-algorithm": "SHA256",
-                                        "Content-Type": content_type,
-                                    },
-                                    timeout=(10, 300),
-                                )
-                            if response.status_code == 200:
-                                result_row["upload_status"] = "Success"
-                            else:
-                                result_row["upload_status"] = "Failed"
-                                result_row["error"] = (
-                                    f"S3 upload failed with status code {response.status_code}: {response.text}"
-                                )
-                        except Exception as ex:
-                            result_row["upload_status"] = "Failed"
-                            result_row["error"] = str(ex)
-                    else:
-                        result_row["upload_status"] = "Failed"
-                        result_row["error"] = (
-                            "Collect recording upload URL not received"
-                        )
-                else:
-                    result_row["upload_status"] = "Failed"
-                    result_row["error"] = res.get("error")
-            else:
-                result_row["upload_status"] = "Failed"
-                result_row["error"] = f"{err}"
-            results.append(result_row)
+        # Release the run's threads and files even if the upload raises.
+        with ExitStack() as cleanup:
+            checksum_cache = ChecksumCache.from_kwargs(kwargs)
+            _close_on_exit(cleanup, checksum_cache)
+            deduplicator = FileDeduplicator(sha256_base64, checksum_cache)
+            prefetcher = ChecksumPrefetcher.from_kwargs(kwargs, deduplicator.checksum)
+            _close_on_exit(cleanup, prefetcher)
+            put_ledger = PutLedger()
+            journal = UploadJournal.from_kwargs(csv_path, kwargs)
+            _close_on_exit(cleanup, journal)
+            checks = validate_upload_rows(csv.transformed_df)
+            file_sizes = checks["file_size"]
+            results = _drive_rows(
+                DataRow.from_frame(csv.transformed_df),
+                lambda index, row: _upload_data_row(
+                    row,
+                    api_key,
+                    url,
+                    headers,
+                    prefetcher or deduplicator,
+                    multipart_threshold=kwargs.get(
+                        "multipart_threshold", MULTIPART_THRESHOLD
+                    ),
+                    multipart_part_size=kwargs.get(
+                        "multipart_part_size", MULTIPART_PART_SIZE
+                    ),
+                    file_size=int(file_sizes.at[index]),
+                    put_ledger=put_ledger,
+                ),
+                DATA_ROW_KEY_COLUMNS,
+                workers=max(1, int(kwargs.get("workers", 1))),
+                journal=journal,
+                checks=checks,
+                visits=csv.transformed_df.groupby(
+                    csv.VISIT_GROUPING_COLS, dropna=False, sort=False, observed=True
+                )
+                .ngroup()
+                .to_numpy(),
+                is_last=csv.transformed_df["is_last_recording"].to_numpy(),
+                sizes=file_sizes.fillna(0).to_numpy(),
+                prefetcher=prefetcher,
+                files_of=lambda row: [row.file_path],
+            )
+            duplicate_of = duplicate_positions(
+                [
+                    deduplicator.known(path)
+                    for path in csv.transformed_df["file_path"].astype(object)
+                ]
+            )
+            _log_duplicates(duplicate_of, put_ledger)
+
+            logger.info(
+                f"S3 send rate at end of run: {s3_rate_controller.rate:.1f} requests/s"
+            )
+            _log_http_stats()
+            if prefetcher is not None:
+                _log_prefetch_stats(prefetcher)
 
         successful_rows = sum(1 for r in results if r.get("upload_status") == "Success")
         finalize_metadata_csv(
@@ -169,7 +501,7 @@ def upload(api_key: str, csv_path: str, **kwargs):
             env=kwargs.get("env"),
         )
 
-        results_df = pd.DataFrame(results)
+        results_df = _results_frame(csv.transformed_df, results, duplicate_of)
         return results_df
     else:
         logger.error(f'{datetime.now().strftime("%H:%M:%S")}: csv check failed')
@@ -189,7 +521,12 @@ def processed_upload(api_key: str, csv_path: str, output_path: str, **kwargs):
 
     force_upload = kwargs.get("force_upload", False)
     csv = ProcessedMetadataValidation(
-        csv_path=csv_path, force_upload=force_upload, score_type=score_type
+        csv_path=csv_path,
+        force_upload=force_upload,
+        score_type=score_type,
+        chunksize=kwargs.get("chunksize"),
+        spill_dir=kwargs.get("spill_dir"),
+        csv_engine=kwargs.get("csv_engine"),
     )
     if csv.load_and_validate():
         logger.info(f'{datetime.now().strftime("%H:%M:%S")}: csv check passed')
@@ -200,6 +537,8 @@ def processed_upload(api_key: str, csv_path: str, output_path: str, **kwargs):
         headers = wc.get_headers()
         headers["Authorization"] = f"token {api_key}"
         logger.info(f'{datetime.now().strftime("%H:%M:%S")}: beginning upload')
+        _configure_pools(kwargs)
+        retry_policy.start_run()
 
         # Archive the source processed-data metadata CSV and open a tracking record.
         archive_record_id = archive_metadata_csv(
@@ -210,81 +549,90 @@ def processed_upload(api_key: str, csv_path: str, output_path: str, **kwargs):
             env=kwargs.get("env"),
         )
 
-        results = []
-        # Throttle S3 uploads: pause 3s each time the running total of files
-        # sent to S3 crosses another 100, to avoid overwhelming the connection.
-        S3_SLEEP_EVERY = 100
-        S3_SLEEP_SECONDS = 3
-        s3_uploaded_total = 0
-        next_sleep_threshold = S3_SLEEP_EVERY
-        for index, row in tqdm(
-            csv.transformed_df.iterrows(), total=csv.transformed_df.shape[0]
-        ):
-            u = UploadUtils(row)
-            valid, err = u.validate_processed_data_row()
-            result_row = row.to_dict()
-            if valid:
-                files = []
-                if score_type != "reviewer":
-                    recording_val = getattr(row, "recording", None)
-                    filename = (
-                        os.path.basename(recording_val).split(".")[0]
-                        if recording_val
-                        else None
-                    )
-                    for file in (
-                        find_files_with_pattern(output_path, filename)
-                        if filename
-                        else []
-                    ):
-                        key, error = get_last_n_directories(file, n=2)
-                        if error:
-                            continue
-                        checksum = u.calculate_file_checksum(file)
-                        files.append(
-                            {
-                                "index": index,
-                                "recording": file,
-                                "key": key,
-                                "checksum": checksum,
-                            }
-                        )
-                payload = u.generate_processed_payload(files, score_type=score_type)
+        # Release the run's threads and files even if the upload raises.
+        with ExitStack() as cleanup:
+            checksum_cache = ChecksumCache.from_kwargs(kwargs)
+            _close_on_exit(cleanup, checksum_cache)
+            deduplicator = FileDeduplicator(sha256_base64, checksum_cache)
+            prefetcher = ChecksumPrefetcher.from_kwargs(kwargs, deduplicator.checksum)
+            _close_on_exit(cleanup, prefetcher)
+            put_ledger = PutLedger()
+            journal = UploadJournal.from_kwargs(csv_path, kwargs)
+            _close_on_exit(cleanup, journal)
+            multipart_threshold = kwargs.get("multipart_threshold", MULTIPART_THRESHOLD)
+            multipart_part_size = kwargs.get("multipart_part_size", MULTIPART_PART_SIZE)
+            # Walk output_path once; every row's file lookup is answered from it.
+            file_index = (
+                FilenameIndex(output_path) if score_type != "reviewer" else None
+            )
+            # One PUT pool for the whole run, fed by every row.
+            s3_executor = BoundedExecutor(kwargs.get("s3_workers", S3_WORKERS))
+            cleanup.callback(s3_executor.shutdown)
+
+            def output_files(row):
+                return _output_files(row, score_type, file_index)
+
+            def upload_row(index, row):
+                u = UploadUtils(row, checksum_cache=prefetcher or deduplicator)
+                result = {"upload_status": None, "error": None}
+                payload = _processed_payload(
+                    u,
+                    index,
+                    output_files(row),
+                    score_type,
+                    multipart_threshold,
+                    multipart_part_size,
+                )
                 res = u.post(api_key, url, headers, payload)
                 if res.get("upload_status") == "Success":
-                    result_row["upload_status"] = "Success"
-                    result_row["error"] = None
+                    result["upload_status"] = "Success"
+                    result["error"] = None
 
                     # Upload every file for this recording concurrently. All
                     # presigned URLs in this response share one short expiry
                     # window, so uploading them sequentially risks the later
-                    # files expiring (403). A thread pool sized to the CPU
-                    # count keeps them within the window (I/O-bound work).
+                    # files expiring (403). The run's bounded S3 pool starts the
+                    # batch promptly and keeps it within the window.
                     files_to_upload = res.get("response", [])
-                    s3_errors = []
-                    if files_to_upload:
-                        max_workers = min(len(files_to_upload), os.cpu_count() or 1)
-                        with ThreadPoolExecutor(max_workers=max_workers) as executor:
-                            for error in executor.map(
-                                _put_file_to_s3, files_to_upload
-                            ):
-                                if error:
-                                    s3_errors.append(error)
-                        # Pause after every 100 files uploaded to S3.
-                        s3_uploaded_total += len(files_to_upload)
-                        while s3_uploaded_total >= next_sleep_threshold:
-                            time.sleep(S3_SLEEP_SECONDS)
-                            next_sleep_threshold += S3_SLEEP_EVERY
+                    s3_errors = [
+                        error
+                        for error in s3_executor.run_batch(
+                            lambda file: _put_file_to_s3(file, put_ledger),
+                            files_to_upload,
+                        )
+                        if error
+                    ]
                     if s3_errors:
-                        result_row["upload_status"] = "Failed"
-                        result_row["error"] = "\n".join(s3_errors)
+                        result["upload_status"] = "Failed"
+                        result["error"] = "\n".join(s3_errors)
                 else:
-                    result_row["upload_status"] = "Failed"
-                    result_row["error"] = res.get("error")
-            else:
-                result_row["upload_status"] = "Failed"
-                result_row["error"] = f"{err}"
-            results.append(result_row)
+                    result["upload_status"] = "Failed"
+                    result["error"] = res.get("error")
+                return result
+
+            rows = ProcessedRow.from_frame(csv.transformed_df)
+            results = _drive_rows(
+                rows,
+                upload_row,
+                PROCESSED_ROW_KEY_COLUMNS,
+                workers=max(1, int(kwargs.get("workers", 1))),
+                journal=journal,
+                checks=validate_upload_rows(csv.transformed_df, check_files=False),
+                prefetcher=prefetcher,
+                files_of=lambda row: [file for file, _ in output_files(row)],
+            )
+            # A row duplicates another when all of its output files match.
+            duplicate_of = duplicate_positions(
+                [_content_key(deduplicator, output_files(row)) for row in rows]
+            )
+            _log_duplicates(duplicate_of, put_ledger)
+            if prefetcher is not None:
+                _log_prefetch_stats(prefetcher)
+
+            logger.info(
+                f"S3 send rate at end of run: {s3_rate_controller.rate:.1f} requests/s"
+            )
+            _log_http_stats()
 
         successful_rows = sum(1 for r in results if r.get("upload_status") == "Success")
         finalize_metadata_csv(
@@ -296,7 +644,7 @@ def processed_upload(api_key: str, csv_path: str, output_path: str, **kwargs):
             env=kwargs.get("env"),
         )
 
-        results_df = pd.DataFrame(results)
+        results_df = _results_frame(csv.transformed_df, results, duplicate_of)
         return results_df
     else:
         logger.error(f'{datetime.now().strftime("%H:%M:%S")}: csv check failed')
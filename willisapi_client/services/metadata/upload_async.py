@@ -0,0 +1,427 @@
+import asyncio
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+from tqdm import tqdm
+
+from willisapi_client.willisapi_client import WillisapiClient
+from willisapi_client.logging_setup import logger as logger
+from willisapi_client.services.async_transport import AsyncClient, DEFAULT_CONCURRENCY
+from willisapi_client.services.retry import retry_policy
+from willisapi_client.services.metadata.utils import (
+    MetadataValidation,
+    ProcessedMetadataValidation,
+    UploadUtils,
+    FilenameIndex,
+    sha256_base64,
+    validate_upload_rows,
+)
+from willisapi_client.services.metadata.checksum_cache import ChecksumCache
+from willisapi_client.services.metadata.journal import (
+    DATA_ROW_KEY_COLUMNS,
+    PROCESSED_ROW_KEY_COLUMNS,
+    UploadJournal,
+)
+from willisapi_client.services.metadata.dedupe import (
+    FileDeduplicator,
+    PutLedger,
+    duplicate_positions,
+)
+from willisapi_client.services.metadata.records import DataRow, ProcessedRow
+from willisapi_client.services.metadata.rate_control import s3_rate_controller
+from willisapi_client.services.metadata.multipart import (
+    MULTIPART_PART_SIZE,
+    MULTIPART_THRESHOLD,
+    multipart_request,
+    upload_multipart_async,
+)
+from willisapi_client.services.metadata.scheduler import VisitScheduler
+from willisapi_client.services.metadata.archive import (
+    archive_metadata_csv,
+    finalize_metadata_csv,
+)
+from willisapi_client.services.metadata.upload import (
+    VALID_SCORE_TYPES,
+    _configure_pools,
+    _content_key,
+    _log_duplicates,
+    _output_files,
+    _plan_rows,
+    _pool_sizes,
+    _processed_payload,
+    _results_frame,
+    _s3_headers,
+)
+
+# Rows in flight at once, unless the caller passes ``concurrency``.
+ROW_CONCURRENCY = 8
+
+
+async def _post(
+    client: AsyncClient, url: str, headers: Dict[str, str], payload: Dict[str, Any]
+) -> Dict[str, Any]:
+    """UploadUtils.post over an AsyncClient; returns the same dict."""
+    try:
+        response = await client.request("POST", url, headers=headers, json=payload)
+        res_json = response.json()
+    except Exception as ex:
+        return {"upload_status": "Failed", "error": str(ex), "response": None}
+    if response.status_code not in [200, 201]:
+        return {"upload_status": "Failed", "error": res_json, "response": None}
+    return {"upload_status": "Success", "response": res_json, "error": None}
+
+
+async def _put_file(
+    client: AsyncClient,
+    presigned: str,
+    file_path: str,
+    name: str,
+    checksum: str,
+    put_ledger: PutLedger,
+    describe: str = "",
+) -> Optional[str]:
+    """Stream file_path to a presigned S3 URL; return an error string or None.
+
+    ``describe`` is appended to the status code in error messages.
+    """
+
+    async def put():
+        try:
+            response = await client.put_file(
+                presigned,
+                file_path,
+                headers=_s3_headers(name, checksum),
+                rate_controller=s3_rate_controller,
+            )
+        except Exception as ex:
+            return str(ex)
+        if response.status_code != 200:
+            return (
+                f"S3 upload failed with status code {response.status_code}"
+                f"{describe}: {response.text}"
+            )
+        return None
+
+    if not checksum:
+        return await put()
+    return await put_ledger.put_once_async(presigned, checksum, put)
+
+
+async def _put_file_to_s3(client: AsyncClient, file_presigned: dict, put_ledger):
+    """_put_file_to_s3 over an AsyncClient."""
+    recording = file_presigned.get("recording")
+    if file_presigned.get("multipart"):
+        return await upload_multipart_async(
+            client, recording, file_presigned["multipart"]
+        )
+    return await _put_file(
+        client,
+        file_presigned.get("presigned"),
+        recording,
+        recording,
+        file_presigned.get("checksum"),
+        put_ledger,
+        f" for file {recording}",
+    )
+
+
+async def _upload_data_row(
+    client: AsyncClient,
+    row,
+    url: str,
+    headers: dict,
+    checksum_cache=None,
+    multipart_threshold: int = MULTIPART_THRESHOLD,
+    multipart_part_size: int = MULTIPART_PART_SIZE,
+    file_size: int = None,
+    put_ledger: PutLedger = None,
+) -> dict:
+    """_upload_data_row over an AsyncClient; hashing runs in a worker thread."""
+    u = UploadUtils(row, checksum_cache=checksum_cache)
+    payload = await asyncio.to_thread(u.generate_payload)
+    multipart = multipart_request(
+        row.file_path, multipart_threshold, multipart_part_size, file_size
+    )
+    if multipart:
+        payload["multipart"] = multipart
+    res = await _post(client, url, headers, payload)
+    if res.get("upload_status") != "Success":
+        return {"upload_status": "Failed", "error": res.get("error")}
+
+    presigned = res.get("response", {}).get("presigned")
+    multipart_urls = res.get("response", {}).get("multipart")
+    if multipart_urls:
+        error = await upload_multipart_async(client, row.file_path, multipart_urls)
+    elif presigned:
+        error = await _put_file(
+            client,
+            presigned,
+            row.file_path,
+            payload.get("filename"),
+            payload.get("checksum"),
+            put_ledger,
+        )
+    else:
+        error = "Collect recording upload URL not received"
+    if error:
+        return {"upload_status": "Failed", "error": error}
+    return {"upload_status": "Success", "error": None}
+
+
+async def _drive_rows(
+    rows,
+    upload_row,
+    key_columns,
+    workers=ROW_CONCURRENCY,
+    journal=None,
+    checks=None,
+    visits=None,
+    is_last=None,
+    sizes=None,
+):
+    """_drive_rows for a coroutine upload_row: up to ``workers`` rows at a time.
+
+    Journal lookups and writes run in a worker thread.
+    """
+    results, keys, tasks, failed_visits = await asyncio.to_thread(
+        _plan_rows, rows, key_columns, journal, checks, visits, is_last, sizes
+    )
+
+    async def execute(task):
+        row = rows[task.position]
+        return await upload_row(row.index, row)
+
+    progress = tqdm(total=len(tasks))
+    scheduled = VisitScheduler(workers).run_async(tasks, execute, failed_visits)
+    async for position, result in scheduled:
+        if journal is not None:
+            await asyncio.to_thread(journal.record, keys[position], result)
+        results[position] = result
+        progress.update()
+    progress.close()
+    return results
+
+
+def _close_run(checksum_cache, journal):
+    if checksum_cache is not None:
+        checksum_cache.close()
+    if journal is not None:
+        journal.close()
+
+
+def _finish(api_key, kwargs, archive_record_id, results):
+    successful_rows = sum(1 for r in results if r.get("upload_status") == "Success")
+    finalize_metadata_csv(
+        api_key,
+        archive_record_id,
+        "successful",
+        successful_rows,
+        len(results) - successful_rows,
+        env=kwargs.get("env"),
+    )
+
+
+async def upload_async(api_key: str, csv_path: str, **kwargs):
+    """Coroutine version of upload(); returns the same DataFrame (or None).
+
+    Takes upload()'s keyword arguments, plus ``concurrency`` (rows in
+    flight, default 8) and ``request_concurrency`` (HTTP requests in flight,
+    default 16); ``api_pool_size`` and ``s3_pool_size`` cap the requests in
+    flight to each pool of hosts. Files are streamed to S3 through the
+    shared S3 rate controller; validation, hashing, the checksum cache, the
+    journal and the CSV archive run in worker threads so the event loop is
+    never blocked.
+    """
+    csv = MetadataValidation(
+        csv_path=csv_path,
+        force_upload=kwargs.get("force_upload", False),
+        chunksize=kwargs.get("chunksize"),
+        spill_dir=kwargs.get("spill_dir"),
+        csv_engine=kwargs.get("csv_engine"),
+    )
+    if not await asyncio.to_thread(csv.load_and_validate):
+        logger.error(f'{datetime.now().strftime("%H:%M:%S")}: csv check failed')
+        logger.error(csv.errors)
+        return None
+    logger.info(f'{datetime.now().strftime("%H:%M:%S")}: csv check passed')
+    await asyncio.to_thread(csv.create_final_csv)
+
+    wc = WillisapiClient(env=kwargs.get("env"))
+    url = wc.get_upload_url()
+    headers = wc.get_headers()
+    headers["Authorization"] = f"token {api_key}"
+    logger.info(f'{datetime.now().strftime("%H:%M:%S")}: beginning upload')
+    _configure_pools(kwargs)
+    retry_policy.start_run()
+
+    df = csv.transformed_df
+    archive_record_id = await asyncio.to_thread(
+        archive_metadata_csv,
+        api_key,
+        csv_path,
+        int(df.shape[0]),
+        upload_type="data",
+        env=kwargs.get("env"),
+    )
+    checksum_cache = await asyncio.to_thread(ChecksumCache.from_kwargs, kwargs)
+    deduplicator = FileDeduplicator(sha256_base64, checksum_cache)
+    put_ledger = PutLedger()
+    journal = await asyncio.to_thread(UploadJournal.from_kwargs, csv_path, kwargs)
+    try:
+        checks = await asyncio.to_thread(validate_upload_rows, df)
+        file_sizes = checks["file_size"]
+        multipart_threshold = kwargs.get("multipart_threshold", MULTIPART_THRESHOLD)
+        multipart_part_size = kwargs.get("multipart_part_size", MULTIPART_PART_SIZE)
+
+        async with AsyncClient(
+            kwargs.get("request_concurrency", DEFAULT_CONCURRENCY),
+            pool_sizes=_pool_sizes(kwargs),
+        ) as client:
+            results = await _drive_rows(
+                DataRow.from_frame(df),
+                lambda index, row: _upload_data_row(
+                    client,
+                    row,
+                    url,
+                    headers,
+                    deduplicator,
+                    multipart_threshold,
+                    multipart_part_size,
+                    file_size=int(file_sizes.at[index]),
+                    put_ledger=put_ledger,
+                ),
+                DATA_ROW_KEY_COLUMNS,
+                workers=max(1, int(kwargs.get("concurrency", ROW_CONCURRENCY))),
+                journal=journal,
+                checks=checks,
+                visits=df.groupby(
+                    csv.VISIT_GROUPING_COLS, dropna=False, sort=False, observed=True
+                )
+                .ngroup()
+                .to_numpy(),
+                is_last=df["is_last_recording"].to_numpy(),
+                sizes=file_sizes.fillna(0).to_numpy(),
+            )
+        duplicate_of = duplicate_positions(
+            [deduplicator.known(path) for path in df["file_path"].astype(object)]
+        )
+        _log_duplicates(duplicate_of, put_ledger)
+    finally:
+        await asyncio.to_thread(_close_run, checksum_cache, journal)
+    await asyncio.to_thread(_finish, api_key, kwargs, archive_record_id, results)
+    return _results_frame(df, results, duplicate_of)
+
+
+async def processed_upload_async(
+    api_key: str, csv_path: str, output_path: str, **kwargs
+):
+    """Coroutine version of processed_upload(); returns the same DataFrame (or None).
+
+    Takes the same keyword arguments as upload_async. A row's output files
+    are streamed to S3 concurrently, within ``request_concurrency``.
+    """
+    score_type = kwargs.get("score_type", "rater")
+    if score_type not in VALID_SCORE_TYPES:
+        logger.error(
+            f"Invalid score_type '{score_type}'. "
+            f"Allowed values: {', '.join(VALID_SCORE_TYPES)}"
+        )
+        return None
+
+    csv = ProcessedMetadataValidation(
+        csv_path=csv_path,
+        force_upload=kwargs.get("force_upload", False),
+        score_type=score_type,
+        chunksize=kwargs.get("chunksize"),
+        spill_dir=kwargs.get("spill_dir"),
+        csv_engine=kwargs.get("csv_engine"),
+    )
+    if not await asyncio.to_thread(csv.load_and_validate):
+        logger.error(f'{datetime.now().strftime("%H:%M:%S")}: csv check failed')
+        logger.error(csv.errors)
+        return None
+    logger.info(f'{datetime.now().strftime("%H:%M:%S")}: csv check passed')
+    await asyncio.to_thread(csv.create_final_csv)
+
+    wc = WillisapiClient(env=kwargs.get("env"))
+    url = wc.get_processed_upload_url()
+    headers = wc.get_headers()
+    headers["Authorization"] = f"token {api_key}"
+    logger.info(f'{datetime.now().strftime("%H:%M:%S")}: beginning upload')
+    _configure_pools(kwargs)
+    retry_policy.start_run()
+
+    df = csv.transformed_df
+    archive_record_id = await asyncio.to_thread(
+        archive_metadata_csv,
+        api_key,
+        csv_path,
+        int(df.shape[0]),
+        upload_type="processed_data",
+        env=kwargs.get("env"),
+    )
+    checksum_cache = await asyncio.to_thread(ChecksumCache.from_kwargs, kwargs)
+    deduplicator = FileDeduplicator(sha256_base64, checksum_cache)
+    put_ledger = PutLedger()
+    journal = await asyncio.to_thread(UploadJournal.from_kwargs, csv_path, kwargs)
+    try:
+        multipart_threshold = kwargs.get("multipart_threshold", MULTIPART_THRESHOLD)
+        multipart_part_size = kwargs.get("multipart_part_size", MULTIPART_PART_SIZE)
+        file_index = (
+            await asyncio.to_thread(FilenameIndex, output_path)
+            if score_type != "reviewer"
+            else None
+        )
+        rows = ProcessedRow.from_frame(df)
+
+        async with AsyncClient(
+            kwargs.get("request_concurrency", DEFAULT_CONCURRENCY),
+            pool_sizes=_pool_sizes(kwargs),
+        ) as client:
+
+            async def upload_row(index, row):
+                u = UploadUtils(row, checksum_cache=deduplicator)
+                payload = await asyncio.to_thread(
+                    _processed_payload,
+                    u,
+                    index,
+                    _output_files(row, score_type, file_index),
+                    score_type,
+                    multipart_threshold,
+                    multipart_part_size,
+                )
+                res = await _post(client, url, headers, payload)
+                if res.get("upload_status") != "Success":
+                    return {"upload_status": "Failed", "error": res.get("error")}
+                # All of a row's presigned URLs share one expiry window, so its
+                # files go up together.
+                errors = await asyncio.gather(
+                    *(
+                        _put_file_to_s3(client, file, put_ledger)
+                        for file in res.get("response", [])
+                    )
+                )
+                s3_errors = [error for error in errors if error]
+                if s3_errors:
+                    return {"upload_status": "Failed", "error": "\n".join(s3_errors)}
+                return {"upload_status": "Success", "error": None}
+
+            results = await _drive_rows(
+                rows,
+                upload_row,
+                PROCESSED_ROW_KEY_COLUMNS,
+                workers=max(1, int(kwargs.get("concurrency", ROW_CONCURRENCY))),
+                journal=journal,
+                checks=await asyncio.to_thread(validate_upload_rows, df, False),
+            )
+        duplicate_of = duplicate_positions(
+            [
+                _content_key(deduplicator, _output_files(row, score_type, file_index))
+                for row in rows
+            ]
+        )
+        _log_duplicates(duplicate_of, put_ledger)
+    finally:
+        await asyncio.to_thread(_close_run, checksum_cache, journal)
+    await asyncio.to_thread(_finish, api_key, kwargs, archive_record_id, results)
+    return _results_frame(df, results, duplicate_of)
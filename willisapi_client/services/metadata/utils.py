@@ -1,48 +1,43 @@
 import pandas as pd
 import numpy as np
-from typing import List, Dict, Any, Tuple
+from typing import List, Dict, Any, Tuple, Callable, Optional
 import json
+import mimetypes
+import gc
 import os
 import posixpath
 import hashlib
 import base64
+import bisect
 import requests
-from functools import lru_cache
-from requests.adapters import HTTPAdapter
-from urllib3.util.retry import Retry
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from urllib.parse import urlsplit
 from .language_choices import (
-    LANGUAGE_CHOICES,
+    LANGUAGE_CODES,
 )
+from .manifest import count_rows, manifest_format, read_arrow_manifest
+from .spill import SpillPartitions, estimate_partitions, partitions_for_rows
+from .timestamps import TimestampParser
 from dateutil import parser
+from willisapi_client.logging_setup import logger as logger
+from willisapi_client.services.transport import API, S3, transport
 
 ALLOWED_COA_NAMES = ["MADRS", "YMRS", "PHQ-9", "GAD-7", "HAM-D17", "HAMD17"]
+# Threads used to stat a manifest's file paths before an upload starts.
+STAT_WORKERS = 32
 
-@lru_cache(maxsize=None)
-def build_retry_session(total: int = 3, backoff_factor: float = 1) -> requests.Session:
-    """Return a requests Session that retries transient network failures.
+def build_retry_session(pool: str = S3) -> requests.Session:
+    """Return this thread's pooled, retrying Session for ``pool`` (S3 or API).
 
     Retries connection errors (e.g. ConnectionResetError / 'Connection reset
-    by peer') and 5xx gateway responses with exponential backoff. Applied to
-    both the metadata POST and the S3 PUT uploads so a momentary blip on a
-    single record no longer fails the whole upload for that row.
+    by peer') and throttling or 5xx gateway responses with jittered backoff,
+    so a momentary blip on a single record no longer fails the whole upload
+    for that row. Sessions are per thread; see
+    willisapi_client.services.transport and willisapi_client.services.retry.
     """
-    retry = Retry(
-        total=total,
-        connect=total,
-        read=total,
-        status=total,
-        backoff_factor=backoff_factor,
-        status_forcelist=[502, 503, 504],
-        allowed_methods=["PUT", "POST"],
-        raise_on_status=False,
-    )
-    # Increased pool size to accommodate concurrent ThreadPoolExecutor uploads
-    adapter = HTTPAdapter(max_retries=retry, pool_connections=100, pool_maxsize=100)
-    session = requests.Session()
-    session.mount("https://", adapter)
-    session.mount("http://", adapter)
-    return session
+    return transport.session(pool)
 
 COA_ITEM_COUNTS = {
     "MADRS": 10,
@@ -53,6 +48,332 @@ COA_ITEM_COUNTS = {
     "HAMD17": 17,
 }
 
+# The server signs presigned URLs with Content-Types guessed from Python's
+# built-in mimetypes table (on Linux), so the client must produce identical
+# guesses. A private MimeTypes instance holds only that built-in table —
+# the module-level mimetypes.guess_type() on Windows also reads the registry
+# (e.g. .csv -> application/vnd.ms-excel, .wav -> audio/wav), which makes the
+# PUT's Content-Type differ from the signed one and S3 reject the upload with
+# SignatureDoesNotMatch. Also register extensions the built-in table lacks,
+# mirroring the server.
+_MIME_TYPES = mimetypes.MimeTypes()
+_MIME_TYPES.add_type("application/vnd.apache.parquet", ".parquet")
+
+
+def s3_content_type(name: str) -> str:
+    """The Content-Type the server signs a presigned PUT of a file called name with."""
+    content_type, _ = _MIME_TYPES.guess_type(name)
+    if not content_type:
+        # Mirror the server's fallback — it signs the presigned URL with
+        # this Content-Type when the extension is unknown.
+        content_type = "application/octet-stream"
+    return content_type
+
+
+# Columns the validators add for the upload itself; they are left out of the
+# results returned to the caller.
+INTERNAL_COLUMNS = ("timestamp_iso",)
+
+# Read size for streaming checksums. Hashing reuses one buffer of this size,
+# so memory stays flat no matter how large the recording is.
+CHECKSUM_CHUNK_SIZE = 1024 * 1024
+
+
+def sha256_base64(file_path: str, chunk_size: int = CHECKSUM_CHUNK_SIZE) -> str:
+    """Return the base64-encoded SHA-256 of a file, read in fixed-size chunks."""
+    digest = hashlib.sha256()
+    buffer = bytearray(chunk_size)
+    view = memoryview(buffer)
+    with open(file_path, "rb", buffering=0) as f:
+        while True:
+            n = f.readinto(buffer)
+            if not n:
+                break
+            digest.update(view[:n])
+    return base64.b64encode(digest.digest()).decode("utf-8")
+
+
+# Pauses of the garbage collector in progress, and whether it was enabled
+# before the first of them.
+_gc_pause_lock = threading.Lock()
+_gc_pauses = 0
+_gc_was_enabled = False
+
+
+@contextmanager
+def _gc_paused():
+    """Pause the cyclic garbage collector while building many acyclic objects.
+
+    Millions of small score dicts otherwise trigger repeated full collections
+    that cost more than building the dicts themselves. The collector is
+    process-wide, so this pauses it for every thread; pauses may overlap
+    across threads, and the collector is restored to its previous state
+    (left off if the caller had disabled it) when the last one ends.
+    """
+    global _gc_pauses, _gc_was_enabled
+    with _gc_pause_lock:
+        if _gc_pauses == 0:
+            _gc_was_enabled = gc.isenabled()
+            gc.disable()
+        _gc_pauses += 1
+    try:
+        yield
+    finally:
+        with _gc_pause_lock:
+            _gc_pauses -= 1
+            if _gc_pauses == 0 and _gc_was_enabled:
+                gc.enable()
+
+
+_SECTION_IDS = [
+    (f"s{item_num:02d}", f"i{item_num:02d}")
+    for item_num in range(1, max(COA_ITEM_COUNTS.values()) + 1)
+]
+_NUMERIC_INFERRED = {"integer", "floating", "mixed-integer-float", "boolean", "empty"}
+
+
+def _build_scores(item_scores: List[Any], total_score: int) -> Dict[str, Any]:
+    """Assemble the actual_scores structure from per-item scores (None = missing)."""
+    return {
+        "sections": [
+            {
+                "section_id": section_id,
+                "section_notes": None,
+                "items": [{"item_id": item_id, "item_score": score}],
+            }
+            for (section_id, item_id), score in zip(_SECTION_IDS, item_scores)
+        ],
+        "total_score": total_score,
+        "total_severity": None,
+    }
+
+
+def _read_metadata_csv(
+    csv_path: str, dtypes: Dict[str, str], engine: str = None, chunksize: int = None
+):
+    """pd.read_csv() with the schema's categorical columns parsed as categories.
+
+    Column names are matched after stripping whitespace, as the validators
+    strip them after reading. Numeric columns are read untyped and given
+    their nullable dtype by validate_data_types(), so a bad value is
+    reported as a validation error instead of failing the read.
+    """
+    header = pd.read_csv(csv_path, nrows=0).columns
+    dtype = {
+        col: "category"
+        for col in header
+        if dtypes.get(str(col).strip()) == "category"
+    }
+    if engine == "pyarrow":
+        if chunksize:
+            # The pyarrow engine cannot read in chunks.
+            engine = None
+        else:
+            try:
+                import pyarrow  # noqa: F401
+            except ImportError:
+                logger.warning("pyarrow is not installed; reading CSV with the C engine")
+                engine = None
+    df = pd.read_csv(csv_path, dtype=dtype, engine=engine, chunksize=chunksize)
+    if engine == "pyarrow":
+        _null_strings(df)
+    return df
+
+
+# The strings read_csv's C engine reads as missing (its default na_values).
+CSV_NA_VALUES = frozenset(
+    [
+        "",
+        "#N/A",
+        "#N/A N/A",
+        "#NA",
+        "-1.#IND",
+        "-1.#QNAN",
+        "-NaN",
+        "-nan",
+        "1.#IND",
+        "1.#QNAN",
+        "<NA>",
+        "N/A",
+        "NA",
+        "NULL",
+        "NaN",
+        "None",
+        "n/a",
+        "nan",
+        "null",
+    ]
+)
+
+
+def _null_strings(df: pd.DataFrame):
+    """Make text the pyarrow engine kept as a string missing, as the C engine does.
+
+    pyarrow only reads nulls into numeric columns; in text and categorical
+    columns an empty cell comes back as "" (and "NA" as "NA").
+    """
+    for col in df.columns:
+        series = df[col]
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            missing = [c for c in series.cat.categories if c in CSV_NA_VALUES]
+            if missing:
+                df[col] = series.cat.remove_categories(missing)
+        elif series.dtype == object:
+            df[col] = series.mask(series.isin(CSV_NA_VALUES))
+
+
+def _read_manifest(validator, chunksize: int = None):
+    """Read validator.csv_path, a CSV, Parquet or Arrow IPC manifest.
+
+    Returns one DataFrame, or an iterator of DataFrames when chunksize is
+    set. Parquet and Arrow manifests skip CSV parsing altogether: only the
+    columns the validator uses are read, identifier columns arrive
+    dictionary-encoded as categoricals, and numbers keep their types.
+    """
+    if manifest_format(validator.csv_path) == "csv":
+        return _read_metadata_csv(
+            validator.csv_path, validator.DTYPES, validator.csv_engine, chunksize
+        )
+    categorical = [col for col, dtype in validator.DTYPES.items() if dtype == "category"]
+    return read_arrow_manifest(
+        validator.csv_path, validator.reads_column, categorical, chunksize
+    )
+
+
+def _as_category(series: pd.Series) -> pd.Series:
+    """Categorical with sorted categories, so grouping orders as it would on values."""
+    series = series.astype("category")
+    categories = series.cat.categories
+    if not categories.is_monotonic_increasing:
+        try:
+            series = series.cat.reorder_categories(categories.sort_values())
+        except TypeError:
+            # Mixed types that cannot be ordered; keep first-seen order.
+            pass
+    return series
+
+
+def _as_nullable(series: pd.Series, dtype: str) -> pd.Series:
+    """Cast a numeric column to its nullable schema dtype.
+
+    Int64 falls back to Float64 when the column holds non-integral values.
+    """
+    try:
+        return series.astype(dtype)
+    except (TypeError, ValueError):
+        return series.astype("Float64")
+
+
+def _apply_dtypes(
+    df: pd.DataFrame, dtypes: Dict[str, str], numeric_only: bool = False
+) -> pd.DataFrame:
+    """Give df's columns their schema dtypes, in place.
+
+    Numeric columns are only cast once they are numeric; categorical columns
+    are skipped when numeric_only is set.
+    """
+    for col, dtype in dtypes.items():
+        if col not in df.columns:
+            continue
+        if dtype == "category":
+            if not numeric_only:
+                df[col] = _as_category(df[col])
+        elif pd.api.types.is_numeric_dtype(df[col]):
+            df[col] = _as_nullable(df[col], dtype)
+    return df
+
+
+def _native(value):
+    """Return value as a JSON-ready Python scalar, with missing values as None."""
+    if isinstance(value, np.generic):
+        value = value.item()
+    if value is pd.NA or (isinstance(value, float) and value != value):
+        return None
+    return value
+
+
+def _records(df: pd.DataFrame) -> List[Dict[str, Any]]:
+    """df as a list of dicts of Python values, with missing values as None."""
+    # Column-wise tolist() boxes values to Python natives far faster than
+    # DataFrame.to_dict("records").
+    columns = list(df.columns)
+    values = []
+    for col in columns:
+        column = df[col].tolist()
+        missing = df[col].isna()
+        if missing.any():
+            column = [None if m else v for v, m in zip(column, missing.tolist())]
+        values.append(column)
+    return [dict(zip(columns, row)) for row in zip(*values)]
+
+
+def _invalid_coa_names(values: pd.Series) -> List[Any]:
+    return values[~values.isin(ALLOWED_COA_NAMES)].unique().tolist()
+
+
+def _invalid_coa_names_error(column: str, invalid_values: List[Any]) -> str:
+    return (
+        f"Invalid {column} values found: {invalid_values}. "
+        f"Allowed values are: {', '.join(ALLOWED_COA_NAMES)}"
+    )
+
+
+def _spill_csv_in_chunks(
+    validator,
+    header_checks: List[Callable[[], bool]],
+    chunk_checks: List[Callable[[], bool]],
+    coa_column: str,
+    key_columns: List[str],
+) -> Optional[SpillPartitions]:
+    """Read validator.csv_path chunk by chunk, validating and spilling each chunk.
+
+    Each chunk is placed on validator.df while the validator's own validate_*
+    methods run over it, so both load modes share one set of checks. A
+    message raised by several chunks is reported once, and invalid COA names
+    from every chunk are collected into a single message.
+
+    Returns the spill holding every row, partitioned on key_columns, or None
+    if the CSV could not be read or its header failed header_checks.
+    """
+    spill = None
+    invalid_coa = {}
+    try:
+        for chunk in _read_manifest(validator, chunksize=validator.chunksize):
+            chunk.columns = chunk.columns.str.strip()
+            _apply_dtypes(chunk, validator.DTYPES)
+            validator.df = chunk
+            if spill is None:
+                if not all([check() for check in header_checks]):
+                    return None
+                if manifest_format(validator.csv_path) == "csv":
+                    n_partitions = estimate_partitions(
+                        validator.csv_path, validator.chunksize
+                    )
+                else:
+                    n_partitions = partitions_for_rows(
+                        count_rows(validator.csv_path), validator.chunksize
+                    )
+                spill = SpillPartitions(key_columns, n_partitions, validator.spill_dir)
+            for check in chunk_checks:
+                check()
+            validator.df[coa_column] = validator.df[coa_column].str.strip().astype(
+                "category"
+            )
+            invalid_coa.update(dict.fromkeys(_invalid_coa_names(validator.df[coa_column])))
+            spill.add(validator.df)
+    except Exception as e:
+        if spill is not None:
+            spill.close()
+        validator.errors.append(f"Failed to load CSV: {str(e)}")
+        return None
+    finally:
+        validator.df = None
+
+    validator.errors = list(dict.fromkeys(validator.errors))
+    if invalid_coa:
+        validator.errors.append(_invalid_coa_names_error(coa_column, list(invalid_coa)))
+    return spill
+
 
 class MetadataValidation:
     REQUIRED_COLUMNS = [
@@ -71,22 +392,84 @@ class MetadataValidation:
 
     OPTIONAL_COLUMNS = ["rater_id", "age", "sex", "race", "language"]
 
+    # Repeated identifiers are held as categoricals, numbers as nullable types.
+    DTYPES = {
+        "study_id": "category",
+        "site_id": "category",
+        "participant_id": "category",
+        "visit_name": "category",
+        "visit_order": "Int64",
+        "coa_name": "category",
+        "coa_item_number": "Int64",
+        "coa_item_value": "Float64",
+        "file_path": "category",
+        "time_collected": "category",
+        "recording_order": "Int64",
+        "rater_id": "category",
+        "age": "Float64",
+        "sex": "category",
+        "race": "category",
+        "language": "category",
+    }
+
+    # One recording: the rows sharing all of these values.
+    RECORDING_GROUPING_COLS = [
+        "study_id",
+        "site_id",
+        "participant_id",
+        "visit_name",
+        "visit_order",
+        "coa_name",
+        "file_path",
+        "recording_order",
+    ]
+    ASSESSMENT_GROUPING_COLS = [
+        "study_id",
+        "site_id",
+        "participant_id",
+        "visit_name",
+        "coa_name",
+    ]
+    VISIT_GROUPING_COLS = [
+        "study_id",
+        "site_id",
+        "participant_id",
+        "visit_name",
+    ]
+
     def __init__(
         self,
         csv_path: str,
         force_upload: bool = False,
+        chunksize: int = None,
+        spill_dir: str = None,
+        csv_engine: str = None,
     ):
         """
         Initialize validator with CSV file path.
 
         Args:
             csv_path: Path to the CSV file
+            chunksize: If set, read the CSV this many rows at a time and spill
+                rows to disk grouped by recording, so peak memory follows
+                chunksize rather than the size of the file
+            spill_dir: Directory for spill files (default: system temp dir)
+            csv_engine: pd.read_csv engine; "pyarrow" is used if installed
         """
         self.csv_path = csv_path
         self.df = None
         self.errors = []
         self.transformed_df = None
         self.force_upload = force_upload
+        self.chunksize = chunksize
+        self.spill_dir = spill_dir
+        self.csv_engine = csv_engine
+        # (recordings, item_values) reduced while loading in chunks.
+        self._recordings = None
+
+    def reads_column(self, name: str) -> bool:
+        """Whether a Parquet/Arrow manifest column is read; others are skipped."""
+        return name in self.DTYPES
 
     def validate_columns(self) -> bool:
         """
@@ -148,6 +531,8 @@ class MetadataValidation:
                 self.errors.append("coa_item_value must be numeric")
                 valid = False
 
+        # Missing values stay <NA> instead of turning the column into objects.
+        _apply_dtypes(self.df, self.DTYPES, numeric_only=True)
         return valid
 
     def validate_coa_names(self) -> bool:
@@ -158,16 +543,12 @@ class MetadataValidation:
             bool: True if validation passes, False otherwise
         """
         # Convert to lowercase for comparison
-        self.df["coa_name"] = self.df["coa_name"].str.strip()
+        self.df["coa_name"] = self.df["coa_name"].str.strip().astype("category")
 
-        invalid_coa = self.df[~self.df["coa_name"].isin(ALLOWED_COA_NAMES)]
+        invalid_values = _invalid_coa_names(self.df["coa_name"])
 
-        if not invalid_coa.empty:
-            invalid_values = invalid_coa["coa_name"].unique().tolist()
-            self.errors.append(
-                f"Invalid coa_name values found: {invalid_values}. "
-                f"Allowed values are: {', '.join(ALLOWED_COA_NAMES)}"
-            )
+        if invalid_values:
+            self.errors.append(_invalid_coa_names_error("coa_name", invalid_values))
             return False
         return True
 
@@ -181,44 +562,51 @@ class MetadataValidation:
         Returns:
             bool: True if validation passes, False otherwise
         """
-        valid = True
-
-        # Define grouping columns that identify a unique recording
-        grouping_cols = [
-            "file_path",
-        ]
-
-        # Define columns that should be consistent within a recording
-        # (all columns except coa_item_number and coa_item_value)
+        errors = self._recording_consistency_errors(self.df)
+        self.errors.extend(message for _, message in errors)
+        return not errors
+
+    @staticmethod
+    def _recording_consistency_errors(df: pd.DataFrame) -> List[Tuple[Any, str]]:
+        """Return (file_path, message) for each inconsistency, in file_path order."""
+        # Columns that should be consistent within a recording (all columns
+        # except the grouping column, coa_item_number, coa_item_value and
+        # recording_order)
         metadata_cols = [
             col
-            for col in self.df.columns
-            if col not in ["coa_item_number", "coa_item_value", "recording_order"]
+            for col in df.columns
+            if col
+            not in ["file_path", "coa_item_number", "coa_item_value", "recording_order"]
         ]
-
-        # Group by recording identifier
-        for group_key, group_df in self.df.groupby(grouping_cols, dropna=False):
-            # For each metadata column, check if all values are the same
-            for col in metadata_cols:
-                if col in grouping_cols:
-                    continue  # Skip the grouping columns themselves
-
-                # Get unique non-null values for this column in the group
+        if not metadata_cols:
+            return []
+
+        # Count distinct non-null values per (recording, column) in a single
+        # groupby; only recordings that break the rule are looked at again to
+        # build their error messages. Sorted codes keep the errors in
+        # file_path order.
+        codes, file_paths = pd.factorize(
+            df["file_path"], sort=True, use_na_sentinel=False
+        )
+        counts = df.groupby(codes)[metadata_cols].nunique(dropna=True)
+        inconsistent = counts.gt(1)
+        if not inconsistent.values.any():
+            return []
+
+        errors = []
+        for code, flags in inconsistent[inconsistent.any(axis=1)].iterrows():
+            group_df = df[codes == code]
+            for col in flags.index[flags.values]:
                 unique_values = group_df[col].dropna().unique()
-
-                # Check if we have more than one unique value
-                if len(unique_values) > 1:
-                    valid = False
-                    # Create a readable identifier for the recording
-                    file_path = group_key[grouping_cols.index("file_path")]
-
-                    self.errors.append(
-                        f"Inconsistent values in column '{col}' for recording: {file_path}. "
+                errors.append(
+                    (
+                        file_paths[code],
+                        f"Inconsistent values in column '{col}' for recording: {file_paths[code]}. "
                         f"Found values: {list(unique_values)}. All metadata columns must be "
-                        f"identical within a single recording."
+                        f"identical within a single recording.",
                     )
-
-        return valid
+                )
+        return errors
 
     def load_and_validate(self) -> bool:
         """
@@ -227,15 +615,18 @@ class MetadataValidation:
         Returns:
             bool: True if all validations pass, False otherwise
         """
+        if self.chunksize:
+            return self._load_and_validate_chunked()
+
         try:
-            self.df = pd.read_csv(self.csv_path)
-            self.df = self.df.replace({np.nan: None})
+            self.df = _read_manifest(self)
         except Exception as e:
             self.errors.append(f"Failed to load CSV: {str(e)}")
             return False
 
         # Strip whitespace from column names
         self.df.columns = self.df.columns.str.strip()
+        _apply_dtypes(self.df, self.DTYPES)
 
         validations = [
             self.validate_columns(),
@@ -246,6 +637,117 @@ class MetadataValidation:
 
         return all(validations)
 
+    def _load_and_validate_chunked(self) -> bool:
+        """
+        load_and_validate() for CSVs too large to hold in memory.
+
+        Per-row checks run on each chunk as it is read. Rows are then spilled
+        to disk partitioned by file_path, so every row of a recording lands in
+        the same partition: the recording consistency check and the
+        reduction to one row per recording run one partition at a time.
+        Only the reduced recordings are kept, and the checks that span
+        recordings (first/last recording_order) run on those.
+
+        Returns:
+            bool: True if all validations pass, False otherwise
+        """
+        spill = _spill_csv_in_chunks(
+            self,
+            header_checks=[self.validate_columns],
+            chunk_checks=[self.validate_data_types],
+            coa_column="coa_name",
+            key_columns=["file_path"],
+        )
+        if spill is None:
+            return False
+        valid = not self.errors
+
+        consistency_errors = []
+        recordings, item_values = [], []
+        with spill:
+            for partition in spill.partitions():
+                consistency_errors.extend(
+                    self._recording_consistency_errors(partition)
+                )
+                if valid and not consistency_errors:
+                    part_recordings, part_items = self._reduce_recordings(partition)
+                    recordings.append(part_recordings)
+                    item_values.append(part_items)
+
+        if consistency_errors:
+            # Report in file_path order across partitions, as a single pass would.
+            codes, _ = pd.factorize(
+                pd.Series([path for path, _ in consistency_errors], dtype=object),
+                sort=True,
+                use_na_sentinel=False,
+            )
+            for position in np.argsort(codes, kind="stable"):
+                self.errors.append(consistency_errors[position][1])
+            return False
+        if not valid:
+            return False
+
+        if recordings:
+            recordings = _apply_dtypes(
+                pd.concat(recordings, ignore_index=True), self.DTYPES
+            )
+            item_values = np.concatenate(item_values)
+            # Partitions each come out in group order; restore it overall.
+            order = np.argsort(
+                recordings.groupby(
+                    self.RECORDING_GROUPING_COLS, dropna=False, sort=True, observed=True
+                )
+                .ngroup()
+                .to_numpy(),
+                kind="stable",
+            )
+            self._recordings = (
+                recordings.iloc[order].reset_index(drop=True),
+                item_values[order],
+            )
+        else:
+            self._recordings = (None, None)
+        return True
+
+    def _reduce_recordings(self, df: pd.DataFrame) -> Tuple[pd.DataFrame, np.ndarray]:
+        """
+        Reduce item rows to one row per recording, in sorted group order.
+
+        Each recording keeps its first CSV row's metadata, plus a
+        (recording x item) matrix of its item scores (NaN where missing;
+        later rows win for repeated items).
+        """
+        grouping_cols = self.RECORDING_GROUPING_COLS
+        optional_present = [col for col in self.OPTIONAL_COLUMNS if col in df.columns]
+
+        group_ids = (
+            df.groupby(grouping_cols, dropna=False, sort=True, observed=True)
+            .ngroup()
+            .to_numpy()
+        )
+        _, first_rows = np.unique(group_ids, return_index=True)
+        recordings = df.iloc[first_rows][grouping_cols + optional_present]
+        recordings = recordings.reset_index(drop=True)
+
+        max_items = max(COA_ITEM_COUNTS.values())
+        item_values = np.full((len(recordings), max_items), np.nan)
+        item_numbers = pd.to_numeric(df["coa_item_number"], errors="coerce")
+        item_scores = pd.to_numeric(df["coa_item_value"], errors="coerce")
+        item_numbers = item_numbers.to_numpy(dtype=float, na_value=np.nan)
+        item_scores = item_scores.to_numpy(dtype=float, na_value=np.nan)
+        rows = ~np.isnan(item_numbers)
+        if rows.any():
+            items = pd.DataFrame(
+                {
+                    "recording": group_ids[rows],
+                    "item": np.trunc(item_numbers[rows]).astype(int),
+                    "score": np.trunc(item_scores[rows]),
+                }
+            ).drop_duplicates(["recording", "item"], keep="last")
+            items = items[(items["item"] >= 1) & (items["item"] <= max_items)]
+            item_values[items["recording"], items["item"] - 1] = items["score"]
+        return recordings, item_values
+
     def transform_to_serializer_format(self) -> List[Dict[str, Any]]:
         """
         Transform CSV data to match BulkUploadSerializer format.
@@ -256,183 +758,98 @@ class MetadataValidation:
         Returns:
             List of dictionaries matching the serializer format
         """
-        if self.df is None:
+        frame = self._serializer_frame()
+        return [] if frame is None else _records(frame)
+
+    def _serializer_frame(self) -> Optional[pd.DataFrame]:
+        """transform_to_serializer_format() as a typed DataFrame, or None if empty."""
+        if self._recordings is not None:
+            recordings, item_values = self._recordings
+            if recordings is None:
+                return None
+        elif self.df is None:
             raise ValueError("CSV not loaded. Call load_and_validate() first.")
-
-        # Group by unique assessment identifiers
-        grouping_cols = [
-            "study_id",
-            "site_id",
-            "participant_id",
-            "visit_name",
-            "visit_order",
-            "coa_name",
-            "file_path",
-            "recording_order",
-        ]
-
-        # Add optional columns that are present
-        optional_present = [
-            col for col in self.OPTIONAL_COLUMNS if col in self.df.columns
-        ]
-
-        results = []
-
-        # First, identify the assessment-level groups (without recording_order)
-        assessment_grouping_cols = [
-            "study_id",
-            "site_id",
-            "participant_id",
-            "visit_name",
-            "coa_name",
-        ]
-
-        # Build a lookup of minimum recording_order per assessment
-        min_recording_lookup = {}
-        for assessment_key, assessment_df in self.df.groupby(
-            assessment_grouping_cols, dropna=False
-        ):
-            min_recording_order = assessment_df["recording_order"].min()
-            min_recording_lookup[assessment_key] = min_recording_order
-
-        # Build a lookup of maximum recording_order per VISIT (not per COA)
-        visit_grouping_cols = [
-            "study_id",
-            "site_id",
-            "participant_id",
-            "visit_name",
-        ]
-        max_recording_lookup = {}
-        for visit_key, visit_df in self.df.groupby(visit_grouping_cols, dropna=False):
-            max_recording_order = visit_df["recording_order"].max()
-            max_recording_lookup[visit_key] = max_recording_order
-
-        actual_scores_cache = {}
-        results = []
-
-        # Process ALL recordings (not just the first one)
-        for group_key, group_df in self.df.groupby(grouping_cols, dropna=False):
-            # Create base record
-            record = {}
-            for i, col in enumerate(grouping_cols):
-                record[col] = group_key[i]
-
-            # Add optional fields from first row of group
-            first_row = group_df.iloc[0]
-            for col in optional_present:
-                if col not in ["time_collected"]:  # Exclude metadata
-                    record[col] = first_row[col]
-
-            # Get expected item count for this COA
-            coa_name = record["coa_name"]
+        elif self.df.empty:
+            return None
+        else:
+            recordings, item_values = self._reduce_recordings(self.df)
+
+        # First recording per assessment (COA) and last recording per VISIT.
+        # A missing recording_order is neither.
+        recording_order = recordings["recording_order"]
+        is_first_recording = recording_order == recordings.groupby(
+            self.ASSESSMENT_GROUPING_COLS, dropna=False, observed=True
+        )["recording_order"].transform("min")
+        is_last_recording = recording_order == recordings.groupby(
+            self.VISIT_GROUPING_COLS, dropna=False, observed=True
+        )["recording_order"].transform("max")
+        is_first_recording = is_first_recording.fillna(False).astype(bool)
+        is_last_recording = is_last_recording.fillna(False).astype(bool)
+
+        # Every recording of an assessment shares the actual_scores built for
+        # the assessment's first recording in group order. Scores are only
+        # filled in when that recording is also the one with the lowest
+        # recording_order; otherwise all items are None.
+        assessment_ids = recordings.groupby(
+            self.ASSESSMENT_GROUPING_COLS, dropna=False, sort=False, observed=True
+        ).ngroup().to_numpy()
+        leader_mask = ~pd.Series(assessment_ids).duplicated().to_numpy()
+        leaders = np.flatnonzero(leader_mask)
+        is_first = is_first_recording.to_numpy()
+
+        actual_scores_by_assessment = {}
+        for position in leaders:
+            coa_name = recordings.at[position, "coa_name"]
             expected_items = COA_ITEM_COUNTS.get(coa_name, 10)
-
-            # Determine if this is the first and last recording for this assessment/visit
-            assessment_key = (
-                record["study_id"],
-                record["site_id"],
-                record["participant_id"],
-                record["visit_name"],
-                record["coa_name"],
-            )
-
-            visit_key = (
-                record["study_id"],
-                record["site_id"],
-                record["participant_id"],
-                record["visit_name"],
+            if is_first[position]:
+                scores = [
+                    None if np.isnan(value) else int(value)
+                    for value in item_values[position, :expected_items]
+                ]
+            else:
+                scores = [None] * expected_items
+            actual_scores_by_assessment[assessment_ids[position]] = _build_scores(
+                scores, sum(score for score in scores if score is not None)
             )
 
-            min_recording_order = min_recording_lookup[assessment_key]
-            max_recording_order = max_recording_lookup[visit_key]
-            is_first_recording = record["recording_order"] == min_recording_order
-            is_last_recording = record["recording_order"] == max_recording_order
-
-            # Add is_last_recording to the record
-            record["is_last_recording"] = is_last_recording
-
-            if assessment_key in actual_scores_cache:
-                # Reuse cached actual_scores
-                actual_scores = actual_scores_cache[assessment_key]
-            else:
-                # Create a dictionary to store item scores (only for first recording)
-                item_scores = {}
-
-                if is_first_recording:
-                    # Extract item scores from CSV rows
-                    for _, row in group_df.iterrows():
-                        item_num = (
-                            int(row["coa_item_number"])
-                            if pd.notna(row["coa_item_number"])
-                            else None
-                        )
-                        item_score = row["coa_item_value"]
-
-                        if item_num is not None:
-                            # Convert to int if not null, otherwise use None
-                            if pd.notna(item_score):
-                                item_scores[item_num] = int(item_score)
-                            else:
-                                item_scores[item_num] = None
-
-                # Build sections with all expected items
-                sections = []
-                total_score = 0
-
-                for item_num in range(1, expected_items + 1):
-                    if is_first_recording:
-                        # Use extracted scores (or None if missing)
-                        item_score = item_scores.get(item_num, None)
-                    else:
-                        # Subsequent recordings have None for all items
-                        item_score = None
-
-                    total_score = total_score + (
-                        item_score if item_score is not None else 0
-                    )
+        frame = recordings.copy()
+        frame["is_last_recording"] = is_last_recording.to_numpy()
+        frame["actual_scores"] = [
+            actual_scores_by_assessment[a] for a in assessment_ids.tolist()
+        ]
+        return frame
 
-                    section = {
-                        "section_id": f"s{item_num:02d}",
-                        "section_notes": None,
-                        "items": [
-                            {"item_id": f"i{item_num:02d}", "item_score": item_score}
-                        ],
-                    }
-                    sections.append(section)
-
-                actual_scores = {
-                    "sections": sections,
-                    "total_score": total_score if is_first_recording else 0,
-                    "total_severity": None,
-                }
+    def create_final_csv(self) -> pd.DataFrame:
+        """
+        Create the final grouped DataFrame, one row per recording.
 
-                # Cache the actual_scores for this assessment
-                actual_scores_cache[assessment_key] = actual_scores
+        Columns keep their schema dtypes, and actual_scores is kept as a dict
+        so it flows into the upload payload without being encoded and decoded
+        again; use export_transformed_csv() for the JSON-string CSV view.
 
-            record["actual_scores"] = actual_scores
-            results.append(record)
+        Returns:
+            DataFrame containing the grouped data
+        """
+        frame = self._serializer_frame()
+        if frame is None:
+            frame = pd.DataFrame()
+        else:
+            frame["force_upload"] = self.force_upload
 
-        return results
+        self.transformed_df = frame
+        return self.transformed_df
 
-    def create_final_csv(self) -> pd.DataFrame:
+    def export_transformed_csv(self, path: str = None) -> pd.DataFrame:
         """
-        Create a final grouped CSV with actual_scores as JSON string.
+        Return the transformed data with actual_scores as JSON strings.
 
         Args:
-            output_path: Path where the final CSV should be saved
+            path: Optional path to also write the CSV to
 
         Returns:
-            DataFrame containing the grouped data
+            DataFrame with JSON-encoded actual_scores
         """
-        transformed_data = self.transform_to_serializer_format()
-
-        # Convert actual_scores dict to JSON string for CSV storage
-        for record in transformed_data:
-            record["actual_scores"] = json.dumps(record["actual_scores"])
-            record["force_upload"] = self.force_upload
-
-        self.transformed_df = pd.DataFrame(transformed_data)
-        return self.transformed_df
+        return _export_with_json_scores(self.transformed_df, "actual_scores", path)
 
     def get_errors(self) -> List[str]:
         """
@@ -444,54 +861,110 @@ class MetadataValidation:
         return self.errors
 
 
+def _file_size(path) -> Optional[int]:
+    """Size of path in bytes, or None where os.path.exists would be false."""
+    try:
+        return os.stat(path).st_size
+    except (OSError, TypeError, ValueError):
+        return None
+
+
+def _file_sizes(paths) -> List[Optional[int]]:
+    return [_file_size(path) for path in paths]
+
+
+def validate_upload_rows(
+    df: pd.DataFrame, check_files: bool = True, workers: int = STAT_WORKERS
+) -> pd.DataFrame:
+    """Validate every upload row at once, before any request is sent.
+
+    Applies the checks of UploadUtils.validate_row (or, with
+    ``check_files=False``, validate_processed_data_row) to the whole frame:
+    languages with one vectorized isin, file paths with one os.stat per
+    distinct path, run concurrently. Returns a frame on df's index with a
+    boolean ``valid`` mask, the ``error`` message of each invalid row (None
+    otherwise) and the ``file_size`` of each existing file.
+    """
+    errors = np.full(df.shape[0], None, dtype=object)
+
+    if "language" in df.columns:
+        language = df["language"]
+        invalid = language.notna() & ~language.isin(LANGUAGE_CODES | {""})
+        for position in np.flatnonzero(invalid.to_numpy()):
+            errors[position] = f"Invalid language: {_native(language.iat[position])}"
+
+    file_size = pd.array([pd.NA] * df.shape[0], dtype="Int64")
+    if check_files and not df.empty:
+        codes, paths = pd.factorize(df["file_path"])
+        paths = np.asarray(paths, dtype=object)
+        # Each thread stats a whole batch, so a million paths are not a
+        # million futures.
+        batches = np.array_split(paths, max(1, min(len(paths), workers * 4)))
+        with ThreadPoolExecutor(max_workers=min(workers, len(batches))) as pool:
+            sizes = [size for batch in pool.map(_file_sizes, batches) for size in batch]
+        # Code -1 (a missing path) picks the trailing None.
+        file_size = pd.array(
+            np.array(sizes + [None], dtype=object)[codes], dtype="Int64"
+        )
+        # The file check comes first in validate_row, so its error wins.
+        errors[file_size.isna()] = "File path does not exist"
+
+    return pd.DataFrame(
+        {
+            "valid": pd.isna(errors),
+            "error": errors,
+            "file_size": file_size,
+        },
+        index=df.index,
+    )
+
+
 class UploadUtils:
-    def __init__(self, row):
+    def __init__(self, row, checksum_cache=None):
         self.row = row
+        self.checksum_cache = checksum_cache
 
     def validate_row(self):
         if not os.path.exists(self.row.file_path):
             return (False, "File path does not exist")
-        language = getattr(self.row, "language", None)
-        if language and language not in LANGUAGE_CHOICES:
+        language = _native(getattr(self.row, "language", None))
+        if language and language not in LANGUAGE_CODES:
             return (False, f"Invalid language: {language}")
         return (True, None)
 
     def validate_processed_data_row(self):
-        language = getattr(self.row, "language", None)
-        if language and language not in LANGUAGE_CHOICES:
+        language = _native(getattr(self.row, "language", None))
+        if language and language not in LANGUAGE_CODES:
             return (False, f"Invalid language: {language}")
         return (True, None)
 
     def calculate_file_checksum(self, file_path: str) -> str:
         try:
-            with open(file_path, "rb") as f:
-                file_data = f.read()
-
-            hash_bytes = hashlib.sha256(file_data).digest()
-            base64_hash = base64.b64encode(hash_bytes).decode("utf-8")
-            return base64_hash
+            if self.checksum_cache is not None:
+                return self.checksum_cache.checksum(file_path, sha256_base64)
+            return sha256_base64(file_path)
         except Exception as e:
             raise RuntimeError(f"Failed to calculate checksum: {e}")
 
     def generate_payload(self) -> Dict[str, Any]:
         payload = {
-            "study_id": self.row.study_id,
-            "site_id": self.row.site_id,
-            "rater_id": self.row.rater_id,
-            "participant_id": self.row.participant_id,
-            "age": self.row.age,
-            "sex": self.row.sex,
-            "race": self.row.race,
-            "language": self.row.language,
-            "visit_name": self.row.visit_name,
+            "study_id": _native(self.row.study_id),
+            "site_id": _native(self.row.site_id),
+            "rater_id": _native(self.row.rater_id),
+            "participant_id": _native(self.row.participant_id),
+            "age": _native(self.row.age),
+            "sex": _native(self.row.sex),
+            "race": _native(self.row.race),
+            "language": _native(self.row.language),
+            "visit_name": _native(self.row.visit_name),
             "visit_order": int(self.row.visit_order),
-            "coa_name": self.row.coa_name,
+            "coa_name": _native(self.row.coa_name),
             "filename": os.path.basename(self.row.file_path),
-            "force_upload": self.row.force_upload,
-            "actual_scores": json.loads(self.row.actual_scores),
+            "force_upload": _native(self.row.force_upload),
+            "actual_scores": _as_scores(self.row.actual_scores),
             "checksum": self.calculate_file_checksum(self.row.file_path),
             "recording_order": int(self.row.recording_order),
-            "is_last_recording": self.row.is_last_recording,
+            "is_last_recording": _native(self.row.is_last_recording),
             # "time_collected": parser.parse(self.row.time_collected).isoformat(),
         }
         return payload
@@ -499,24 +972,28 @@ class UploadUtils:
     def generate_processed_payload(
         self, files: List[Dict[str, str]], score_type: str = "rater"
     ) -> Dict[str, Any]:
-        recording_val = getattr(self.row, "recording", None)
+        recording_val = _native(getattr(self.row, "recording", None))
+        timestamp = _native(getattr(self.row, "timestamp_iso", None))
+        if timestamp is None:
+            # Only rows that did not come through load_and_validate() lack it.
+            timestamp = parser.parse(self.row.timestamp).isoformat()
         payload = {
-            "study_id": self.row.study_id,
-            "site_id": self.row.site_id,
-            "rater_id": self.row.rater_id,
-            "pt_id": self.row.pt_id,
-            "language": self.row.language,
-            "visit_id": self.row.visit_id,
+            "study_id": _native(self.row.study_id),
+            "site_id": _native(self.row.site_id),
+            "rater_id": _native(self.row.rater_id),
+            "pt_id": _native(self.row.pt_id),
+            "language": _native(self.row.language),
+            "visit_id": _native(self.row.visit_id),
             "visit_order": int(self.row.visit_order),
-            "coa_id": self.row.coa_id,
+            "coa_id": _native(self.row.coa_id),
             "filename": os.path.basename(recording_val) if recording_val else "",
-            "actual_scores": json.loads(self.row.scores_actual),
+            "actual_scores": _as_scores(self.row.scores_actual),
             "files": files,
-            "force_upload": self.row.force_upload,
-            "timestamp": parser.parse(self.row.timestamp).isoformat(),
+            "force_upload": _native(self.row.force_upload),
+            "timestamp": timestamp,
             "score_type": score_type,
         }
-        site_country = getattr(self.row, "site_country", None)
+        site_country = _native(getattr(self.row, "site_country", None))
         if site_country:
             payload["site_country"] = site_country
         return payload
@@ -525,7 +1002,7 @@ class UploadUtils:
         self, api_key: str, url: str, headers: Dict[str, str], payload: Dict[str, Any]
     ) -> Dict[str, Any]:
         try:
-            session = build_retry_session()
+            session = build_retry_session(API)
             response = session.post(
                 url, headers=headers, json=payload, timeout=(10, 300)
             )
@@ -555,17 +1032,47 @@ class ProcessedMetadataValidation:
 
     OPTIONAL_COLUMNS = ["rater_id", "language", "site_country", "age", "sex", "race"]
 
+    # Repeated identifiers are held as categoricals, numbers as nullable types.
+    DTYPES = {
+        "study_id": "category",
+        "site_id": "category",
+        "pt_id": "category",
+        "visit_id": "category",
+        "visit_order": "Int64",
+        "coa_id": "category",
+        "recording_order": "Int64",
+        "workflow": "category",
+        "rater_id": "category",
+        "language": "category",
+        "site_country": "category",
+        "age": "Float64",
+        "sex": "category",
+        "race": "category",
+        "timestamp_iso": "category",
+    }
+
+    # Rows with the same values here are parts of one recording.
+    GROUPING_COLS = ["pt_id", "visit_id", "visit_order", "coa_id"]
+
     def __init__(
         self,
         csv_path: str,
         force_upload: bool = False,
         score_type: str = "rater",
+        chunksize: int = None,
+        spill_dir: str = None,
+        csv_engine: str = None,
     ):
         """
         Initialize validator with CSV file path.
 
         Args:
             csv_path: Path to the CSV file
+            chunksize: If set, read the CSV this many rows at a time and spill
+                rows to disk grouped by visit, so peak memory follows
+                chunksize rather than the size of the file
+            spill_dir: Directory for spill files (default: system temp dir)
+            csv_engine: pd.read_csv engine; "pyarrow" is used if installed
         """
         self.csv_path = csv_path
         self.df = None
@@ -573,6 +1080,22 @@ class ProcessedMetadataValidation:
         self.transformed_df = None
         self.force_upload = force_upload
         self.score_type = score_type
+        self.chunksize = chunksize
+        self.spill_dir = spill_dir
+        self.csv_engine = csv_engine
+        # Rows spilled by a chunked load, until create_final_csv() merges them.
+        self._spill = None
+        # Shared by every chunk, so a repeated timestamp is parsed once.
+        self._timestamps = TimestampParser()
+
+    def reads_column(self, name: str) -> bool:
+        """Whether a Parquet/Arrow manifest column is read; others are skipped."""
+        return (
+            name in self.REQUIRED_COLUMNS
+            or name in self.OPTIONAL_COLUMNS
+            or name == "recording"
+            or name.startswith("item_score_")
+        )
 
     def validate_columns(self) -> bool:
         """
@@ -637,8 +1160,29 @@ class ProcessedMetadataValidation:
                 self.errors.append("recording_order must be numeric")
                 valid = False
 
+        # Missing values stay <NA> instead of turning the column into objects.
+        _apply_dtypes(self.df, self.DTYPES, numeric_only=True)
         return valid
 
+    def validate_timestamps(self) -> bool:
+        """
+        Parse every timestamp and keep its ISO 8601 form in timestamp_iso.
+
+        Returns:
+            bool: True if validation passes, False otherwise
+        """
+        if "timestamp" not in self.df.columns:
+            # Already reported by validate_columns().
+            return False
+        iso, failed = self._timestamps.parse(self.df["timestamp"])
+        self.df["timestamp_iso"] = iso
+        if failed:
+            self.errors.append(
+                f"Invalid timestamp values found: {[_native(v) for v in failed]}"
+            )
+            return False
+        return True
+
     def validate_coa_names(self) -> bool:
         """
         Validate that coa_id values are in the allowed list.
@@ -647,16 +1191,12 @@ class ProcessedMetadataValidation:
             bool: True if validation passes, False otherwise
         """
         # Convert to lowercase for comparison
-        self.df["coa_id"] = self.df["coa_id"].str.strip()
+        self.df["coa_id"] = self.df["coa_id"].str.strip().astype("category")
 
-        invalid_coa = self.df[~self.df["coa_id"].isin(ALLOWED_COA_NAMES)]
+        invalid_values = _invalid_coa_names(self.df["coa_id"])
 
-        if not invalid_coa.empty:
-            invalid_values = invalid_coa["coa_id"].unique().tolist()
-            self.errors.append(
-                f"Invalid coa_id values found: {invalid_values}. "
-                f"Allowed values are: {', '.join(ALLOWED_COA_NAMES)}"
-            )
+        if invalid_values:
+            self.errors.append(_invalid_coa_names_error("coa_id", invalid_values))
             return False
         return True
 
@@ -667,31 +1207,69 @@ class ProcessedMetadataValidation:
         Returns:
             bool: True if all validations pass, False otherwise
         """
+        if self.chunksize:
+            return self._load_and_validate_chunked()
+
         try:
-            self.df = pd.read_csv(self.csv_path)
-            self.df = self.df.replace({np.nan: None})
+            self.df = _read_manifest(self)
         except Exception as e:
             self.errors.append(f"Failed to load CSV: {str(e)}")
             return False
 
         # Strip whitespace from column names
         self.df.columns = self.df.columns.str.strip()
+        _apply_dtypes(self.df, self.DTYPES)
 
         validations = [
             self.validate_columns(),
             self.validate_recording_field(),
             self.validate_data_types(),
+            self.validate_timestamps(),
             self.validate_coa_names(),
         ]
 
         return all(validations)
 
+    def _load_and_validate_chunked(self) -> bool:
+        """
+        load_and_validate() for CSVs too large to hold in memory.
+
+        Checks run on each chunk as it is read, and rows are spilled to disk
+        partitioned by visit key so create_final_csv() can merge each
+        recording's parts one partition at a time.
+
+        Returns:
+            bool: True if all validations pass, False otherwise
+        """
+        spill = _spill_csv_in_chunks(
+            self,
+            header_checks=[self.validate_columns],
+            chunk_checks=[
+                self.validate_recording_field,
+                self.validate_data_types,
+                self.validate_timestamps,
+            ],
+            coa_column="coa_id",
+            key_columns=self.GROUPING_COLS,
+        )
+        if spill is None:
+            return False
+        if self.errors:
+            spill.close()
+            return False
+        self._spill = spill
+        return True
+
     def create_scores_json(self, row: pd.Series, coa_id: str) -> str:
-        """Create scores JSON format based on COA type (MADRS=10 items, HAMD=17 items)."""
+        """Create scores JSON string based on COA type (MADRS=10 items, HAMD=17 items)."""
+        return json.dumps(self.create_scores(row, coa_id))
+
+    def create_scores(self, row: pd.Series, coa_id: str) -> Dict[str, Any]:
+        """Create the scores structure based on COA type (MADRS=10 items, HAMD=17 items)."""
         # Determine number of items based on coa_id
         num_items = COA_ITEM_COUNTS.get(coa_id, 10)
 
-        sections = []
+        item_scores = []
         total_score = 0
 
         for i in range(1, num_items + 1):
@@ -702,80 +1280,80 @@ class ProcessedMetadataValidation:
             if item_col in row.index and pd.notna(row[item_col]):
                 item_score = (
                     int(row[item_col])
-                    if isinstance(row[item_col], (int, float))
+                    if isinstance(row[item_col], (int, float, np.number))
                     else None
                 )
                 if item_score is not None:
                     total_score += item_score
 
-            section = {
-                "section_id": f"s{i:02d}",
-                "section_notes": None,
-                "items": [{"item_id": f"i{i:02d}", "item_score": item_score}],
-            }
-            sections.append(section)
-
-        scores_dict = {
-            "sections": sections,
-            "total_score": total_score,
-            "total_severity": None,
-        }
-
-        return json.dumps(scores_dict)
-
-    def create_final_csv(self) -> pd.DataFrame:
-        """Concatenate multipart recordings grouped by pt_id, visit_id, visit_order, coa_id."""
+            item_scores.append(item_score)
 
-        merged = []
+        scores_dict = _build_scores(item_scores, total_score)
 
-        # Group by pt_id, visit_id, visit_order, coa_id
-        grouping_cols = ["pt_id", "visit_id", "visit_order", "coa_id"]
+        return scores_dict
 
-        for rec_id, group in self.df.groupby(grouping_cols):
-            grp = group.sort_values("recording_order")
+    def create_scores_bulk(self, df: pd.DataFrame) -> List[Dict[str, Any]]:
+        """Columnar create_scores() for every row of df, in row order.
 
-            if len(grp) == 1:
-                row0 = grp.iloc[0].copy()
-                row0["recording_count"] = 1
-                row0["original_recordings"] = row0["recording"]
-                merged.append(row0)
+        The item_score_* block is read once into a (row x item) matrix with
+        missing or non-numeric cells masked out, and totals are summed over
+        each row's COA_ITEM_COUNTS items in bulk. Only the final structure
+        is assembled per row.
+        """
+        max_items = max(COA_ITEM_COUNTS.values())
+        matrix = np.full((len(df), max_items), np.nan)
+        for i in range(1, max_items + 1):
+            item_col = f"item_score_{i:02d}"
+            if item_col not in df.columns:
                 continue
+            values = df[item_col]
+            if pd.api.types.is_numeric_dtype(values):
+                matrix[:, i - 1] = values.to_numpy(dtype=float, na_value=np.nan)
+            elif pd.api.types.infer_dtype(values, skipna=True) in _NUMERIC_INFERRED:
+                # Object column holding only numbers and None, which is what
+                # replace({np.nan: None}) leaves behind.
+                matrix[:, i - 1] = pd.to_numeric(values).to_numpy(
+                    dtype=float, na_value=np.nan
+                )
+            else:
+                # Mixed columns: like create_scores(), only numeric cells count.
+                matrix[:, i - 1] = [
+                    float(v) if isinstance(v, (int, float)) and pd.notna(v) else np.nan
+                    for v in values
+                ]
+        matrix = np.trunc(matrix)
+
+        num_items = (
+            df["coa_id"].map(COA_ITEM_COUNTS).astype(float).fillna(10).astype(int).to_numpy()
+        )
+        counted = (np.arange(max_items) < num_items[:, None]) & ~np.isnan(matrix)
+        totals = np.where(counted, matrix, 0).sum(axis=1).astype(int).tolist()
 
-            parts = []
-            bases = []
-
-            # Download all parts
-            for idx, (_, row) in enumerate(grp.iterrows()):
-                uri = row["recording"]
-
-                bucket, key = _get_bucket_n_key_path_from_s3url(uri)
-                fname = os.path.basename(key)
-                bases.append(os.path.splitext(fname)[0])
+        with _gc_paused():
+            return [
+                _build_scores([None if v != v else int(v) for v in row[:n]], total)
+                for row, n, total in zip(matrix.tolist(), num_items.tolist(), totals)
+            ]
 
-            merged_name = "_".join(bases) + ".wav"
+    def create_final_csv(self) -> pd.DataFrame:
+        """Concatenate multipart recordings grouped by pt_id, visit_id, visit_order, coa_id."""
 
-            row0 = grp.iloc[0].copy()
-            orig_bucket, orig_key = _get_bucket_n_key_path_from_s3url(
-                grp.iloc[0]["recording"]
-            )
-            # S3 keys always use "/" — os.path.join would insert "\" on Windows.
-            merged_key = posixpath.join(posixpath.dirname(orig_key), merged_name)
-
-            # Create new URI (no upload, logical merge only)
-            new_uri = f"s3://{orig_bucket}/{merged_key}"
-
-            # Use the first record (min recording_order) as base
-            row0 = grp.iloc[0].copy()
-            row0["recording"] = new_uri
-            row0["recording_count"] = len(grp)
-            row0["original_recordings"] = ", ".join(
-                [r["recording"] for _, r in grp.iterrows()]
-            )
-            merged.append(row0)
+        if self._spill is not None:
+            # Every part of a recording is in the same partition.
+            with self._spill as spill:
+                merged = [self._merge_recordings(part) for part in spill.partitions()]
+                if not merged:
+                    merged = [self._merge_recordings(spill.empty)]
+            self._spill = None
+            merged = pd.concat(merged).sort_values(self.GROUPING_COLS, kind="stable")
+            # Chunks were typed independently, so categories differ between them.
+            merged = _apply_dtypes(merged, self.DTYPES)
+        else:
+            merged = self._merge_recordings(self.df)
 
-        self.transformed_df = pd.DataFrame(merged)
-        self.transformed_df["scores_actual"] = self.transformed_df.apply(
-            lambda row: self.create_scores_json(row, row["coa_id"]), axis=1
+        self.transformed_df = merged
+        self.transformed_df["scores_actual"] = self.create_scores_bulk(
+            self.transformed_df
         )
 
         item_score_cols = [
@@ -788,6 +1366,97 @@ class ProcessedMetadataValidation:
 
         return self.transformed_df
 
+    def _merge_recordings(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Merge each group's recordings into one row, in group order."""
+
+        grouping_cols = self.GROUPING_COLS
+
+        # One stable sort puts every group's rows together in recording_order,
+        # with groups in key order. Rows with a missing key are dropped, as
+        # groupby() does by default.
+        df = df[df[grouping_cols].notna().all(axis=1)]
+        df = df.sort_values(grouping_cols + ["recording_order"], kind="stable")
+        group_ids = (~df.duplicated(grouping_cols)).cumsum().to_numpy()
+        first = ~df.duplicated(grouping_cols).to_numpy()
+
+        # Use the first record (min recording_order) of each group as base.
+        merged = df[first].copy()
+        counts = np.bincount(group_ids)[1:]
+        merged["recording_count"] = counts
+
+        if "recording" in df.columns:
+            recordings = df["recording"]
+            merged["original_recordings"] = merged["recording"]
+
+            multi = counts > 1
+            if multi.any():
+                in_multi = multi[group_ids - 1]
+                parts = recordings[in_multi].astype(object).fillna("").astype(str)
+                part_groups = group_ids[in_multi]
+                buckets, keys = _split_s3_urls(parts)
+                # basename, then splitext(...)[0]
+                bases = keys.str.rsplit("/", n=1).str[-1]
+                bases = bases.str.replace(_SPLITEXT_STEM, r"\1", regex=True)
+
+                # Parts of a group are contiguous after the sort, so each
+                # group's names are one slice of the flat list.
+                first_part = np.r_[True, part_groups[1:] != part_groups[:-1]]
+                bounds = np.append(np.flatnonzero(first_part), len(part_groups))
+                bounds = bounds.tolist()
+                spans = list(zip(bounds[:-1], bounds[1:]))
+                base_list = bases.tolist()
+                part_list = parts.tolist()
+                merged_names = ["_".join(base_list[i:j]) for i, j in spans]
+                joined = [", ".join(part_list[i:j]) for i, j in spans]
+                # S3 keys always use "/" — os.path.join would insert "\" on Windows.
+                new_uris = [
+                    f"s3://{bucket}/"
+                    + posixpath.join(posixpath.dirname(key), name + ".wav")
+                    for bucket, key, name in zip(
+                        buckets.to_numpy()[first_part],
+                        keys.to_numpy()[first_part],
+                        merged_names,
+                    )
+                ]
+
+                # Create new URI (no upload, logical merge only)
+                rows = np.flatnonzero(multi)
+                merged.iloc[rows, merged.columns.get_loc("recording")] = new_uris
+                merged.iloc[
+                    rows, merged.columns.get_loc("original_recordings")
+                ] = joined
+        else:
+            merged["original_recordings"] = None
+
+        return merged
+
+    def export_transformed_csv(self, path: str = None) -> pd.DataFrame:
+        """
+        Return the transformed data with scores_actual as JSON strings.
+
+        Args:
+            path: Optional path to also write the CSV to
+
+        Returns:
+            DataFrame with JSON-encoded scores_actual
+        """
+        return _export_with_json_scores(self.transformed_df, "scores_actual", path)
+
+
+def _as_scores(value):
+    """Return a scores structure, decoding it if it is still a JSON string."""
+    return json.loads(value) if isinstance(value, str) else value
+
+
+def _export_with_json_scores(df: pd.DataFrame, column: str, path: str = None):
+    if df is None:
+        raise ValueError("No transformed data. Call create_final_csv() first.")
+    exported = df.copy()
+    exported[column] = [json.dumps(scores) for scores in exported[column]]
+    if path:
+        exported.to_csv(path, index=False)
+    return exported
+
 
 def find_files_with_pattern(directory, search_pattern):
     matches = []
@@ -803,11 +1472,98 @@ def find_files_with_pattern(directory, search_pattern):
     return matches
 
 
+class FilenameIndex:
+    """Filenames under a directory, walked once and searched many times.
+
+    ``find(pattern)`` returns exactly what
+    ``find_files_with_pattern(directory, pattern)`` would, in the same order,
+    but without walking the tree again for every query. All filenames are
+    joined into one NUL-separated string, so a substring query is a handful
+    of C-level ``str.find`` calls instead of a Python loop over every file.
+    """
+
+    def __init__(self, directory):
+        self.paths = []
+        names = []
+        if os.path.exists(directory):
+            for path, name in self._walk(directory):
+                self.paths.append(path)
+                names.append(name)
+        self._starts = []
+        offset = 0
+        for name in names:
+            self._starts.append(offset)
+            offset += len(name) + 1
+        self._names = "\0".join(names)
+        self._cache = {}
+
+    @staticmethod
+    def _walk(top):
+        """Yield (path, filename) in the same order as os.walk(top)."""
+        stack = [top]
+        while stack:
+            root = stack.pop()
+            try:
+                entries = list(os.scandir(root))
+            except OSError:
+                continue
+            subdirs = []
+            for entry in entries:
+                try:
+                    is_dir = entry.is_dir()
+                except OSError:
+                    is_dir = False
+                if not is_dir:
+                    yield os.path.join(root, entry.name), entry.name
+                elif not entry.is_symlink():
+                    # os.walk lists symlinked directories but does not follow them.
+                    subdirs.append(os.path.join(root, entry.name))
+            stack.extend(reversed(subdirs))
+
+    def find(self, search_pattern):
+        if search_pattern in self._cache:
+            return list(self._cache[search_pattern])
+        if not search_pattern:
+            matches = list(self.paths)
+        else:
+            matches = []
+            pos = self._names.find(search_pattern)
+            while pos != -1:
+                i = bisect.bisect_right(self._starts, pos) - 1
+                matches.append(self.paths[i])
+                if i + 1 == len(self._starts):
+                    break
+                # Resume at the next filename so each file matches at most once.
+                pos = self._names.find(search_pattern, self._starts[i + 1])
+        self._cache[search_pattern] = matches
+        return list(matches)
+
+
 def _get_bucket_n_key_path_from_s3url(path):
     url_split = urlsplit(path)
     return url_split.netloc, url_split.path[1:]
 
 
+# Plain s3://bucket/key URLs, which split the same way urlsplit() would.
+_S3_URL = r"^s3://(?P<bucket>[^/?#\s]*)(?P<path>[^?#\s]*)$"
+# The stem os.path.splitext() keeps: everything before the last dot, unless
+# that dot is part of the name's leading dots.
+_SPLITEXT_STEM = r"^(\.*[^.].*)\.[^.]*$"
+
+
+def _split_s3_urls(urls: pd.Series) -> Tuple[pd.Series, pd.Series]:
+    """Vectorized _get_bucket_n_key_path_from_s3url over a Series of strings."""
+    parts = urls.str.extract(_S3_URL)
+    unmatched = parts["bucket"].isna()
+    if unmatched.any():
+        # Anything unusual (query strings, other schemes, whitespace) goes
+        # through urlsplit itself.
+        split = [_get_bucket_n_key_path_from_s3url(url) for url in urls[unmatched]]
+        parts.loc[unmatched, "bucket"] = [bucket for bucket, _ in split]
+        parts.loc[unmatched, "path"] = ["/" + key for _, key in split]
+    return parts["bucket"], parts["path"].str[1:]
+
+
 def get_last_n_directories(filepath, n=3):
     result = None
     error = None
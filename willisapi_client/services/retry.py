@@ -0,0 +1,389 @@
+import asyncio
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from datetime import datetime, timezone
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+from urllib.parse import urlsplit
+
+import requests
+import urllib3
+
+from willisapi_client.logging_setup import logger as logger
+from willisapi_client.services.exceptions import CircuitOpenError
+
+# Responses worth sending again: throttling and gateway/server hiccups.
+RETRY_STATUS_CODES = frozenset({429, 500, 502, 503, 504})
+# Exceptions that mean the request may not have reached the server.
+RETRY_EXCEPTIONS = (requests.exceptions.ConnectionError, requests.exceptions.Timeout)
+# Responses that say the server is shedding load. They mean the request was
+# not acted on, so even a POST can be resent; and they are not a sign of a
+# broken endpoint, so they do not trip its circuit breaker.
+THROTTLE_STATUS_CODES = frozenset({429, 503})
+# Methods that can be sent twice with the effect of sending them once.
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE", "TRACE"})
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+def endpoint_of(url: str) -> str:
+    """The host a URL is sent to; circuit breakers are kept per endpoint."""
+    return urlsplit(url).netloc
+
+
+def retry_after(response) -> Optional[float]:
+    """Seconds a response's Retry-After header asks for, or None."""
+    value = response.headers.get("Retry-After") if response is not None else None
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
+
+
+def retryable_response(response, error) -> Tuple[bool, Optional[float]]:
+    """Default classifier: retry connection errors and RETRY_STATUS_CODES.
+
+    Returns (retry?, seconds the server asked to wait or None).
+    """
+    if error is not None:
+        return isinstance(error, RETRY_EXCEPTIONS), None
+    if response.status_code in RETRY_STATUS_CODES:
+        return True, retry_after(response)
+    return False, None
+
+
+def connect_failed(error: BaseException) -> bool:
+    """True if a requests error happened before the request was sent."""
+    if isinstance(error, requests.exceptions.ConnectTimeout):
+        return True
+    if not isinstance(error, requests.exceptions.ConnectionError):
+        return False
+    reason = getattr(error.args[0] if error.args else None, "reason", None)
+    return isinstance(reason, urllib3.exceptions.NewConnectionError)
+
+
+def retryable_unsent(response, error) -> Tuple[bool, Optional[float]]:
+    """Classifier for requests that are not idempotent, such as POST.
+
+    Only what the server cannot have acted on is retried: a failure to
+    connect, and a THROTTLE_STATUS_CODES response. A 500 or a read timeout
+    may follow a request that took effect, so resending could repeat it.
+    """
+    if error is not None:
+        return connect_failed(error), None
+    if response.status_code in THROTTLE_STATUS_CODES:
+        return True, retry_after(response)
+    return False, None
+
+
+def retryable_for(method: str):
+    """The default classifier for requests sent with ``method``."""
+    if method.upper() in IDEMPOTENT_METHODS:
+        return retryable_response
+    return retryable_unsent
+
+
+def throttled(result) -> bool:
+    """True if a try's result is a response shedding load."""
+    return getattr(result, "status_code", None) in THROTTLE_STATUS_CODES
+
+
+class RetryBudget:
+    """Caps retries at ``minimum`` plus ``ratio`` of the requests in a run.
+
+    When an endpoint is failing across the board, retries stop once the
+    budget is spent instead of multiplying the load on it.
+    """
+
+    def __init__(self, ratio: float = 0.2, minimum: int = 10):
+        self.ratio = ratio
+        self.minimum = minimum
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.requests = 0
+            self.retries = 0
+
+    def record_request(self):
+        with self._lock:
+            self.requests += 1
+
+    def try_spend(self) -> bool:
+        with self._lock:
+            if self.retries >= self.minimum + self.ratio * self.requests:
+                return False
+            self.retries += 1
+            return True
+
+    def remaining(self) -> int:
+        with self._lock:
+            return max(0, int(self.minimum + self.ratio * self.requests) - self.retries)
+
+
+class CircuitBreaker:
+    """Fails fast once an endpoint keeps failing.
+
+    After ``failure_threshold`` consecutive failed attempts the circuit
+    opens and requests are refused for ``reset_timeout`` seconds. Then one
+    probe is let through (half open): success closes the circuit, failure
+    opens it again.
+    """
+
+    def __init__(
+        self,
+        endpoint: str,
+        failure_threshold: int = 10,
+        reset_timeout: float = 30.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.endpoint = endpoint
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.clock = clock
+        self._lock = threading.Lock()
+        self.state = CLOSED
+        self.failures = 0
+        self.opened_at = None
+        self._probing = False
+
+    def allow(self) -> bool:
+        with self._lock:
+            if self.state == CLOSED:
+                return True
+            if self.state == OPEN:
+                if self.clock() - self.opened_at < self.reset_timeout:
+                    return False
+                self.state = HALF_OPEN
+            if self._probing:
+                return False
+            self._probing = True
+            return True
+
+    def record_success(self):
+        with self._lock:
+            if self.state != CLOSED:
+                logger.info(f"Circuit for {self.endpoint} closed")
+            self.state = CLOSED
+            self.failures = 0
+            self._probing = False
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            self._probing = False
+            if self.state == HALF_OPEN or (
+                self.state == CLOSED and self.failures >= self.failure_threshold
+            ):
+                if self.state == CLOSED:
+                    logger.warning(
+                        f"Circuit for {self.endpoint} opened after "
+                        f"{self.failures} consecutive failures"
+                    )
+                self.state = OPEN
+                self.opened_at = self.clock()
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return {"state": self.state, "failures": self.failures}
+
+
+class RetryPolicy:
+    """The one retry loop used by every HTTP call the client makes.
+
+    call() sends a request, and while the classifier says the outcome is
+    transient and attempts and the run's RetryBudget allow, waits and sends
+    it again. Waits are exponential with full jitter — uniform between 0 and
+    ``base * 2**(attempt-1)``, capped at ``max_delay`` — unless the server
+    sent Retry-After. Each endpoint has a CircuitBreaker; while it is open
+    call() raises CircuitOpenError without sending anything.
+
+    A call() made from inside another call() on the same thread (e.g. the
+    transport's retrying adapter under a caller's own retry loop) sends
+    once, so retries never multiply.
+    """
+
+    def __init__(
+        self,
+        attempts: int = 4,
+        base: float = 1.0,
+        max_delay: float = 60.0,
+        budget: RetryBudget = None,
+        failure_threshold: int = 10,
+        reset_timeout: float = 30.0,
+        sleep: Callable[[float], None] = time.sleep,
+        clock: Callable[[], float] = time.monotonic,
+        rng: Callable[[], float] = random.random,
+    ):
+        self.attempts = attempts
+        self.base = base
+        self.max_delay = max_delay
+        self.budget = budget or RetryBudget()
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.sleep = sleep
+        self.clock = clock
+        self.rng = rng
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self.retries = 0
+        self.gave_up = 0
+
+    def start_run(self):
+        """Give a new upload run a fresh retry budget."""
+        self.budget.reset()
+        with self._lock:
+            self.retries = 0
+            self.gave_up = 0
+
+    def breaker(self, endpoint: str) -> CircuitBreaker:
+        with self._lock:
+            breaker = self._breakers.get(endpoint)
+            if breaker is None:
+                breaker = self._breakers[endpoint] = CircuitBreaker(
+                    endpoint, self.failure_threshold, self.reset_timeout, self.clock
+                )
+            return breaker
+
+    def delay(self, attempt: int, requested: Optional[float] = None) -> float:
+        """Seconds to wait after failed attempt number ``attempt``."""
+        if requested is not None:
+            return min(self.max_delay, requested)
+        return self.rng() * min(self.max_delay, self.base * 2 ** (attempt - 1))
+
+    def call(
+        self,
+        endpoint: str,
+        send: Callable[[], Any],
+        retryable: Callable[[Any, Optional[BaseException]], Tuple[bool, Any]] = None,
+        attempts: int = None,
+        attempt: int = 1,
+        before_retry: Callable[[Any], None] = None,
+    ):
+        """Return send()'s result, retrying transient failures.
+
+        ``retryable(result, error)`` returns (retry?, Retry-After seconds or
+        None); it defaults to retryable_response. ``attempt`` is the number
+        of the first try, for callers that count tries themselves.
+        ``before_retry(result)`` runs before each resend, e.g. to release a
+        response or rewind a file body. The last result is returned (or its
+        exception raised) when retries run out.
+        """
+        if getattr(self._local, "active", False):
+            return send()
+        retryable = retryable or retryable_response
+        breaker = self._begin(endpoint)
+        self._local.active = True
+        try:
+            while True:
+                self._check(breaker)
+                result, error = None, None
+                try:
+                    result = send()
+                except Exception as ex:
+                    error = ex
+                wait = self._settle(
+                    breaker, retryable, attempt, attempts, result, error
+                )
+                if wait is None:
+                    if error is not None:
+                        raise error
+                    return result
+                self.sleep(wait)
+                if before_retry is not None:
+                    before_retry(result)
+                attempt += 1
+        finally:
+            self._local.active = False
+
+    async def call_async(
+        self,
+        endpoint: str,
+        send: Callable[[], Awaitable[Any]],
+        retryable: Callable[[Any, Optional[BaseException]], Tuple[bool, Any]] = None,
+        attempts: int = None,
+        attempt: int = 1,
+    ):
+        """call() for a coroutine function, waiting with asyncio.sleep.
+
+        Shares the budget and circuit breakers with call(). ``send`` starts
+        the request afresh on each try, so it should reopen any file body.
+        """
+        retryable = retryable or retryable_response
+        breaker = self._begin(endpoint)
+        while True:
+            self._check(breaker)
+            result, error = None, None
+            try:
+                result = await send()
+            except Exception as ex:
+                error = ex
+            wait = self._settle(breaker, retryable, attempt, attempts, result, error)
+            if wait is None:
+                if error is not None:
+                    raise error
+                return result
+            await asyncio.sleep(wait)
+            attempt += 1
+
+    def _begin(self, endpoint: str) -> CircuitBreaker:
+        self.budget.record_request()
+        return self.breaker(endpoint)
+
+    @staticmethod
+    def _check(breaker: CircuitBreaker):
+        if not breaker.allow():
+            raise CircuitOpenError(
+                f"Circuit for {breaker.endpoint} is open after repeated failures"
+            )
+
+    def _settle(
+        self, breaker, retryable, attempt, attempts, result, error
+    ) -> Optional[float]:
+        """Record one try's outcome; return the wait before the next, or None."""
+        retry, requested = retryable(result, error)
+        # A throttled endpoint is up and answering. Throttling is left to
+        # Retry-After, the backoff and the S3 rate controller; opening the
+        # circuit on it would halt a healthy host.
+        if retry and not throttled(result):
+            breaker.record_failure()
+        else:
+            breaker.record_success()
+        if not retry:
+            return None
+        if attempt < (attempts or self.attempts) and self.budget.try_spend():
+            with self._lock:
+                self.retries += 1
+            return self.delay(attempt, requested)
+        with self._lock:
+            self.gave_up += 1
+        return None
+
+    def stats(self) -> Dict[str, Any]:
+        """Retries sent and given up this run, budget left, each circuit's state."""
+        with self._lock:
+            breakers = list(self._breakers.values())
+            retries, gave_up = self.retries, self.gave_up
+        return {
+            "retries": retries,
+            "gave_up": gave_up,
+            "budget_remaining": self.budget.remaining(),
+            "circuits": {b.endpoint: b.snapshot() for b in breakers},
+        }
+
+
+# Shared by the transport and every other retrying call in this process.
+retry_policy = RetryPolicy()
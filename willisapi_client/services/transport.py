@@ -0,0 +1,174 @@
+import threading
+import weakref
+from typing import Dict
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests.utils import rewind_body
+
+from willisapi_client.services.retry import (
+    RetryPolicy,
+    endpoint_of,
+    retry_policy,
+    retryable_for,
+)
+
+# Pools, one per kind of host: the Willis API, and S3 presigned URLs.
+API = "api"
+S3 = "s3"
+
+# Connections each thread's session keeps open per host. A thread sends one
+# request at a time, so the pool mostly bounds idle keep-alive connections.
+DEFAULT_POOL_SIZES = {API: 4, S3: 16}
+
+
+class _ThreadSessions:
+    """The sessions of one thread, one per pool. Dropped when the thread ends."""
+
+    def __init__(self, generation: int):
+        self.generation = generation
+        self.sessions: Dict[str, requests.Session] = {}
+
+
+class _RetryingAdapter(HTTPAdapter):
+    """An HTTPAdapter that sends each request through a RetryPolicy.
+
+    Requests that are not idempotent (POST) are only resent when the
+    server cannot have acted on them; see retryable_unsent.
+    """
+
+    def __init__(self, policy: RetryPolicy, **kwargs):
+        super().__init__(**kwargs)
+        self.policy = policy
+
+    def send(self, request, **kwargs):
+        def attempt():
+            return super(_RetryingAdapter, self).send(request, **kwargs)
+
+        def before_retry(response):
+            if response is not None:
+                response.close()
+            # A file body was read to its end by the failed attempt.
+            if hasattr(request.body, "read"):
+                rewind_body(request)
+
+        return self.policy.call(
+            endpoint_of(request.url),
+            attempt,
+            retryable=retryable_for(request.method),
+            before_retry=before_retry,
+        )
+
+
+def _pool_counts(session: requests.Session) -> Dict[str, int]:
+    """Connections opened and requests sent by a session's urllib3 pools."""
+    connections = requests_sent = 0
+    # One adapter is mounted for both http:// and https://.
+    adapters = {id(adapter): adapter for adapter in session.adapters.values()}
+    for adapter in adapters.values():
+        pools = adapter.poolmanager.pools
+        for key in pools.keys():
+            pool = pools[key]
+            connections += pool.num_connections
+            requests_sent += pool.num_requests
+    return {"connections": connections, "requests": requests_sent}
+
+
+class Transport:
+    """Thread-safe, pooled HTTP sessions for every request the client sends.
+
+    A requests.Session is not safe to share between threads, so each thread
+    gets its own session per pool (API or S3) and keeps it for its lifetime;
+    its connections are reused across that thread's requests. Every request
+    is sent through ``policy`` (see willisapi_client.services.retry), which
+    retries transient failures and fails fast while a host is down.
+    stats() reports, per pool, how many requests went
+    over an already open connection versus a new one.
+    """
+
+    def __init__(
+        self,
+        pool_sizes: Dict[str, int] = None,
+        policy: RetryPolicy = None,
+    ):
+        self.pool_sizes = dict(DEFAULT_POOL_SIZES, **(pool_sizes or {}))
+        self.policy = policy or retry_policy
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._generation = 0
+        # Sessions of live threads, and counts carried over from ended ones.
+        self._live: Dict[int, Dict[str, requests.Session]] = {}
+        self._retired: Dict[str, Dict[str, int]] = {}
+
+    def configure(self, pool: str, pool_maxsize: int):
+        """Set a pool's per-host connection limit.
+
+        Each thread replaces its sessions on its next request, so the new
+        size applies from then on.
+        """
+        with self._lock:
+            self.pool_sizes[pool] = max(1, pool_maxsize)
+            self._generation += 1
+
+    def _new_session(self, pool: str) -> requests.Session:
+        size = self.pool_sizes.get(pool, DEFAULT_POOL_SIZES[API])
+        adapter = _RetryingAdapter(
+            self.policy, pool_connections=size, pool_maxsize=size
+        )
+        session = requests.Session()
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        return session
+
+    def _retire(self, key: int):
+        with self._lock:
+            sessions = self._live.pop(key, {})
+            for pool, session in sessions.items():
+                counts = self._retired.setdefault(
+                    pool, {"connections": 0, "requests": 0}
+                )
+                for name, count in _pool_counts(session).items():
+                    counts[name] += count
+        for session in sessions.values():
+            session.close()
+
+    def session(self, pool: str = API) -> requests.Session:
+        """This thread's session for pool, created on first use."""
+        local = getattr(self._local, "sessions", None)
+        if local is None or local.generation != self._generation:
+            if local is not None:
+                self._retire(id(local))
+            local = _ThreadSessions(self._generation)
+            self._local.sessions = local
+            with self._lock:
+                self._live[id(local)] = local.sessions
+            # When the thread ends its _ThreadSessions goes away; close its
+            # sessions then and keep their counts.
+            weakref.finalize(local, self._retire, id(local))
+        session = local.sessions.get(pool)
+        if session is None:
+            session = local.sessions[pool] = self._new_session(pool)
+        return session
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        """Per pool: requests sent, connections opened and requests that reused one."""
+        with self._lock:
+            totals = {pool: dict(counts) for pool, counts in self._retired.items()}
+            live = [dict(sessions) for sessions in self._live.values()]
+        for sessions in live:
+            for pool, session in sessions.items():
+                counts = totals.setdefault(pool, {"connections": 0, "requests": 0})
+                for name, count in _pool_counts(session).items():
+                    counts[name] += count
+        for counts in totals.values():
+            counts["reused"] = max(0, counts["requests"] - counts["connections"])
+        return totals
+
+
+# Shared by every upload, archive and diarize call in this process.
+transport = Transport()
+
+
+def session(pool: str = API) -> requests.Session:
+    """The calling thread's pooled session for pool (API or S3)."""
+    return transport.session(pool)